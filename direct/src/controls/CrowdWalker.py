@@ -0,0 +1,347 @@
+"""
+CrowdWalker.py is for large numbers of simulated avatars.
+
+Where a GravityWalker drives a single (usually local) avatar from the
+keyboard, with its own collision handlers and its own per-frame task, a
+CrowdWalker moves any number of avatars at once, such as server-side bots
+or client NPCs.  Their intended motion is set programmatically, and all of
+them are integrated in a single step, with one shared collision traversal
+to find the floor under every avatar.
+
+It does not:
+
+- send walker events such as "jumpLand" or "avatarMoving"
+- follow the contact normal on slopes (avatars are snapped to the floor
+  after moving horizontally instead)
+"""
+
+__all__ = ['CrowdWalker']
+
+from direct.directnotify.DirectNotifyGlobal import directNotify
+from direct.controls.ControlManager import CollisionHandlerRayStart
+from direct.showbase import DirectObject
+from direct.task.Task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from panda3d.core import (
+    BitMask32,
+    ClockObject,
+    CollisionHandlerFluidPusher,
+    CollisionHandlerPusher,
+    CollisionHandlerQueue,
+    CollisionNode,
+    CollisionRay,
+    CollisionSphere,
+    CollisionTraverser,
+    ConfigVariableBool,
+)
+import math
+
+
+class CrowdWalker(DirectObject.DirectObject):
+    """
+    Moves many avatars with gravity and floor snapping in one batch.
+
+    The state of all avatars is kept in parallel lists indexed by avatar,
+    rather than in one walker object per avatar, so that step() can update
+    the whole crowd in a single loop.  All floor rays are added to one
+    traverser feeding one CollisionHandlerQueue, and all wall spheres (if
+    a wall bitmask is given) share one pusher, so each step needs only one
+    traversal of the scene for the entire crowd.
+
+    Typical usage::
+
+        crowd = CrowdWalker(render, floorBitmask=FloorBitmask)
+        index = crowd.addAvatar(npc)
+        crowd.setControls(index, speed=16.0, rotationSpeed=30.0)
+        crowd.enableTask()
+
+    The index returned by addAvatar() is only valid until an avatar is
+    removed; use getIndex() to look up the current index of an avatar.
+    """
+    notify = directNotify.newCategory("CrowdWalker")
+
+    def __init__(self, root, floorBitmask, wallBitmask=None,
+            gravity=64.348, avatarRadius=1.4, floorOffset=0.0, reach=1.0,
+            rayHeight=CollisionHandlerRayStart):
+        """
+        root is the NodePath that is traversed for collisions; the avatars
+        should be somewhere below it.
+
+        floorOffset is the height at which the origin of an avatar is kept
+        above the floor, and reach is how far an avatar standing on the
+        ground may step down (for instance, walking down a slope or stairs)
+        without starting to fall.  Wall spheres are only set up if a
+        wallBitmask is given.
+        """
+        assert self.notify.debugStateCall(self)
+        DirectObject.DirectObject.__init__(self)
+        self.root = root
+        self.floorBitmask = floorBitmask
+        self.wallBitmask = wallBitmask
+        self.gravity = gravity
+        self.avatarRadius = avatarRadius
+        self.floorOffset = floorOffset
+        self.reach = reach
+        self.rayHeight = rayHeight
+
+        self.cTrav = CollisionTraverser('CrowdWalker')
+        self.floorQueue = CollisionHandlerQueue()
+        if wallBitmask is not None:
+            if ConfigVariableBool('want-fluid-pusher', 0):
+                self.pusher = CollisionHandlerFluidPusher()
+            else:
+                self.pusher = CollisionHandlerPusher()
+        else:
+            self.pusher = None
+
+        self.controlsTask = None
+
+        #: The number of times step() has been called.
+        self.numSteps = 0
+
+        # Per-avatar state, indexed by avatar.
+        self.__avatars = []
+        self.__rayNodePaths = []
+        self.__wallNodePaths = []
+        self.__speeds = []
+        self.__slideSpeeds = []
+        self.__rotationSpeeds = []
+        self.__jumpForces = []
+        self.__velocities = []
+        self.__onGround = []
+
+    def addAvatar(self, avatarNodePath):
+        """
+        Adds the avatar to the crowd, setting up its collision solids, and
+        returns its current index.
+        """
+        assert self.notify.debugStateCall(self)
+        assert not avatarNodePath.isEmpty()
+        index = len(self.__avatars)
+
+        cRay = CollisionRay(0.0, 0.0, self.rayHeight, 0.0, 0.0, -1.0)
+        cRayNode = CollisionNode('CW.cRayNode')
+        cRayNode.addSolid(cRay)
+        cRayNode.setFromCollideMask(self.floorBitmask)
+        cRayNode.setIntoCollideMask(BitMask32.allOff())
+        cRayNode.setPythonTag('crowdIndex', index)
+        cRayNodePath = avatarNodePath.attachNewNode(cRayNode)
+        self.cTrav.addCollider(cRayNodePath, self.floorQueue)
+
+        if self.pusher is not None:
+            radius = self.avatarRadius
+            cSphere = CollisionSphere(0.0, 0.0, radius, radius)
+            cSphereNode = CollisionNode('CW.cWallSphereNode')
+            cSphereNode.addSolid(cSphere)
+            cSphereNode.setFromCollideMask(self.wallBitmask)
+            cSphereNode.setIntoCollideMask(BitMask32.allOff())
+            cSphereNodePath = avatarNodePath.attachNewNode(cSphereNode)
+            self.pusher.addCollider(cSphereNodePath, avatarNodePath)
+            self.cTrav.addCollider(cSphereNodePath, self.pusher)
+        else:
+            cSphereNodePath = None
+
+        self.__avatars.append(avatarNodePath)
+        self.__rayNodePaths.append(cRayNodePath)
+        self.__wallNodePaths.append(cSphereNodePath)
+        self.__speeds.append(0.0)
+        self.__slideSpeeds.append(0.0)
+        self.__rotationSpeeds.append(0.0)
+        self.__jumpForces.append(0.0)
+        self.__velocities.append(0.0)
+        self.__onGround.append(False)
+        return index
+
+    def removeAvatar(self, avatarNodePath):
+        """
+        Removes the avatar from the crowd, along with its collision solids.
+        The last avatar takes over the index of the removed one.
+        """
+        assert self.notify.debugStateCall(self)
+        index = self.getIndex(avatarNodePath)
+        assert index >= 0, "avatar is not part of this crowd"
+
+        cRayNodePath = self.__rayNodePaths[index]
+        self.cTrav.removeCollider(cRayNodePath)
+        cRayNodePath.removeNode()
+        cSphereNodePath = self.__wallNodePaths[index]
+        if cSphereNodePath is not None:
+            self.cTrav.removeCollider(cSphereNodePath)
+            self.pusher.removeCollider(cSphereNodePath)
+            cSphereNodePath.removeNode()
+
+        last = len(self.__avatars) - 1
+        for array in self.__getArrays():
+            array[index] = array[last]
+            del array[last]
+        if index < last:
+            self.__rayNodePaths[index].node().setPythonTag('crowdIndex', index)
+
+    def getIndex(self, avatarNodePath):
+        """
+        Returns the current index of the given avatar, or -1 if it is not
+        part of this crowd.
+        """
+        for index, avatar in enumerate(self.__avatars):
+            if avatar == avatarNodePath:
+                return index
+        return -1
+
+    def getNumAvatars(self):
+        return len(self.__avatars)
+
+    def getAvatar(self, index):
+        return self.__avatars[index]
+
+    def setControls(self, index, speed=0.0, rotationSpeed=0.0, slideSpeed=0.0):
+        """
+        Sets the intended motion of the avatar at the given index.  speed
+        and slideSpeed are in units per second along the forward and right
+        axes of the avatar, and rotationSpeed is in degrees per second.
+        """
+        self.__speeds[index] = speed
+        self.__rotationSpeeds[index] = rotationSpeed
+        self.__slideSpeeds[index] = slideSpeed
+
+    def getSpeeds(self, index):
+        return (self.__speeds[index], self.__rotationSpeeds[index],
+                self.__slideSpeeds[index])
+
+    def jump(self, index, force):
+        """
+        Makes the avatar at the given index jump on the next step, if it is
+        standing on the ground.
+        """
+        self.__jumpForces[index] = force
+
+    def getIsAirborne(self, index):
+        return not self.__onGround[index]
+
+    def getVelocity(self, index):
+        """
+        Returns the vertical velocity of the avatar at the given index.
+        """
+        return self.__velocities[index]
+
+    def step(self, dt=None):
+        """
+        Moves all the avatars by the given number of seconds, which defaults
+        to the duration of the last frame.
+        """
+        if dt is None:
+            dt = ClockObject.getGlobalClock().getDt()
+        self.numSteps += 1
+
+        avatars = self.__avatars
+        speeds = self.__speeds
+        slideSpeeds = self.__slideSpeeds
+        rotationSpeeds = self.__rotationSpeeds
+        jumpForces = self.__jumpForces
+        velocities = self.__velocities
+        onGround = self.__onGround
+        fall = self.gravity * dt
+        radians = math.pi / 180.0
+
+        # Integrate the motion of all avatars first, so that the floor and
+        # walls can be found for all of them in one traversal.
+        for i, avatar in enumerate(avatars):
+            velocity = velocities[i]
+            if onGround[i]:
+                if jumpForces[i]:
+                    velocity = jumpForces[i]
+                    onGround[i] = False
+            else:
+                velocity -= fall
+            jumpForces[i] = 0.0
+            velocities[i] = velocity
+
+            speed = speeds[i]
+            slideSpeed = slideSpeeds[i]
+            rotationSpeed = rotationSpeeds[i]
+            if not (speed or slideSpeed or rotationSpeed or velocity):
+                continue
+
+            x, y, z, h = avatar.getX(), avatar.getY(), avatar.getZ(), avatar.getH()
+            if speed or slideSpeed:
+                heading = h * radians
+                sinH = math.sin(heading)
+                cosH = math.cos(heading)
+                x += (cosH * slideSpeed - sinH * speed) * dt
+                y += (sinH * slideSpeed + cosH * speed) * dt
+            if rotationSpeed:
+                avatar.setH(h + rotationSpeed * dt)
+            avatar.setFluidPos(x, y, z + velocity * dt)
+
+        self.cTrav.traverse(self.root)
+
+        # Find the highest floor under every avatar.
+        root = self.root
+        floors = [None] * len(avatars)
+        for entry in self.floorQueue.getEntries():
+            index = entry.getFromNode().getPythonTag('crowdIndex')
+            floorZ = entry.getSurfacePoint(root)[2]
+            current = floors[index]
+            if current is None or floorZ > current:
+                floors[index] = floorZ
+
+        # Snap the avatars that are on (or have reached) the floor.
+        offset = self.floorOffset
+        reach = self.reach
+        for i, floorZ in enumerate(floors):
+            if floorZ is None:
+                onGround[i] = False
+                continue
+            floorZ += offset
+            avatar = avatars[i]
+            z = avatar.getZ(root)
+            if onGround[i]:
+                if z - floorZ > reach:
+                    # We walked off a ledge.
+                    onGround[i] = False
+                elif z != floorZ:
+                    avatar.setZ(root, floorZ)
+            elif z <= floorZ and velocities[i] <= 0.0:
+                avatar.setZ(root, floorZ)
+                velocities[i] = 0.0
+                onGround[i] = True
+
+    def enableTask(self, priority=25):
+        """
+        Starts a task that steps the crowd every frame.
+        """
+        assert self.notify.debugStateCall(self)
+        self.disableTask()
+        taskName = "CrowdWalker-%s" % (id(self),)
+        self.controlsTask = taskMgr.add(self.__stepTask, taskName, priority)
+
+    def disableTask(self):
+        assert self.notify.debugStateCall(self)
+        if self.controlsTask:
+            self.controlsTask.remove()
+            self.controlsTask = None
+
+    def destroy(self):
+        """
+        Removes all avatars along with their collision solids.
+        """
+        assert self.notify.debugStateCall(self)
+        self.disableTask()
+        self.cTrav.clearColliders()
+        for cRayNodePath in self.__rayNodePaths:
+            cRayNodePath.removeNode()
+        for cSphereNodePath in self.__wallNodePaths:
+            if cSphereNodePath is not None:
+                cSphereNodePath.removeNode()
+        if self.pusher is not None:
+            self.pusher.clearColliders()
+        for array in self.__getArrays():
+            del array[:]
+
+    def __getArrays(self):
+        return (self.__avatars, self.__rayNodePaths, self.__wallNodePaths,
+                self.__speeds, self.__slideSpeeds, self.__rotationSpeeds,
+                self.__jumpForces, self.__velocities, self.__onGround)
+
+    def __stepTask(self, task):
+        self.step()
+        return Task.cont
@@ -0,0 +1,173 @@
+"""AsyncLogWriter module: contains the AsyncLogWriter class, which takes
+care of writing log output on a background thread"""
+
+from __future__ import annotations
+
+import atexit
+import collections
+import json
+import threading
+import time
+from typing import Callable
+
+from panda3d.core import ClockObject
+
+
+class AsyncLogWriter:
+    """
+    Moves the writing of log output off the calling thread, so that a
+    verbose log does not stall the main loop on I/O.
+
+    Lines passed to write() are stored in a bounded buffer, which a
+    background thread empties periodically, handing all pending lines to the
+    output function in a single call.  If the thread can't keep up and the
+    buffer fills up, the oldest lines are discarded; the number of discarded
+    lines is kept in numDropped.
+
+    In JSON lines mode, every line is instead written as a JSON object
+    containing the message along with its category, severity, time and
+    frame number.
+    """
+
+    def __init__(
+        self,
+        output: Callable[[str], object],
+        maxRecords: int = 4096,
+        jsonLines: bool = False,
+        flushInterval: float = 0.1,
+    ) -> None:
+        """
+        Parameters:
+            output: a function that writes a string, such as the write
+                method of a file or of a StreamWriter.
+            maxRecords: the number of lines that may be pending before the
+                oldest lines are dropped.
+            jsonLines: whether to write structured JSON records instead of
+                the plain lines.
+            flushInterval: the number of seconds the writer thread waits
+                between writes, unless the buffer is filling up.
+        """
+        self.output = output
+        self.jsonLines = jsonLines
+        self.flushInterval = flushInterval
+
+        #: The number of lines that were discarded because the buffer was full.
+        self.numDropped = 0
+
+        self.__records: collections.deque[tuple] = collections.deque(maxlen=maxRecords)
+        self.__wakeThreshold = max(1, maxRecords // 2)
+        self.__wakeup = threading.Event()
+        # Held while writing to the output.
+        self.__lock = threading.Lock()
+        # Held briefly while changing the buffer or numDropped, which may be
+        # done by any thread.
+        self.__queueLock = threading.Lock()
+        self.__stopped = False
+
+        self.__thread = threading.Thread(target=self.__run, name='AsyncLogWriter')
+        self.__thread.daemon = True
+        self.__thread.start()
+        atexit.register(self.stop)
+
+    def getMaxRecords(self) -> int:
+        """
+        Returns the number of lines that may be pending at any time.
+        """
+        maxRecords = self.__records.maxlen
+        assert maxRecords is not None
+        return maxRecords
+
+    def getNumPending(self) -> int:
+        """
+        Returns the number of lines that have not yet been written.
+        """
+        return len(self.__records)
+
+    def write(
+        self,
+        line: str,
+        category: str | None = None,
+        severity: str | None = None,
+        message: str | None = None,
+    ) -> None:
+        """
+        Queues the given line (without trailing newline) to be written.  The
+        category, severity and message are only used in JSON lines mode; if
+        message is omitted, the line itself is used as the message.
+        """
+        record: tuple
+        if self.jsonLines:
+            frame = ClockObject.getGlobalClock().getFrameCount()
+            record = (line, category, severity, message, time.time(), frame)
+        else:
+            record = (line,)
+
+        records = self.__records
+        with self.__queueLock:
+            if len(records) == records.maxlen:
+                # The deque discards the oldest record to make room.
+                self.numDropped += 1
+            records.append(record)
+            numPending = len(records)
+
+        if self.__stopped:
+            self.flush()
+        elif numPending >= self.__wakeThreshold:
+            self.__wakeup.set()
+
+    def flush(self) -> None:
+        """
+        Writes all pending lines immediately, on the calling thread.
+        """
+        with self.__lock:
+            with self.__queueLock:
+                records = list(self.__records)
+                self.__records.clear()
+
+            if records:
+                lines = [self.__formatRecord(record) for record in records]
+                try:
+                    self.output(''.join(lines))
+                except Exception:
+                    # There is nowhere left to report this.
+                    with self.__queueLock:
+                        self.numDropped += len(lines)
+
+    def stop(self) -> None:
+        """
+        Writes all pending lines and stops the background thread.  Lines
+        written after this are written immediately, on the calling thread.
+        """
+        if self.__stopped:
+            return
+        self.__stopped = True
+        self.__wakeup.set()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
+        self.flush()
+        atexit.unregister(self.stop)
+
+    def isStopped(self) -> bool:
+        """
+        Returns true if stop() has been called.
+        """
+        return self.__stopped
+
+    def __formatRecord(self, record: tuple) -> str:
+        if len(record) == 1:
+            return record[0] + '\n'
+
+        line, category, severity, message, t, frame = record
+        return json.dumps({
+            'time': t,
+            'frame': frame,
+            'category': category,
+            'severity': severity,
+            'message': line if message is None else message,
+        }) + '\n'
+
+    def __run(self) -> None:
+        while not self.__stopped:
+            self.__wakeup.wait(self.flushInterval)
+            self.__wakeup.clear()
+            self.flush()
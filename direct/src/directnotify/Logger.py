@@ -7,6 +7,8 @@ import io
 import time
 import math
 
+from .AsyncLogWriter import AsyncLogWriter
+
 
 class Logger:
     def __init__(self, fileName: str = "log") -> None:
@@ -17,6 +19,7 @@ class Logger:
         self.__startTime = 0.0
         self.__logFile: io.TextIOWrapper | None = None
         self.__logFileName = fileName
+        self.__asyncWriter: AsyncLogWriter | None = None
 
     def setTimeStamp(self, enable: bool) -> None:
         """
@@ -30,6 +33,25 @@ class Logger:
         """
         return self.__timeStamp
 
+    def setAsync(self, enable: bool, maxRecords: int = 4096) -> None:
+        """
+        Enables or disables writing the log file on a background thread.
+        While enabled, log() only queues up the entry; up to maxRecords
+        entries may be pending before the oldest ones are dropped.
+        """
+        if self.__asyncWriter is not None:
+            self.__asyncWriter.stop()
+            self.__asyncWriter = None
+        if enable:
+            self.__asyncWriter = AsyncLogWriter(self.__writeLogFile, maxRecords)
+
+    def getAsyncWriter(self) -> AsyncLogWriter | None:
+        """
+        Returns the AsyncLogWriter in use if setAsync(True) was called, or
+        None otherwise.
+        """
+        return self.__asyncWriter
+
     # logging control
 
     def resetStartTime(self) -> None:
@@ -44,6 +66,11 @@ class Logger:
         if self.__logFile is None:
             self.__openLogFile()
         assert self.__logFile is not None
+        if self.__asyncWriter is not None:
+            if self.__timeStamp:
+                entryString = self.__getTimeStamp() + entryString
+            self.__asyncWriter.write(entryString)
+            return
         if self.__timeStamp:
             self.__logFile.write(self.__getTimeStamp())
         self.__logFile.write(entryString + '\n')
@@ -60,10 +87,17 @@ class Logger:
         logFileName = self.__logFileName + "." + st
         self.__logFile = open(logFileName, "w")
 
+    def __writeLogFile(self, data: str) -> None:
+        if self.__logFile is not None:
+            self.__logFile.write(data)
+            self.__logFile.flush()
+
     def __closeLogFile(self) -> None:
         """
         Close the error/warning output file
         """
+        if self.__asyncWriter is not None:
+            self.__asyncWriter.flush()
         if self.__logFile is not None:
             self.__logFile.close()
 
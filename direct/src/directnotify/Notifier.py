@@ -5,12 +5,14 @@ for the programmer/user
 
 from __future__ import annotations
 
+from .AsyncLogWriter import AsyncLogWriter
 from .Logger import Logger
 from .LoggerGlobal import defaultLogger
 from direct.showbase import PythonUtil
-from panda3d.core import ConfigVariableBool, NotifyCategory, StreamWriter, Notify
+from panda3d.core import ConfigVariableBool, ConfigVariableInt, NotifyCategory, StreamWriter, Notify
 import time
 import sys
+import types
 from typing import NoReturn
 
 
@@ -31,6 +33,15 @@ class Notifier:
 
     showTime = ConfigVariableBool('notify-timestamp', False)
 
+    # If this is set to an AsyncLogWriter, messages are handed to it to be
+    # printed on a background thread, rather than being printed right away.
+    asyncWriter: AsyncLogWriter | None = None
+    if ConfigVariableBool('notify-async', False):
+        asyncWriter = AsyncLogWriter(
+            streamWriter.write if streamWriter else sys.stderr.write,
+            maxRecords=ConfigVariableInt('notify-async-buffer-size', 4096).value,
+            jsonLines=ConfigVariableBool('notify-json', False).value)
+
     def __init__(self, name: str, logger: Logger | None = None) -> None:
         """
         Parameters:
@@ -139,18 +150,21 @@ class Notifier:
         raise exception(errorString)
 
     # warning funcs
-    def warning(self, warningString: object) -> int:
+    def warning(self, warningString: object, *args: object) -> int:
         """
         Issue the warning message if warn flag is on
+
+        As with debug(), any additional arguments are only formatted into
+        the message if it is actually printed.
         """
         if self.__warning:
-            message = str(warningString)
+            message = self.__formatMessage(warningString, args)
             if Notifier.showTime:
                 string = f'{self.getTime()}{self.__name}(warning): {message}'
             else:
                 string = f':{self.__name}(warning): {message}'
             self.__log(string)
-            self.__print(string)
+            self.__print(string, 'warning', message)
         return 1 # to allow assert myNotify.warning("blah")
 
     def setWarning(self, enable: bool) -> None:
@@ -166,18 +180,22 @@ class Notifier:
         return self.__warning
 
     # debug funcs
-    def debug(self, debugString: object) -> int:
+    def debug(self, debugString: object, *args: object) -> int:
         """
         Issue the debug message if debug flag is on
+
+        Any additional arguments are substituted into the message using the
+        % operator, which only happens if the message is actually printed.
+        The message may also be a function returning the message.
         """
         if self.__debug:
-            message = str(debugString)
+            message = self.__formatMessage(debugString, args)
             if Notifier.showTime:
                 string = f'{self.getTime()}{self.__name}(debug): {message}'
             else:
                 string = f':{self.__name}(debug): {message}'
             self.__log(string)
-            self.__print(string)
+            self.__print(string, 'debug', message)
         return 1 # to allow assert myNotify.debug("blah")
 
     def setDebug(self, enable: bool) -> None:
@@ -193,18 +211,21 @@ class Notifier:
         return self.__debug
 
     # info funcs
-    def info(self, infoString: object) -> int:
+    def info(self, infoString: object, *args: object) -> int:
         """
         Print the given informational string, if info flag is on
+
+        As with debug(), any additional arguments are only formatted into
+        the message if it is actually printed.
         """
         if self.__info:
-            message = str(infoString)
+            message = self.__formatMessage(infoString, args)
             if Notifier.showTime:
                 string = f'{self.getTime()}{self.__name}: {message}'
             else:
                 string = f':{self.__name}: {message}'
             self.__log(string)
-            self.__print(string)
+            self.__print(string, 'info', message)
         return 1 # to allow assert myNotify.info("blah")
 
     def getInfo(self) -> bool:
@@ -219,6 +240,18 @@ class Notifier:
         """
         self.__info = enable
 
+    @staticmethod
+    def __formatMessage(message: object, args: tuple) -> str:
+        """
+        Turns the arguments passed to one of the message functions into the
+        string to print.
+        """
+        if isinstance(message, types.FunctionType):
+            message = message()
+        if args:
+            return str(message) % args
+        return str(message)
+
     # log funcs
     def __log(self, logEntry: str) -> None:
         """
@@ -239,11 +272,14 @@ class Notifier:
         """
         self.__logging = enable
 
-    def __print(self, string: str) -> None:
+    def __print(self, string: str, severity: str = 'debug', message: str | None = None) -> None:
         """
         Prints the string to output followed by a newline.
         """
-        if self.streamWriter:
+        asyncWriter = self.asyncWriter
+        if asyncWriter is not None:
+            asyncWriter.write(string, self.__name, severity, message)
+        elif self.streamWriter:
             self.streamWriter.write(string + '\n')
         else:
             sys.stderr.write(string + '\n')
@@ -11,7 +11,11 @@ import io
 import sysconfig
 import zipfile
 import importlib
+import importlib.util
+import pickle
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from importlib import machinery
 
 from . import pefile
@@ -817,7 +821,8 @@ class Freezer:
             return 'ModuleDef(%s)' % (', '.join(args))
 
     def __init__(self, previous = None, debugLevel = 0,
-                 platform = None, path=None, hiddenImports=None, optimize=None):
+                 platform = None, path=None, hiddenImports=None, optimize=None,
+                 moduleCache=None):
         # Normally, we are freezing for our own platform.  Change this
         # if untrue.
         self.platform = platform or PandaSystem.getPlatform()
@@ -972,8 +977,13 @@ class Freezer:
         else:
             self.optimize = optimize
 
+        # This may be set to a ModuleScanCache, which remembers the imports
+        # of modules that have been scanned before.
+        self.moduleCache = moduleCache
+
         self.mf = PandaModuleFinder(excludes=['doctest'], suffixes=suffixes,
-                                    path=path, optimize=self.optimize)
+                                    path=path, optimize=self.optimize,
+                                    cache=moduleCache)
 
     def excludeFrom(self, freezer):
         """ Excludes all modules that have already been processed by
@@ -2445,6 +2455,248 @@ class Freezer:
         return True
 
 
+def _strip_delvewheel_patch(code):
+    """ Removes the delvewheel patch from the given source code (see GitHub
+    issue #1492). """
+
+    if isinstance(code, bytes):
+        # Don't look for \n at the end, it may also be \r\n
+        start_marker = b'# start delvewheel patch'
+        end_marker = b'# end delvewheel patch'
+    else:
+        start_marker = '# start delvewheel patch'
+        end_marker = '# end delvewheel patch'
+
+    start = code.find(start_marker)
+    while start >= 0:
+        end = code.find(end_marker, start) + len(end_marker)
+        code = code[:start] + code[end:]
+        start = code.find(start_marker)
+
+    return code
+
+
+def _iter_code_imports(scanner, co):
+    """ Yields the results of the given scan_opcodes method for the code
+    object and all code objects nested in it, in the order in which
+    PandaModuleFinder.scan_code processes them. """
+
+    yield from scanner(co)
+
+    for c in co.co_consts:
+        if isinstance(c, type(co)):
+            yield from _iter_code_imports(scanner, c)
+
+
+def _scan_source_file(pathname, optimize):
+    """ Compiles and scans the given source file.  This runs in a worker
+    process of the ModuleScanCache, so it returns the code object in
+    marshalled form. """
+
+    stat = os.stat(pathname)
+    with open(pathname, 'rb') as fp:
+        code = fp.read()
+
+    code = _strip_delvewheel_patch(code) + b'\n'
+    co = compile(code, pathname, 'exec', optimize=optimize)
+    scanner = modulefinder.ModuleFinder().scan_opcodes
+    imports = list(_iter_code_imports(scanner, co))
+    return (stat.st_mtime_ns, stat.st_size), marshal.dumps(co), imports
+
+
+class ModuleScanCache:
+    """ Remembers, for every module file that PandaModuleFinder has loaded,
+    the compiled code and the imports found in it, so that a module that
+    has not changed since a previous build does not have to be compiled
+    and scanned again.  Entries are keyed on the path and optimization
+    level, and are discarded when the modification time or size of the
+    file changes.
+
+    Pass an instance to the Freezer via the moduleCache parameter; the
+    same instance may be shared between several Freezers.  Call save() to
+    write the cache back to disk.
+
+    If workers is nonzero, prefetch() scans modules that are not yet cached
+    in that many worker processes (or one per CPU, if it is None), and
+    close() must be called to stop them.  This is off by default, since on
+    platforms that spawn rather than fork new processes, each worker starts
+    by importing the main module, which must then be guarded by an
+    ``if __name__ == '__main__'`` check. """
+
+    # Bump this when the format of the entries changes.
+    version = 1
+
+    def __init__(self, filename = None, workers = 0):
+        self.filename = filename
+        self.workers = workers
+
+        self.numHits = 0
+        self.numMisses = 0
+
+        self.__entries = {}
+        self.__pending = {}
+        self.__pool = None
+        self.__dirty = False
+
+        if filename and os.path.isfile(filename):
+            self.load(filename)
+
+    def __getTag(self):
+        return (self.version, importlib.util.MAGIC_NUMBER)
+
+    def load(self, filename):
+        """ Reads cached entries from the given file.  Entries written by a
+        different version of Python are ignored. """
+
+        try:
+            with open(filename, 'rb') as fp:
+                tag, entries = pickle.load(fp)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return False
+
+        if tag != self.__getTag():
+            return False
+
+        self.__entries.update(entries)
+        return True
+
+    def save(self, filename = None):
+        """ Writes the cache to the given file, or to the file it was
+        created with. """
+
+        filename = filename or self.filename
+        if not filename or not self.__dirty:
+            return
+
+        self.__collectPending()
+
+        dirname = os.path.dirname(filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        tempname = filename + '.tmp'
+        with open(tempname, 'wb') as fp:
+            pickle.dump((self.__getTag(), self.__entries), fp, pickle.HIGHEST_PROTOCOL)
+        os.replace(tempname, filename)
+        self.__dirty = False
+
+    def close(self):
+        """ Stops the worker processes, if any were started. """
+
+        if self.__pool is not None:
+            self.__collectPending()
+            self.__pool.shutdown()
+            self.__pool = None
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def lookup(self, pathname, optimize):
+        """ Returns a (code, imports) tuple for the given module file if it
+        is in the cache and has not been modified since, or None. """
+
+        key = (pathname, optimize)
+        future = self.__pending.pop(key, None)
+        if future is not None and not future.cancel():
+            # A worker is already busy with it, so wait for it to finish,
+            # otherwise we can just as well do it ourselves.
+            self.__collectFuture(key, future)
+
+        entry = self.__entries.get(key)
+        if entry is not None:
+            try:
+                stat = os.stat(pathname)
+            except OSError:
+                stat = None
+
+            if stat is not None and entry[0] == (stat.st_mtime_ns, stat.st_size):
+                self.numHits += 1
+                return marshal.loads(entry[1]), entry[2]
+
+            del self.__entries[key]
+            self.__dirty = True
+
+        self.numMisses += 1
+        return None
+
+    def store(self, pathname, optimize, co, imports):
+        """ Adds the code and the imports found in it for the given module
+        file to the cache. """
+
+        try:
+            stat = os.stat(pathname)
+        except OSError:
+            return
+
+        self.__entries[(pathname, optimize)] = \
+            ((stat.st_mtime_ns, stat.st_size), marshal.dumps(co), list(imports))
+        self.__dirty = True
+
+    def prefetch(self, pathnames, optimize):
+        """ Starts compiling and scanning the given source files in worker
+        processes, unless they are already cached.  This is useful for
+        modules that are likely to be loaded soon, such as the submodules
+        of a package. """
+
+        if self.workers == 0:
+            return
+
+        for pathname in pathnames:
+            key = (pathname, optimize)
+            if key in self.__pending:
+                continue
+
+            entry = self.__entries.get(key)
+            if entry is not None:
+                try:
+                    stat = os.stat(pathname)
+                except OSError:
+                    continue
+                if entry[0] == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+            if self.__pool is None:
+                if self.workers is None and (os.cpu_count() or 1) <= 1:
+                    # There is nothing to be gained by using a worker.
+                    self.workers = 0
+                    return
+                try:
+                    self.__pool = ProcessPoolExecutor(self.workers)
+                except (ImportError, NotImplementedError, OSError):
+                    # No multiprocessing support on this system.
+                    self.workers = 0
+                    return
+
+            self.__pending[key] = self.__pool.submit(_scan_source_file, pathname, optimize)
+
+    def __collectFuture(self, key, future):
+        try:
+            self.__entries[key] = future.result()
+        except BrokenProcessPool:
+            # A worker process died; do the remaining modules ourselves.
+            if self.__pool is not None:
+                warnings.warn("A module scan worker process terminated "
+                              "abruptly; scanning modules without workers")
+                for pending in self.__pending.values():
+                    pending.cancel()
+                self.__pending = {}
+                self.__pool.shutdown(wait=False)
+                self.__pool = None
+                self.workers = 0
+            return
+        except Exception:
+            # We will find out about the error when the module is loaded
+            # the regular way.
+            return
+        self.__dirty = True
+
+    def __collectPending(self):
+        pending = self.__pending
+        self.__pending = {}
+        for key, future in pending.items():
+            self.__collectFuture(key, future)
+
+
 class PandaModuleFinder(modulefinder.ModuleFinder):
 
     def __init__(self, *args, **kw):
@@ -2465,6 +2717,9 @@ class PandaModuleFinder(modulefinder.ModuleFinder):
 
         self.optimize = kw.pop('optimize', -1)
 
+        # An optional ModuleScanCache, to avoid rescanning unchanged modules.
+        self.cache = kw.pop('cache', None)
+
         modulefinder.ModuleFinder.__init__(self, *args, **kw)
 
         # Make sure we don't open a .whl/.zip file more than once.
@@ -2621,28 +2876,28 @@ class PandaModuleFinder(modulefinder.ModuleFinder):
             m.__path__ = pathname
             return m
 
-        if type == _PY_SOURCE:
+        # Only files read straight from disk can be cached; the source may
+        # also come from a zip file, an override or text passed to addModule.
+        cache = self.cache
+        if cache is not None and (fqname in overrideModules or
+                                  getattr(fp, 'name', None) != pathname):
+            cache = None
+
+        cached = None
+        if cache is not None and type in (_PY_SOURCE, _PY_COMPILED):
+            cached = cache.lookup(pathname, self.optimize)
+
+        imports = None
+        if cached is not None:
+            co, imports = cached
+        elif type == _PY_SOURCE:
             if fqname in overrideModules:
                 # This module has a custom override.
                 code = overrideModules[fqname]
             else:
                 code = fp.read()
 
-            # Strip out delvewheel patch (see GitHub issue #1492)
-            if isinstance(code, bytes):
-                # Don't look for \n at the end, it may also be \r\n
-                start_marker = b'# start delvewheel patch'
-                end_marker = b'# end delvewheel patch'
-            else:
-                start_marker = '# start delvewheel patch'
-                end_marker = '# end delvewheel patch'
-
-            start = code.find(start_marker)
-            while start >= 0:
-                end = code.find(end_marker, start) + len(end_marker)
-                code = code[:start] + code[end:]
-                start = code.find(start_marker)
-
+            code = _strip_delvewheel_patch(code)
             code += b'\n' if isinstance(code, bytes) else '\n'
             co = compile(code, pathname, 'exec', optimize=self.optimize)
         elif type == _PY_COMPILED:
@@ -2666,16 +2921,65 @@ class PandaModuleFinder(modulefinder.ModuleFinder):
         else:
             co = None
 
+        if cached is None and cache is not None and co:
+            imports = list(_iter_code_imports(self.scan_opcodes, co))
+            cache.store(pathname, self.optimize, co, imports)
+
         m = self.add_module(fqname)
         m.__file__ = pathname
         if co:
+            if imports is not None and cache.workers != 0:
+                # Get a head start on the modules that this one imports.
+                self._prefetch_imports(m, imports)
             if self.replace_paths:
                 co = self.replace_paths_in_code(co)
             m.__code__ = co
-            self.scan_code(co, m)
+            self.scan_code(co, m, imports)
         self.msgout(2, "load_module ->", m)
         return m
 
+    def _prefetch_imports(self, caller, imports):
+        """ Asks the cache to start scanning the source files of the modules
+        imported by the given module, before scan_code gets to them.  Only
+        submodules of packages that have already been loaded are considered,
+        since the others cannot be located yet. """
+
+        sources = []
+        for what, args in imports:
+            if what == "absolute_import":
+                fromlist, name = args
+                fullname = name
+            elif what == "relative_import":
+                level, fromlist, name = args
+                parent = caller.__name__
+                if not caller.__path__:
+                    level += 1
+                for i in range(level - 1):
+                    parent = parent.rpartition('.')[0]
+                if not parent:
+                    continue
+                fullname = parent + '.' + name if name else parent
+            else:
+                continue
+
+            names = [fullname]
+            if fromlist:
+                names += [fullname + '.' + sub for sub in fromlist if sub != '*']
+
+            for subname in names:
+                pkgname, _, tail = subname.rpartition('.')
+                package = self.modules.get(pkgname)
+                if package is None or not package.__path__ or subname in self.modules:
+                    continue
+                for dirname in package.__path__:
+                    pathname = os.path.join(dirname, tail + '.py')
+                    if os.path.isfile(pathname):
+                        sources.append(pathname)
+                        break
+
+        if sources:
+            self.cache.prefetch(sources, self.optimize)
+
     # This function is provided here since the Python library version has a bug
     # (see bpo-35376)
     def _safe_import_hook(self, name, caller, fromlist, level=-1):
@@ -2709,15 +3013,20 @@ class PandaModuleFinder(modulefinder.ModuleFinder):
                         self.msg(2, "ImportError:", str(msg))
                         self._add_badmodule(fullname, caller)
 
-    def scan_code(self, co, m):
-        code = co.co_code
-        # This was renamed to scan_opcodes in Python 3.6
-        if hasattr(self, 'scan_opcodes_25'):
-            scanner = self.scan_opcodes_25
-        else:
-            scanner = self.scan_opcodes
+    def scan_code(self, co, m, imports=None):
+        """ Processes the imports in the given code object and all code
+        objects nested in it.  imports may be given to use the previously
+        found imports instead of scanning the code again. """
 
-        for what, args in scanner(co):
+        if imports is None:
+            # This was renamed to scan_opcodes in Python 3.6
+            if hasattr(self, 'scan_opcodes_25'):
+                scanner = self.scan_opcodes_25
+            else:
+                scanner = self.scan_opcodes
+            imports = _iter_code_imports(scanner, co)
+
+        for what, args in imports:
             if what == "store":
                 name, = args
                 m.globalnames[name] = 1
@@ -2777,10 +3086,6 @@ class PandaModuleFinder(modulefinder.ModuleFinder):
                 # We don't expect anything else from the generator.
                 raise RuntimeError(what)
 
-        for c in co.co_consts:
-            if isinstance(c, type(co)):
-                self.scan_code(c, m)
-
     def find_module(self, name, path=None, parent=None):
         """ Finds a module with the indicated name on the given search path
         (or self.path if None).  Returns a tuple like (fp, path, stuff), where
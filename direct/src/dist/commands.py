@@ -5,6 +5,9 @@ on how to use these commands.
 """
 
 import os
+import hashlib
+import io
+import pickle
 import plistlib
 import sys
 import subprocess
@@ -18,6 +21,7 @@ import tempfile
 
 import setuptools
 import distutils.log
+from concurrent.futures import ThreadPoolExecutor
 
 from . import FreezeTool
 from . import pefile
@@ -26,6 +30,14 @@ from .icon import Icon
 from ._dist_hooks import finalize_distribution_options
 import panda3d.core as p3d
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# The ioctl request to make a copy-on-write clone of a file on Linux.
+_FICLONE = 0x40049409
+
 
 def _parse_list(input):
     if isinstance(input, str):
@@ -331,6 +343,8 @@ class build_apps(setuptools.Command):
         self.prefer_discrete_gpu = False
         self.requirements_path = os.path.join(os.getcwd(), 'requirements.txt')
         self.strip_docstrings = True
+        self.use_module_cache = True
+        self.dependency_link_mode = 'reflink'
         self.use_optimized_wheels = True
         self.optimized_wheel_index = ''
         self.pypi_extra_indexes = [
@@ -419,6 +433,12 @@ class build_apps(setuptools.Command):
         # We keep track of the zip files we've opened.
         self._zip_files = {}
 
+        # Dependencies found in binaries, keyed by a hash of their contents.
+        self._dependency_cache = {}
+
+        # Copies of binaries that are still to be made, see finish_copies().
+        self._pending_copies = {}
+
     def _get_zip_file(self, path):
         if path in self._zip_files:
             return self._zip_files[path]
@@ -494,6 +514,8 @@ class build_apps(setuptools.Command):
             assert self.optimized_wheel_index, 'An index for optimized wheels must be defined if use_optimized_wheels is set'
 
         assert os.path.exists(self.requirements_path), 'Requirements.txt path does not exist: {}'.format(self.requirements_path)
+        assert self.dependency_link_mode in ('copy', 'reflink', 'hardlink'), \
+            'dependency_link_mode must be one of copy, reflink or hardlink'
         assert num_gui_apps + num_console_apps != 0, 'Must specify at least one app in either gui_apps or console_apps'
 
         self.exclude_dependencies = [p3d.GlobPattern(i) for i in self.exclude_dependencies]
@@ -567,6 +589,9 @@ class build_apps(setuptools.Command):
     def run(self):
         self.announce('Building platforms: {0}'.format(','.join(self.platforms)), distutils.log.INFO)
 
+        dependency_cache_path = os.path.join(self.build_base, '__dependency_cache__.pickle')
+        self.load_dependency_cache(dependency_cache_path)
+
         for platform in self.platforms:
             # Create the build directory, or ensure it is empty.
             build_dir = os.path.join(self.build_base, platform)
@@ -633,6 +658,8 @@ class build_apps(setuptools.Command):
             if self.macos_main_app and 'macosx' in platform:
                 self.bundle_macos_app(build_dir)
 
+        self.save_dependency_cache(dependency_cache_path)
+
     def download_wheels(self, platform):
         """ Downloads wheels for the given platform using pip. This includes panda3d
         wheels. These are special wheels that are expected to contain a deploy_libs
@@ -1065,12 +1092,21 @@ class build_apps(setuptools.Command):
 
             return search_path
 
+        # Remember the imports of the scanned modules between builds, so
+        # that only modules that have changed need to be scanned again.
+        if self.use_module_cache:
+            module_cache = FreezeTool.ModuleScanCache(
+                os.path.join(self.build_base, '__module_cache__.pickle'))
+        else:
+            module_cache = None
+
         def create_runtime(platform, appname, mainscript, use_console):
             freezer = FreezeTool.Freezer(
                 platform=platform,
                 path=path,
                 hiddenImports=self.hidden_imports,
-                optimize=2 if self.strip_docstrings else 1
+                optimize=2 if self.strip_docstrings else 1,
+                moduleCache=module_cache,
             )
             freezer.addModule('__main__', filename=mainscript)
             if platform.startswith('android'):
@@ -1161,6 +1197,10 @@ class build_apps(setuptools.Command):
         for appname, scriptname in self.console_apps.items():
             create_runtime(platform, appname, scriptname, True)
 
+        if module_cache is not None:
+            module_cache.save()
+            module_cache.close()
+
         # Warn if tkinter is used but hasn't been added to requirements.txt
         if not has_tkinter_wheel and '_tkinter' in freezer_modules:
             self.warn("Detected use of tkinter, but tkinter is not specified in requirements.txt!")
@@ -1256,6 +1296,9 @@ class build_apps(setuptools.Command):
             self.copy(os.path.join(p3dwhlfn, 'deploy_libs', 'classes.dex'),
                       os.path.join(binary_dir, '..', '..', 'classes.dex'))
 
+        # Now that we know all the binaries we need, copy them over.
+        self.finish_copies()
+
         # Extract any other data files from dependency packages.
         if data_dir is None:
             return
@@ -1294,12 +1337,15 @@ class build_apps(setuptools.Command):
                             if 'PKG_DATA_MAKE_EXECUTABLE' in flags:
                                 search_path = get_search_path_for(source_path)
                                 self.copy_with_dependencies(source_path, target_path, search_path)
+                                self.finish_copies()
                                 mode = os.stat(target_path).st_mode
                                 mode |= stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
                                 os.chmod(target_path, mode)
                             else:
                                 self.copy(source_path, target_path)
 
+        self.finish_copies()
+
     def build_assets(self, platform, data_dir):
         """ Builds the data files for the given platform. """
 
@@ -1416,7 +1462,8 @@ class build_apps(setuptools.Command):
         """ Searches for the given DLL on the search path.  If it exists,
         copies it to the target_dir. """
 
-        if os.path.exists(os.path.join(target_dir, name)):
+        target_path = os.path.join(target_dir, name)
+        if target_path in self._pending_copies or os.path.exists(target_path):
             # We've already added it earlier.
             return
 
@@ -1505,9 +1552,11 @@ class build_apps(setuptools.Command):
         any dependencies, which are located along the given search_path and
         copied to the same directory as target_path.
 
-        source_path may be located inside a .whl file. """
+        The copies are not made right away, but only when finish_copies() is
+        called, so that they can be made in parallel once all dependencies
+        have been found.
 
-        self.copy(source_path, target_path)
+        source_path may be located inside a .whl file. """
 
         source_dir = os.path.dirname(source_path)
         target_dir = os.path.dirname(target_path)
@@ -1515,15 +1564,151 @@ class build_apps(setuptools.Command):
 
         if source_dir not in search_path:
             search_path = search_path + [source_dir]
-        self.copy_dependencies(target_path, target_dir, search_path, base)
+
+        data = self._read_file(source_path)
+        deps, patched = self._get_dependencies(data, target_dir, search_path)
+        if patched is not None:
+            data = patched
+        elif '.whl' not in source_path:
+            # We can copy (or link) the file directly.
+            data = None
+        self._pending_copies[target_path] = (source_path, data)
+
+        # If we discovered any dependencies, recursively add those.
+        for dep in deps:
+            self.add_dependency(dep, target_dir, search_path, base)
 
     def copy_dependencies(self, target_path, target_dir, search_path, referenced_by):
         """ Copies the dependencies of target_path into target_dir. """
 
-        fp = open(target_path, 'rb+')
+        with open(target_path, 'rb') as fp:
+            data = fp.read()
+
+        deps, patched = self._get_dependencies(data, target_dir, search_path)
+        if patched is not None:
+            with open(target_path, 'wb') as fp:
+                fp.write(patched)
+
+        # If we discovered any dependencies, recursively add those.
+        for dep in deps:
+            self.add_dependency(dep, target_dir, search_path, referenced_by)
+
+    def finish_copies(self):
+        """ Makes all the copies queued up by copy_with_dependencies(), using
+        a pool of threads. """
+
+        pending = self._pending_copies
+        if not pending:
+            return
+        self._pending_copies = {}
+
+        for target_path, (source_path, data) in pending.items():
+            try:
+                self.announce('copying {0} -> {1}'.format(os.path.relpath(source_path, self.build_base), os.path.relpath(target_path, self.build_base)))
+            except ValueError:
+                self.announce('copying {0} -> {1}'.format(source_path, target_path))
+
+        with ThreadPoolExecutor() as pool:
+            futures = [
+                pool.submit(self._write_copy, source_path, target_path, data)
+                for target_path, (source_path, data) in pending.items()
+            ]
+            for future in futures:
+                future.result()
+
+    def _write_copy(self, source_path, target_path, data):
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+        if data is not None:
+            with open(target_path, 'wb') as fp:
+                fp.write(data)
+            return
+
+        mode = self.dependency_link_mode
+        if mode == 'hardlink':
+            # Only safe if the build does not modify the file afterwards.
+            try:
+                os.link(source_path, target_path)
+                return
+            except OSError:
+                pass
+
+        elif mode == 'reflink' and fcntl is not None and sys.platform.startswith('linux'):
+            # Make a copy-on-write clone, if the filesystem supports it.
+            try:
+                with open(source_path, 'rb') as src, open(target_path, 'wb') as dst:
+                    fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+
+        shutil.copyfile(source_path, target_path)
+
+    def _read_file(self, source_path):
+        """ Returns the contents of source_path, which may be located inside
+        a .whl file. """
+
+        if '.whl' in source_path:
+            whl, wf = source_path.split('.whl' + os.path.sep)
+            whl += '.whl'
+            whlfile = self._get_zip_file(whl)
+            return whlfile.read(wf.replace(os.path.sep, '/'))
+
+        with open(source_path, 'rb') as fp:
+            return fp.read()
+
+    def load_dependency_cache(self, path):
+        """ Loads the dependencies found in binaries in a previous build. """
+
+        try:
+            with open(path, 'rb') as fp:
+                self._dependency_cache.update(pickle.load(fp))
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            pass
+
+    def save_dependency_cache(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fp:
+            pickle.dump(self._dependency_cache, fp, pickle.HIGHEST_PROTOCOL)
+
+    def _get_dependencies(self, data, target_dir, search_path):
+        """ Returns the names of the libraries that the binary with the given
+        contents depends on, along with the rewritten contents if these need
+        to be changed (or None otherwise).  Any rpath entries of the binary
+        are added to search_path.
+
+        The results are cached by a hash of the contents, so that a library
+        is only parsed once, even if it is used on several platforms. """
+
+        key = hashlib.sha1(data).digest()
+        entry = self._dependency_cache.get(key)
+        if entry is None:
+            deps, rpath, patched = self._scan_dependencies(data)
+            entry = (deps, rpath, patched is not None)
+            self._dependency_cache[key] = entry
+        elif entry[2]:
+            # We don't store the rewritten contents, so do it again.
+            patched = self._scan_dependencies(data)[2]
+        else:
+            patched = None
+
+        deps, rpath, _ = entry
+        search_path += [
+            os.path.normpath(i.replace('$ORIGIN', target_dir))
+            for i in rpath
+        ]
+        return deps, patched
+
+    def _scan_dependencies(self, data):
+        """ Parses the binary with the given contents.  Returns a tuple of
+        the dependencies, the unexpanded rpath entries, and the rewritten
+        contents (or None if unchanged). """
+
+        fp = io.BytesIO(data)
 
         # What kind of magic does the file contain?
         deps = []
+        rpath = []
         magic = fp.read(4)
         if magic.startswith(b'MZ'):
             # It's a Windows DLL or EXE file.
@@ -1534,14 +1719,13 @@ class build_apps(setuptools.Command):
 
         elif magic == b'\x7FELF':
             # Elf magic.  Used on (among others) Linux and FreeBSD.
-            deps = self._read_dependencies_elf(fp, target_dir, search_path)
+            deps, rpath = self._read_elf_dynamic(fp)
 
         elif magic in (b'\xCE\xFA\xED\xFE', b'\xCF\xFA\xED\xFE'):
             # A Mach-O file, as used on macOS.
             deps = self._read_dependencies_macho(fp, '<', flatten=True)
 
         elif magic in (b'\xFE\xED\xFA\xCE', b'\xFE\xED\xFA\xCF'):
-            rel_dir = os.path.relpath(target_dir, os.path.dirname(target_path))
             deps = self._read_dependencies_macho(fp, '>', flatten=True)
 
         elif magic in (b'\xCA\xFE\xBA\xBE', b'\xBE\xBA\xFE\xCA'):
@@ -1554,13 +1738,16 @@ class build_apps(setuptools.Command):
             # A 64-bit fat file.
             deps = self._read_dependencies_fat(fp, True, flatten=True)
 
-        # If we discovered any dependencies, recursively add those.
-        for dep in deps:
-            self.add_dependency(dep, target_dir, search_path, referenced_by)
+        # Flattening the Mach-O dependencies may have changed the contents.
+        patched = fp.getvalue()
+        if patched == data:
+            patched = None
+
+        return deps, rpath, patched
 
-    def _read_dependencies_elf(self, elf, origin, search_path):
-        """ Having read the first 4 bytes of the ELF file, fetches the
-        dependent libraries and returns those as a list. """
+    def _read_elf_dynamic(self, elf):
+        """ Having read the first 4 bytes of the ELF file, returns the
+        dependent libraries and the (unexpanded) rpath entries. """
 
         ident = elf.read(12)
 
@@ -1610,17 +1797,12 @@ class build_apps(setuptools.Command):
                 elif tag == 15 or tag == 29:
                     # An RPATH or RUNPATH entry.
                     string = string_tables[link][val : string_tables[link].find(b'\0', val)]
-                    rpath += [
-                        os.path.normpath(i.decode('utf-8').replace('$ORIGIN', origin))
-                        for i in string.split(b':')
-                    ]
+                    rpath += [i.decode('utf-8') for i in string.split(b':')]
 
                 data = elf.read(entsize)
                 tag, val = struct.unpack_from(dynamic_struct, data)
-        elf.close()
 
-        search_path += rpath
-        return needed
+        return needed, rpath
 
     def _read_dependencies_macho(self, fp, endian, flatten=False):
         """ Having read the first 4 bytes of the Mach-O file, fetches the
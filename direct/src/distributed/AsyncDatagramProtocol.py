@@ -0,0 +1,193 @@
+"""AsyncDatagramProtocol module: contains the AsyncDatagramProtocol class,
+which exchanges Panda datagrams over TCP on an asyncio event loop."""
+
+__all__ = ['AsyncDatagramProtocol', 'ConnectionDatagram', 'openDatagramConnection']
+
+from panda3d.core import ConfigVariableInt
+from direct.directnotify.DirectNotifyGlobal import directNotify
+from direct.distributed.PyDatagram import PyDatagram
+
+import asyncio
+import struct
+
+
+_tcp_header_size = ConfigVariableInt('tcp-header-size', 2)
+_async_net_max_write_buffer = ConfigVariableInt('async-net-max-write-buffer', 4 * 1024 * 1024)
+
+_headers = {
+    2: struct.Struct('<H'),
+    4: struct.Struct('<I'),
+}
+
+
+class ConnectionDatagram(PyDatagram):
+    """
+    A datagram received by an AsyncDatagramProtocol.  Like a NetDatagram,
+    it remembers the connection it was received on.
+    """
+
+    def __init__(self, data, connection):
+        PyDatagram.__init__(self, data)
+        self.connection = connection
+
+    def getConnection(self):
+        return self.connection
+
+
+class AsyncDatagramProtocol(asyncio.Protocol):
+    """
+    Exchanges datagrams with a peer that uses Panda's ConnectionReader and
+    ConnectionWriter, such as a ServerRepository or a ClientRepository.
+    As on those, every datagram is preceded by its length in bytes, as a
+    little-endian integer of tcp-header-size (2 or 4) bytes.
+
+    Instead of being polled for new datagrams, the protocol calls the
+    handler as soon as the event loop finds data on the socket.  The
+    handler is any object with these methods:
+
+        connectionMade(connection)
+        datagramReceived(connection, datagram)
+        connectionLost(connection)
+
+    Datagrams sent in the same pass of the event loop are written to the
+    socket together.  If the peer does not keep up and more than
+    maxWriteBuffer bytes are waiting to be sent, the connection is
+    closed.
+    """
+    notify = directNotify.newCategory("AsyncDatagramProtocol")
+
+    def __init__(self, handler, headerSize=None, maxWriteBuffer=None):
+        if headerSize is None:
+            headerSize = _tcp_header_size.value
+        if headerSize not in _headers:
+            raise ValueError('Unsupported TCP header size: %s' % (headerSize))
+        if maxWriteBuffer is None:
+            maxWriteBuffer = _async_net_max_write_buffer.value
+
+        self.handler = handler
+        self.headerSize = headerSize
+        self.maxWriteBuffer = maxWriteBuffer
+        self.transport = None
+
+        #: The address of the peer, as reported by the transport.
+        self.peerName = None
+
+        self.numDatagramsReceived = 0
+        self.numDatagramsSent = 0
+
+        self.__header = _headers[headerSize]
+        self.__maxLength = (1 << (8 * headerSize)) - 1
+        self.__buffer = bytearray()
+        self.__pending = []
+        self.__flushScheduled = False
+        self.__closing = False
+        self.__loop = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.peerName = transport.get_extra_info('peername')
+        self.__loop = asyncio.get_event_loop()
+        self.handler.connectionMade(self)
+
+    def data_received(self, data):
+        buffer = self.__buffer
+        buffer += data
+
+        header = self.__header
+        headerSize = self.headerSize
+        handler = self.handler
+        size = len(buffer)
+        pos = 0
+        while size - pos >= headerSize and not self.__closing:
+            start = pos + headerSize
+            end = start + header.unpack_from(buffer, pos)[0]
+            if end > size:
+                # Wait for the rest of this datagram.
+                break
+
+            datagram = ConnectionDatagram(bytes(buffer[start:end]), self)
+            pos = end
+            self.numDatagramsReceived += 1
+            handler.datagramReceived(self, datagram)
+
+        if pos:
+            del buffer[:pos]
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            self.notify.info("Lost connection to %s: %s" % (self.peerName, exc))
+        self.__closing = True
+        self.__pending = []
+        self.transport = None
+        self.handler.connectionLost(self)
+
+    def isConnected(self):
+        return self.transport is not None and not self.__closing
+
+    def sendDatagram(self, datagram):
+        """
+        Queues the datagram to be sent at the end of the current pass of the
+        event loop.  Returns false if the connection is closed or the
+        datagram is too long for the header size.
+        """
+        if self.__closing:
+            return False
+
+        data = datagram.getMessage()
+        if len(data) > self.__maxLength:
+            self.notify.warning(
+                "Attempt to send datagram of %s bytes with a %s-byte header" % (
+                len(data), self.headerSize))
+            return False
+
+        pending = self.__pending
+        pending.append(self.__header.pack(len(data)))
+        pending.append(data)
+        self.numDatagramsSent += 1
+
+        if not self.__flushScheduled:
+            self.__flushScheduled = True
+            self.__loop.call_soon(self.flush)
+        return True
+
+    def flush(self):
+        """
+        Immediately writes all queued datagrams to the transport.
+        """
+        self.__flushScheduled = False
+        pending = self.__pending
+        if not pending or self.transport is None:
+            return
+
+        self.__pending = []
+        transport = self.transport
+        transport.write(b''.join(pending))
+        if transport.get_write_buffer_size() > self.maxWriteBuffer:
+            self.notify.warning(
+                "Closing connection to %s: %s bytes waiting to be sent" % (
+                self.peerName, transport.get_write_buffer_size()))
+            self.close()
+
+    def close(self):
+        """
+        Closes the connection after sending the queued datagrams.
+        connectionLost() is called on the handler once it is closed.
+        """
+        if self.__closing:
+            return
+
+        self.__closing = True
+        self.flush()
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def openDatagramConnection(handler, host, port, headerSize=None):
+    """
+    Connects to the indicated server, and returns the AsyncDatagramProtocol
+    for the new connection.
+    """
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_connection(
+        lambda: AsyncDatagramProtocol(handler, headerSize), host, port)
+    return protocol
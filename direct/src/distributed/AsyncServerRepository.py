@@ -0,0 +1,158 @@
+"""AsyncServerRepository module: contains the AsyncServerRepository class"""
+
+__all__ = ['AsyncServerRepository']
+
+from panda3d.core import ConfigVariableInt
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+from direct.directnotify import DirectNotifyGlobal
+from direct.distributed.ServerRepository import ServerRepository
+from direct.distributed.AsyncDatagramProtocol import AsyncDatagramProtocol
+
+import asyncio
+
+
+class AsyncServerRepository(ServerRepository):
+
+    """ A ServerRepository that serves its clients from an asyncio event
+    loop, instead of polling Panda's connection manager every frame.
+
+    It speaks the same protocol as the ServerRepository, and works with
+    the same clients.  Incoming messages are handled as soon as the event
+    loop finds them on a socket, so an idle server does no work at all,
+    and a single event loop can serve many thousands of connections.
+
+    The server starts listening when start() is awaited.  On a dedicated
+    server process, the event loop can run the server by itself::
+
+        async def main():
+            server = AsyncServerRepository(4400, dcFileNames=['game.dc'])
+            await server.start()
+            await server.serveForever()
+
+        asyncio.run(main())
+
+    Alternatively, startEventLoopTask() runs an event loop from the task
+    manager, for a server that is part of a Panda application. """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory("AsyncServerRepository")
+
+    def __init__(self, tcpPort, serverAddress = None, dcFileNames = None,
+                 backlog = 100):
+        self.backlog = backlog
+        ServerRepository.__init__(self, tcpPort, serverAddress,
+                                  dcFileNames = dcFileNames)
+
+    def openServer(self, tcpPort, serverAddress, threadedNet):
+        # The listening socket is not opened until start() is called on
+        # the event loop.
+        self.tcpPort = tcpPort
+        self.serverAddress = serverAddress
+        self.tcpHeaderSize = ConfigVariableInt('tcp-header-size', 2).value
+        self.server = None
+        self.eventLoop = None
+        self.eventLoopTask = None
+        self.__ownEventLoop = False
+
+    async def start(self):
+        """ Starts listening for clients on the running event loop. """
+        assert self.server is None
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            self.makeProtocol, self.serverAddress or None, self.tcpPort,
+            backlog = self.backlog)
+        self.notify.info("Listening on port %s" % (self.getPort()))
+
+    async def serveForever(self):
+        """ Serves clients until the server is closed. """
+        try:
+            await self.server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def close(self):
+        """ Stops listening for clients and disconnects all connected
+        clients. """
+        if self.server is not None:
+            self.server.close()
+        for client in list(self.clientsByConnection.values()):
+            self.handleClientDisconnect(client)
+
+    async def waitClosed(self):
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    def getPort(self):
+        """ Returns the port the server is listening on.  This is useful
+        if the server was created with port 0, to listen on any free
+        port. """
+        return self.server.sockets[0].getsockname()[1]
+
+    def startEventLoopTask(self, loop = None):
+        """ Starts the server, and runs the indicated event loop (or a new
+        one) from a task every frame. """
+        self.stopEventLoopTask()
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self.__ownEventLoop = True
+        self.eventLoop = loop
+        loop.run_until_complete(self.start())
+        self.eventLoopTask = taskMgr.add(
+            self.eventLoopPoll, "serverEventLoopTask")
+
+    def stopEventLoopTask(self):
+        """ Closes the server started by startEventLoopTask(). """
+        if self.eventLoopTask is None:
+            return
+        taskMgr.remove(self.eventLoopTask)
+        self.eventLoopTask = None
+
+        loop = self.eventLoop
+        self.close()
+        loop.run_until_complete(self.waitClosed())
+        self.server = None
+        if self.__ownEventLoop:
+            loop.close()
+            self.__ownEventLoop = False
+        self.eventLoop = None
+
+    def eventLoopPoll(self, task):
+        # Run the event loop twice without waiting: first to handle any
+        # incoming messages, then to send the replies within the same
+        # frame.
+        loop = self.eventLoop
+        for i in range(2):
+            loop.stop()
+            loop.run_forever()
+        return Task.cont
+
+    def setTcpHeaderSize(self, headerSize):
+        """Sets the header size of TCP packets.  Only affects clients that
+        connect after this call.  Legal values are 2 or 4."""
+        assert headerSize in (2, 4)
+        self.tcpHeaderSize = headerSize
+
+    def getTcpHeaderSize(self):
+        return self.tcpHeaderSize
+
+    def makeProtocol(self):
+        return AsyncDatagramProtocol(self, self.tcpHeaderSize)
+
+    def connectionMade(self, connection):
+        client = self.registerClient(connection, connection.peerName)
+        self.sendDoIdRange(client)
+
+    def datagramReceived(self, connection, datagram):
+        self.handleDatagram(datagram)
+
+    def connectionLost(self, connection):
+        # The client did not tell us it was leaving.
+        client = self.clientsByConnection.get(connection)
+        if client is not None:
+            self.handleClientDisconnect(client)
+
+    def sendToClient(self, datagram, client):
+        client.connection.sendDatagram(datagram)
+
+    def closeConnection(self, client):
+        client.connection.close()
@@ -0,0 +1,79 @@
+"""CRPool module: contains the CRPool class"""
+
+from direct.directnotify import DirectNotifyGlobal
+from . import DistributedObject
+
+
+class CRPool:
+    """
+    Keeps disabled DistributedObjects around so that they can be reused
+    for new doIds of the same class.
+
+    Where the CRCache holds on to an object in case the same doId is
+    generated again, the pool recycles instances across doIds: a churny
+    class such as a projectile or a pickup can then be generated many
+    times without constructing and tearing down a new instance each time.
+
+    A class opts in by setting its poolSize attribute to the number of
+    disabled instances that may be kept.  It must also redefine recycle()
+    to reset any state that disable() does not, since a pooled object
+    goes through generateInit(), generate() and the required fields again
+    without being constructed anew.
+    """
+    notify = DirectNotifyGlobal.directNotify.newCategory("CRPool")
+
+    def __init__(self):
+        self.__free = {}
+
+        #: The number of objects that were put in the pool.
+        self.numReleased = 0
+        #: The number of generates that reused a pooled object.
+        self.numReused = 0
+
+    def release(self, distObj):
+        """
+        Disables the object and puts it in the pool, if its class allows
+        it and there is room.  Returns true if the object was pooled, or
+        false if it should be deleted as usual.
+        """
+        cls = distObj.__class__
+        poolSize = getattr(cls, 'poolSize', 0)
+        if poolSize <= 0 or distObj.getDelayDeleteCount() > 0:
+            return False
+
+        assert isinstance(distObj, DistributedObject.DistributedObject)
+        free = self.__free.setdefault(cls, [])
+        if len(free) >= poolSize:
+            return False
+
+        distObj.disableAndAnnounce()
+        distObj._recycleDO()
+        free.append(distObj)
+        self.numReleased += 1
+        return True
+
+    def retrieve(self, classDef):
+        """
+        Returns a pooled object of exactly the given class, or None if
+        there is none.
+        """
+        free = self.__free.get(classDef)
+        if free:
+            self.numReused += 1
+            return free.pop()
+        return None
+
+    def getNumFree(self, classDef):
+        return len(self.__free.get(classDef, ()))
+
+    def flush(self):
+        """
+        Deletes all the pooled objects.
+        """
+        CRPool.notify.debug("Flushing the pool")
+        free = self.__free
+        self.__free = {}
+        for objects in free.values():
+            for distObj in objects:
+                distObj.disableAnnounceAndDelete()
+                distObj.detectLeaks()
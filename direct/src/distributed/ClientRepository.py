@@ -58,6 +58,11 @@ class ClientRepository(ClientRepositoryBase):
         # Explicitly-requested interest zones.
         self.interestZones = []
 
+        # If a reader poll budget is set, let field updates run over it,
+        # but stop early after a generate, since these come in bulk.
+        self.setMsgTypePriority(OBJECT_UPDATE_FIELD_CMU, 2)
+        self.setMsgTypePriority(OBJECT_GENERATE_CMU, 0.5)
+
     def handleSetDoIdrange(self, di):
         self.doIdBase = di.getUint32()
         self.doIdLast = self.doIdBase + di.getUint32()
@@ -212,7 +217,7 @@ class ClientRepository(ClientRepositoryBase):
         dclass = self.dclassesByName.get(className)
         if not dclass:
             self.notify.error("Unknown distributed class: %s" % (distObj.__class__))
-        classDef = dclass.getClassDef()
+        classDef = self.getClassDef(dclass)
         if classDef is None:
             self.notify.error("Could not create an undefined %s object." % (
                 dclass.getName()))
@@ -391,8 +396,9 @@ class ClientRepository(ClientRepositoryBase):
             # Remove it from the dictionary
             del self.doId2do[doId]
             # Disable, announce, and delete the object itself...
-            # unless delayDelete is on...
-            obj.deleteOrDelay()
+            # unless delayDelete is on, or it can be pooled.
+            if not self.pool.release(obj):
+                obj.deleteOrDelay()
             if self.isLocalId(doId):
                 self.freeDoId(doId)
         elif self.cache.contains(doId):
@@ -14,6 +14,7 @@ from direct.showbase.PythonUtil import safeRepr, itype, makeList
 from direct.showbase.MessengerGlobal import messenger
 from .MsgTypes import CLIENT_ENTER_OBJECT_REQUIRED_OTHER, MsgId2Names
 from . import CRCache
+from . import CRPool
 from . import ParentMgr
 from . import RelatedObjectMgr
 import time
@@ -55,6 +56,7 @@ class ClientRepositoryBase(ConnectionRepository):
         self.cache=CRCache.CRCache()
         self.doDataCache = CRDataCache()
         self.cacheOwner=CRCache.CRCache()
+        self.pool = CRPool.CRPool()
         self.serverDelta = 0
 
         self.bootedIndex = None
@@ -253,10 +255,14 @@ class ClientRepositoryBase(ConnectionRepository):
         else:
             # ...it is not in the dictionary or the cache.
             # Construct a new one
-            classDef = dclass.getClassDef()
+            classDef = self.getClassDef(dclass)
             if classDef is None:
                 self.notify.error("Could not create an undefined %s object." % (dclass.getName()))
-            distObj = classDef(self)
+            distObj = None
+            if getattr(classDef, 'poolSize', 0):
+                distObj = self.pool.retrieve(classDef)
+            if distObj is None:
+                distObj = classDef(self)
             distObj.dclass = dclass
             # Assign it an Id
             distObj.doId = doId
@@ -269,7 +275,7 @@ class ClientRepositoryBase(ConnectionRepository):
             distObj.setLocation(parentId, zoneId)
             distObj.updateRequiredFields(dclass, di)
             # updateRequiredFields calls announceGenerate
-            self.notify.debug("New DO:%s, dclass:%s" % (doId, dclass.getName()))
+            self.notify.debug("New DO:%s, dclass:%s", doId, dclass.getName())
         return distObj
 
     def generateWithRequiredOtherFields(self, dclass, doId, di,
@@ -301,10 +307,14 @@ class ClientRepositoryBase(ConnectionRepository):
         else:
             # ...it is not in the dictionary or the cache.
             # Construct a new one
-            classDef = dclass.getClassDef()
+            classDef = self.getClassDef(dclass)
             if classDef is None:
                 self.notify.error("Could not create an undefined %s object." % (dclass.getName()))
-            distObj = classDef(self)
+            distObj = None
+            if getattr(classDef, 'poolSize', 0):
+                distObj = self.pool.retrieve(classDef)
+            if distObj is None:
+                distObj = classDef(self)
             distObj.dclass = dclass
             # Assign it an Id
             distObj.doId = doId
@@ -344,7 +354,7 @@ class ClientRepositoryBase(ConnectionRepository):
         else:
             # ...it is not in the dictionary or the cache.
             # Construct a new one
-            classDef = dclass.getOwnerClassDef()
+            classDef = self.getOwnerClassDef(dclass)
             if classDef is None:
                 self.notify.error("Could not create an undefined %s object. Have you created an owner view?" % (dclass.getName()))
             distObj = classDef(self)
@@ -376,7 +386,7 @@ class ClientRepositoryBase(ConnectionRepository):
             cached = False
             if distObj.getCacheable() and distObj.getDelayDeleteCount() <= 0:
                 cached = cache.cache(distObj)
-            if not cached:
+            if not cached and (ownerView or not self.pool.release(distObj)):
                 distObj.deleteOrDelay()
                 if distObj.getDelayDeleteCount() <= 0:
                     # make sure we're not leaking
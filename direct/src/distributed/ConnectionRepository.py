@@ -1,4 +1,14 @@
-from panda3d.core import DocumentSpec, Filename, HTTPClient, VirtualFileSystem, getModelPath
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableDouble,
+    ConfigVariableInt,
+    ConfigVariableList,
+    DocumentSpec,
+    Filename,
+    HTTPClient,
+    VirtualFileSystem,
+    getModelPath,
+)
 from panda3d.direct import CConnectionRepository, DCPacker
 from direct.task import Task
 from direct.task.TaskManagerGlobal import taskMgr
@@ -6,10 +16,13 @@ from direct.directnotify.DirectNotifyGlobal import directNotify
 from direct.distributed.DoInterestManager import DoInterestManager
 from direct.distributed.DoCollectionManager import DoCollectionManager
 from direct.showbase import GarbageReport
+from direct.showbase.GarbageCollectScheduler import GarbageCollectScheduler
 from direct.showbase.MessengerGlobal import messenger
 from .PyDatagramIterator import PyDatagramIterator
 
 import gc
+import inspect
+import time
 
 __all__ = ["ConnectionRepository", "GCTrigger"]
 
@@ -34,6 +47,9 @@ class ConnectionRepository(
     GarbageCollectTaskName = "allowGarbageCollect"
     GarbageThresholdTaskName = "adjustGarbageCollectThreshold"
 
+    # The GarbageCollectScheduler, if want-adaptive-gc is set.
+    gcScheduler = None
+
     def __init__(self, connectMethod, config, hasOwnerView = False,
                  threadedNet = None):
         assert self.notify.debugCall()
@@ -115,6 +131,20 @@ class ConnectionRepository(
         self.recorder = None
         self.readerPollTaskObj = None
 
+        # The amount of time and number of messages the reader poll task
+        # may spend handling incoming messages each frame; see
+        # setReaderPollBudget().  0 means there is no limit.
+        self.readerPollMaxTime = ConfigVariableDouble('reader-poll-max-time', 0.0).value
+        self.readerPollMaxMessages = ConfigVariableInt('reader-poll-max-messages', 0).value
+        self.msgTypePriorities = {}
+        self.resetReaderPollStats()
+
+        # Whether readDCFile() should defer importing the modules listed in
+        # the DC file until a class is first needed; see getClassDef().
+        self.lazyDcImport = ConfigVariableBool('lazy-dc-import', False).value
+        self.lazyClassDefs = {}
+        self.lazyOwnerClassDefs = {}
+
         # This is the string that is appended to symbols read from the
         # DC file.  The AIRepository will redefine this to 'AI'.
         self.dcSuffix = ''
@@ -129,7 +159,14 @@ class ConnectionRepository(
             # garbage collection CPU usage is O(n), n = number of Python objects
             gc.set_debug(gc.DEBUG_SAVEALL)
 
-        if self.config.GetBool('want-garbage-collect-task', 1):
+        if ConfigVariableBool('want-adaptive-gc', False).value:
+            # run the full collections in idle frame time, and freeze the
+            # objects created during startup.  One scheduler serves all the
+            # repositories in the process.
+            if ConnectionRepository.gcScheduler is None:
+                ConnectionRepository.gcScheduler = GarbageCollectScheduler()
+                ConnectionRepository.gcScheduler.start()
+        elif self.config.GetBool('want-garbage-collect-task', 1):
             # manual garbage-collect task
             taskMgr.add(self._garbageCollect, self.GarbageCollectTaskName, 200)
             # periodically increase gc threshold if there is no garbage
@@ -186,7 +223,7 @@ class ConnectionRepository(
         #distObj = self.generateWithRequiredFields(dclass, doId, di)
 
         # Construct a new one
-        classDef = dclass.getClassDef()
+        classDef = self.getClassDef(dclass)
         if classDef is None:
             self.notify.error("Could not create an undefined %s object."%(
                 dclass.getName()))
@@ -280,6 +317,14 @@ class ConnectionRepository(
 
         self.hashVal = dcFile.getHash()
 
+        # With lazy-dc-import, the modules listed in the DC file are not
+        # imported now; we just record which module defines each symbol,
+        # and import it when a class is first needed (see getClassDef()).
+        lazy = self.lazyDcImport
+        dcImportSources = {}
+        self.lazyClassDefs = {}
+        self.lazyOwnerClassDefs = {}
+
         # Now import all of the modules required by the DC file.
         for n in range(dcFile.getNumImportModules()):
             moduleName = dcFile.getImportModule(n)[:]
@@ -308,41 +353,44 @@ class ConnectionRepository(
 
                 importSymbols.append(symbolName)
 
-            self.importModule(dcImports, moduleName, importSymbols)
+            if lazy and importSymbols != ['*']:
+                self.__addImportSources(dcImportSources, moduleName, importSymbols)
+            else:
+                self.importModule(dcImports, moduleName, importSymbols)
 
         # Now get the class definition for the classes named in the DC
         # file.
-        import inspect
-
         for i in range(dcFile.getNumClasses()):
             dclass = dcFile.getClass(i)
             number = dclass.getNumber()
-            className = dclass.getName() + self.dcSuffix
+            name = dclass.getName()
 
             # Does the class have a definition defined in the newly
-            # imported namespace?
+            # imported namespace?  Also try it without the dcSuffix.
+            candidates = [name + self.dcSuffix]
+            if self.dcSuffix == 'UD': #HACK:
+                candidates.append(name + 'AI')
+            candidates.append(name)
+            for className in candidates:
+                if className in dcImports or className in dcImportSources:
+                    break
+
+            if className in dcImportSources:
+                moduleName, importSymbols = dcImportSources[className]
+                if dclass.isStruct():
+                    # The DCPacker looks up the class of a struct by
+                    # itself, so it has to be bound right away.
+                    self.importModule(dcImports, moduleName, importSymbols)
+                else:
+                    self.lazyClassDefs[name] = (className, moduleName, importSymbols)
+
             classDef = dcImports.get(className)
-            if classDef is None and self.dcSuffix == 'UD': #HACK:
-                className = dclass.getName() + 'AI'
-                classDef = dcImports.get(className)
-
-            # Also try it without the dcSuffix.
-            if classDef is None:
-                className = dclass.getName()
-                classDef = dcImports.get(className)
-            if classDef is None:
+            if name in self.lazyClassDefs:
+                pass
+            elif classDef is None:
                 self.notify.debug("No class definition for %s." % (className))
-            else:
-                if inspect.ismodule(classDef):
-                    if not hasattr(classDef, className):
-                        self.notify.warning("Module %s does not define class %s." % (className, className))
-                        continue
-                    classDef = getattr(classDef, className)
-
-                if not inspect.isclass(classDef):
-                    self.notify.error("Symbol %s is not a class name." % (className))
-                else:
-                    dclass.setClassDef(classDef)
+            elif not self.__bindClassDef(dclass, className, classDef):
+                continue
 
             self.dclassesByName[className] = dclass
             if number >= 0:
@@ -353,6 +401,7 @@ class ConnectionRepository(
             ownerDcSuffix = self.dcSuffix + 'OV'
             # dict of class names (without 'OV') that have owner views
             ownerImportSymbols = {}
+            ownerImportSources = {}
 
             # Now import all of the modules required by the DC file.
             for n in range(dcFile.getNumImportModules()):
@@ -378,7 +427,10 @@ class ConnectionRepository(
                     importSymbols.append(symbolName)
                     ownerImportSymbols[symbolName] = None
 
-                self.importModule(dcImports, moduleName, importSymbols)
+                if lazy and importSymbols != ['*']:
+                    self.__addImportSources(ownerImportSources, moduleName, importSymbols)
+                else:
+                    self.importModule(dcImports, moduleName, importSymbols)
 
             # Now get the class definition for the owner classes named
             # in the DC file.
@@ -388,6 +440,12 @@ class ConnectionRepository(
                     number = dclass.getNumber()
                     className = dclass.getName() + ownerDcSuffix
 
+                    if className in ownerImportSources:
+                        moduleName, importSymbols = ownerImportSources[className]
+                        self.lazyOwnerClassDefs[dclass.getName()] = (className, moduleName, importSymbols)
+                        self.dclassesByName[className] = dclass
+                        continue
+
                     # Does the class have a definition defined in the newly
                     # imported namespace?
                     classDef = dcImports.get(className)
@@ -401,6 +459,96 @@ class ConnectionRepository(
                         dclass.setOwnerClassDef(classDef)
                         self.dclassesByName[className] = dclass
 
+        if lazy:
+            warmUp = ConfigVariableList('dc-warm-up-class')
+            classNames = []
+            for i in range(warmUp.getNumUniqueValues()):
+                classNames += warmUp.getUniqueValue(i).split()
+            if classNames:
+                self.warmUpClassDefs(classNames)
+
+    def getClassDef(self, dclass):
+        """
+        Returns the Python class that was defined for the given dclass in
+        the DC file, or None if there is none.  With lazy-dc-import, this
+        imports the module defining the class the first time it is needed.
+        """
+        classDef = dclass.getClassDef()
+        if classDef is None and self.lazyClassDefs:
+            entry = self.lazyClassDefs.pop(dclass.getName(), None)
+            if entry is not None:
+                className, moduleName, importSymbols = entry
+                dcImports = {}
+                self.importModule(dcImports, moduleName, importSymbols)
+                if self.__bindClassDef(dclass, className, dcImports[className]):
+                    classDef = dclass.getClassDef()
+        return classDef
+
+    def getOwnerClassDef(self, dclass):
+        """
+        Like getClassDef(), but returns the owner view class.
+        """
+        classDef = dclass.getOwnerClassDef()
+        if classDef is None and self.lazyOwnerClassDefs:
+            entry = self.lazyOwnerClassDefs.pop(dclass.getName(), None)
+            if entry is not None:
+                className, moduleName, importSymbols = entry
+                dcImports = {}
+                self.importModule(dcImports, moduleName, importSymbols)
+                classDef = dcImports[className]
+                if inspect.ismodule(classDef):
+                    if not hasattr(classDef, className):
+                        self.notify.error("Module %s does not define class %s." % (className, className))
+                    classDef = getattr(classDef, className)
+                dclass.setOwnerClassDef(classDef)
+        return classDef
+
+    def warmUpClassDefs(self, classNames=None):
+        """
+        With lazy-dc-import, imports and binds the classes of the named
+        dclasses now, instead of when the first object of each class is
+        generated.  This can be used for the classes that are known to be
+        needed soon after connecting.  If classNames is None, all remaining
+        classes are bound.  The dc-warm-up-class config variable lists
+        classes to bind as soon as the DC file has been read.
+        """
+        if classNames is None:
+            classNames = set(self.lazyClassDefs) | set(self.lazyOwnerClassDefs)
+
+        dcFile = self.getDcFile()
+        for name in classNames:
+            dclass = dcFile.getClassByName(name)
+            if dclass is None:
+                self.notify.warning("Cannot warm up unknown class %s." % (name))
+                continue
+            self.getClassDef(dclass)
+            if self.hasOwnerView():
+                self.getOwnerClassDef(dclass)
+
+    def __addImportSources(self, dcImportSources, moduleName, importSymbols):
+        # Records which module to import to get each of the symbols.
+        if importSymbols:
+            for symbolName in importSymbols:
+                dcImportSources[symbolName] = (moduleName, [symbolName])
+        else:
+            dcImportSources[moduleName.split('.')[0]] = (moduleName, [])
+
+    def __bindClassDef(self, dclass, className, classDef):
+        # Sets the class definition for the dclass.  If classDef is a
+        # module, it should contain a class named className.  Returns
+        # False if it does not.
+        if inspect.ismodule(classDef):
+            if not hasattr(classDef, className):
+                self.notify.warning("Module %s does not define class %s." % (className, className))
+                return False
+            classDef = getattr(classDef, className)
+
+        if not inspect.isclass(classDef):
+            self.notify.error("Symbol %s is not a class name." % (className))
+        else:
+            dclass.setClassDef(classDef)
+        return True
+
     def importModule(self, dcImports, moduleName, importSymbols):
         """
         Imports the indicated moduleName and all of its symbols
@@ -611,9 +759,103 @@ class ConnectionRepository(
             self.readerPollTaskObj = None
         self.ignore(CConnectionRepository.getOverflowEventName())
 
+    def setReaderPollBudget(self, maxTime=0.0, maxMessages=0):
+        """Limits the amount of time (in seconds) and the number of
+        messages that the reader poll task spends on incoming messages each
+        frame, so that a burst of messages (such as the generates following
+        a zone change) is spread out over several frames instead of freezing
+        the client.  Messages that don't fit within the budget are left in
+        the queue until the next frame.  Set both to 0 to handle all
+        available messages every frame, which is the default."""
+        self.readerPollMaxTime = maxTime
+        self.readerPollMaxMessages = maxMessages
+
+    def getReaderPollBudget(self):
+        return (self.readerPollMaxTime, self.readerPollMaxMessages)
+
+    def setMsgTypePriority(self, msgType, priority):
+        """Sets the priority of the given message type, which scales the
+        budget set by setReaderPollBudget() when a message of this type is
+        handled.  For instance, with a priority of 0.5 the reader stops
+        after a generate as soon as half the budget is spent, leaving room
+        for more urgent messages, while a priority of 2 lets a stream of
+        field updates run over the budget.  The default priority is 1.
+
+        Messages are always handled in the order in which they arrived, so
+        this only changes when the reader stops for the frame; it never lets
+        a message overtake another one."""
+        assert priority > 0
+        if priority == 1:
+            self.msgTypePriorities.pop(msgType, None)
+        else:
+            self.msgTypePriorities[msgType] = priority
+
+    def getMsgTypePriority(self, msgType):
+        return self.msgTypePriorities.get(msgType, 1)
+
+    def resetReaderPollStats(self):
+        #: The total number of messages handled by the reader poll task.
+        self.readerPollNumMessages = 0
+        #: The number of frames in which the budget was used up.
+        self.readerPollNumOverBudget = 0
+        #: The number of consecutive frames, up to and including the last
+        #: one, that ended with messages possibly left in the queue.
+        self.readerPollBacklogFrames = 0
+        #: The time spent on, and number of messages handled in, the last
+        #: frame, and the longest time spent in any single frame.
+        self.readerPollLastTime = 0.0
+        self.readerPollLastMessages = 0
+        self.readerPollMaxFrameTime = 0.0
+
+    def getReaderPollStats(self):
+        """Returns a dictionary with statistics about the messages handled
+        by the reader poll task since the last resetReaderPollStats()."""
+        return {
+            'numMessages': self.readerPollNumMessages,
+            'numOverBudget': self.readerPollNumOverBudget,
+            'backlogFrames': self.readerPollBacklogFrames,
+            'lastTime': self.readerPollLastTime,
+            'lastMessages': self.readerPollLastMessages,
+            'maxFrameTime': self.readerPollMaxFrameTime,
+        }
+
     def readerPollUntilEmpty(self, task):
-        while self.readerPollOnce():
-            pass
+        maxTime = self.readerPollMaxTime
+        maxMessages = self.readerPollMaxMessages
+        priorities = self.msgTypePriorities
+        overBudget = False
+        numMessages = 0
+        start = time.perf_counter()
+
+        if not maxTime and not maxMessages:
+            while self.readerPollOnce():
+                numMessages += 1
+        else:
+            while self.readerPollOnce():
+                numMessages += 1
+                if priorities:
+                    # The message type of the message we just handled.
+                    scale = priorities.get(self.getMsgType(), 1)
+                else:
+                    scale = 1
+                if maxMessages and numMessages >= maxMessages * scale:
+                    overBudget = True
+                    break
+                if maxTime and time.perf_counter() - start >= maxTime * scale:
+                    overBudget = True
+                    break
+
+        elapsed = time.perf_counter() - start
+        self.readerPollNumMessages += numMessages
+        self.readerPollLastTime = elapsed
+        self.readerPollLastMessages = numMessages
+        if elapsed > self.readerPollMaxFrameTime:
+            self.readerPollMaxFrameTime = elapsed
+        if overBudget:
+            self.readerPollNumOverBudget += 1
+            self.readerPollBacklogFrames += 1
+        else:
+            self.readerPollBacklogFrames = 0
         return Task.cont
 
     def readerPollOnce(self):
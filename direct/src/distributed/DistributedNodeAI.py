@@ -58,12 +58,12 @@ class DistributedNodeAI(DistributedObjectAI.DistributedObjectAI, NodePath):
             self.sendUpdate("setParent", [parentToken])
 
     def setParentStr(self, parentToken):
-        self.notify.debug('setParentStr(%s): %s' % (self.doId, parentToken))
+        self.notify.debug('setParentStr(%s): %s', self.doId, parentToken)
         if len(parentToken) > 0:
             self.do_setParent(parentToken)
 
     def setParent(self, parentToken):
-        self.notify.debug('setParent(%s): %s' % (self.doId, parentToken))
+        self.notify.debug('setParent(%s): %s', self.doId, parentToken)
         if parentToken == 0:
             senderId = self.air.getAvatarIdFromSender()
             self.air.writeServerEvent('suspicious', senderId, 'setParent(0)')
@@ -41,6 +41,12 @@ class DistributedObject(DistributedObjectBase):
     # even to the quiet zone.
     neverDisable = 0
 
+    # Objects of a class that sets poolSize to more than 0 are not
+    # deleted when they are disabled, but kept (up to that many) in the
+    # repository's CRPool, to be reused for the next object of that
+    # class.  Such a class should redefine recycle().
+    poolSize = 0
+
     def __init__(self, cr):
         assert self.notify.debugStateCall(self)
         if not hasattr(self, 'DistributedObject_initialized'):
@@ -260,6 +266,19 @@ class DistributedObject(DistributedObjectBase):
             # StackTrace is omitted in packed versions
             from direct.showbase.PythonUtil import StackTrace
             self.destroyDoStackTrace = StackTrace()
+        self.__flushUnretrievedCachedData()
+        self.cr = None
+        self.dclass = None
+
+    def _recycleDO(self):
+        # after this is called, the object is disabled and may be
+        # generated again with a new doId, see CRPool
+        self.__flushUnretrievedCachedData()
+        self.__nextContext = 0
+        self.__barrierContext = None
+        self.recycle()
+
+    def __flushUnretrievedCachedData(self):
         # check for leftover cached data that was not retrieved or flushed by this object
         # this will catch typos in the data name in calls to get/setCachedData
         if hasattr(self, '_cachedData'):
@@ -267,8 +286,15 @@ class DistributedObject(DistributedObjectBase):
                 self.notify.warning('flushing unretrieved cached data: %s' % name)
                 cachedData.flush()
             del self._cachedData
-        self.cr = None
-        self.dclass = None
+
+    def recycle(self):
+        """
+        Called after disable() when the object is put in the pool instead
+        of being deleted.  Inheritors that set poolSize should redefine
+        this to restore any state left over from the previous doId to
+        what it was when the object was constructed.
+        """
+        assert self.notify.debug('recycle(): %s' % (self.doId))
 
     def disable(self):
         """
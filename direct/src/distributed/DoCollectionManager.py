@@ -284,8 +284,8 @@ class DoCollectionManager:
         obj = self.doId2do.get(doId)
         if obj is not None:
             self.notify.debug(
-                "handleObjectLocation: doId: %s parentId: %s zoneId: %s"%
-                (doId, parentId, zoneId))
+                "handleObjectLocation: doId: %s parentId: %s zoneId: %s",
+                doId, parentId, zoneId)
             # Let the object finish the job
             # calls storeObjectLocation()
             obj.setLocation(parentId, zoneId)
@@ -67,8 +67,8 @@ class DoHierarchy:
         zoneDoSet = parentZoneDict.setdefault(zoneId, set())
         zoneDoSet.add(doId)
         self._allDoIds.add(doId)
-        self.notify.debug('storeObjectLocation: %s(%s) @ (%s, %s)' % (
-            do.__class__.__name__, doId, parentId, zoneId))
+        self.notify.debug('storeObjectLocation: %s(%s) @ (%s, %s)',
+                          do.__class__.__name__, doId, parentId, zoneId)
 
     def deleteObjectLocation(self, do, parentId, zoneId):
         doId = do.doId
@@ -86,8 +86,8 @@ class DoHierarchy:
                 if doId in zoneDoSet:
                     zoneDoSet.remove(doId)
                     self._allDoIds.remove(doId)
-                    self.notify.debug('deleteObjectLocation: %s(%s) @ (%s, %s)' % (
-                        do.__class__.__name__, doId, parentId, zoneId))
+                    self.notify.debug('deleteObjectLocation: %s(%s) @ (%s, %s)',
+                                      do.__class__.__name__, doId, parentId, zoneId)
                     if len(zoneDoSet) == 0:
                         del parentZoneDict[zoneId]
                         if len(parentZoneDict) == 0:
@@ -600,8 +600,8 @@ class DoInterestManager(DirectObject.DirectObject):
         if self.__verbose():
             print('CR::INTEREST.interestDone(handle=%s)' % handle)
         DoInterestManager.notify.debug(
-            "handleInterestDoneMessage--> Received handle %s, context %s" % (
-            handle, contextId))
+            "handleInterestDoneMessage--> Received handle %s, context %s",
+            handle, contextId)
         if handle in DoInterestManager._interests:
             eventsToSend = []
             # if the context matches, send out the event
@@ -614,8 +614,8 @@ class DoInterestManager(DirectObject.DirectObject):
                 DoInterestManager._interests[handle].clearEvents()
             else:
                 DoInterestManager.notify.debug(
-                    "handleInterestDoneMessage--> handle: %s: Expecting context %s, got %s" % (
-                    handle, DoInterestManager._interests[handle].context, contextId))
+                    "handleInterestDoneMessage--> handle: %s: Expecting context %s, got %s",
+                    handle, DoInterestManager._interests[handle].context, contextId)
             if __debug__:
                 state = DoInterestManager._interests[handle]
                 self._addDebugInterestHistory(
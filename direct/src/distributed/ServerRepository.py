@@ -122,34 +122,7 @@ class ServerRepository:
             # Default value.
             threadedNet = ConfigVariableBool('threaded-net', False).value
 
-        # Set up networking interfaces.
-        numThreads = 0
-        if threadedNet:
-            numThreads = 1
-        self.qcm = QueuedConnectionManager()
-        self.qcl = QueuedConnectionListener(self.qcm, numThreads)
-        self.qcr = QueuedConnectionReader(self.qcm, numThreads)
-        self.cw = ConnectionWriter(self.qcm, numThreads)
-
-        taskMgr.setupTaskChain('flushTask')
-        if threadedNet:
-            taskMgr.setupTaskChain('flushTask', numThreads = 1,
-                                   threadPriority = TPLow, frameSync = True)
-
-        self.tcpRendezvous = self.qcm.openTCPServerRendezvous(
-            serverAddress or '', tcpPort, 10)
-        self.qcl.addConnection(self.tcpRendezvous)
-        taskMgr.add(self.listenerPoll, "serverListenerPollTask")
-        taskMgr.add(self.readerPollUntilEmpty, "serverReaderPollTask")
-        taskMgr.add(self.clientHardDisconnectTask, "clientHardDisconnect")
-
-        # A set of clients that have recently been written to and may
-        # need to be flushed.
-        self.needsFlush = set()
-
-        collectTcpInterval = ConfigVariableDouble('collect-tcp-interval').getValue()
-        taskMgr.doMethodLater(collectTcpInterval, self.flushTask, 'flushTask',
-                              taskChain = 'flushTask')
+        self.openServer(tcpPort, serverAddress, threadedNet)
 
         # A dictionary of connection -> Client object, tracking all of
         # the clients we currently have connected.
@@ -179,6 +152,37 @@ class ServerRepository:
         self.dcSuffix = ''
         self.readDCFile(dcFileNames)
 
+    def openServer(self, tcpPort, serverAddress, threadedNet):
+        """ Sets up the networking interfaces and starts listening for
+        clients on the indicated port. """
+        numThreads = 0
+        if threadedNet:
+            numThreads = 1
+        self.qcm = QueuedConnectionManager()
+        self.qcl = QueuedConnectionListener(self.qcm, numThreads)
+        self.qcr = QueuedConnectionReader(self.qcm, numThreads)
+        self.cw = ConnectionWriter(self.qcm, numThreads)
+
+        taskMgr.setupTaskChain('flushTask')
+        if threadedNet:
+            taskMgr.setupTaskChain('flushTask', numThreads = 1,
+                                   threadPriority = TPLow, frameSync = True)
+
+        self.tcpRendezvous = self.qcm.openTCPServerRendezvous(
+            serverAddress or '', tcpPort, 10)
+        self.qcl.addConnection(self.tcpRendezvous)
+        taskMgr.add(self.listenerPoll, "serverListenerPollTask")
+        taskMgr.add(self.readerPollUntilEmpty, "serverReaderPollTask")
+        taskMgr.add(self.clientHardDisconnectTask, "clientHardDisconnect")
+
+        # A set of clients that have recently been written to and may
+        # need to be flushed.
+        self.needsFlush = set()
+
+        collectTcpInterval = ConfigVariableDouble('collect-tcp-interval').getValue()
+        taskMgr.doMethodLater(collectTcpInterval, self.flushTask, 'flushTask',
+                              taskChain = 'flushTask')
+
     def flushTask(self, task):
         """ This task is run periodically to flush any connections
         that might need it.  It's only necessary in cases where
@@ -342,16 +346,7 @@ class ServerRepository:
             # Crazy dereferencing
             newConnection = newConnection.p()
 
-            #  Add clients information to dictionary
-            id = self.idAllocator.allocate()
-            doIdBase = id * self.doIdRange + 1
-
-            self.notify.info(
-                "Got client %s from %s" % (doIdBase, netAddress))
-
-            client = self.Client(newConnection, netAddress, doIdBase)
-            self.clientsByConnection[client.connection] = client
-            self.clientsByDoIdBase[client.doIdBase] = client
+            client = self.registerClient(newConnection, netAddress)
 
             # Now we can start listening to that new connection.
             self.qcr.addConnection(newConnection)
@@ -361,6 +356,23 @@ class ServerRepository:
 
         return Task.cont
 
+    def registerClient(self, connection, netAddress):
+        """ Assigns a doId range to a newly connected client, and
+        returns its new Client object.  The caller should send the
+        range to the client with sendDoIdRange(). """
+
+        #  Add clients information to dictionary
+        id = self.idAllocator.allocate()
+        doIdBase = id * self.doIdRange + 1
+
+        self.notify.info(
+            "Got client %s from %s" % (doIdBase, netAddress))
+
+        client = self.Client(connection, netAddress, doIdBase)
+        self.clientsByConnection[client.connection] = client
+        self.clientsByDoIdBase[client.doIdBase] = client
+        return client
+
     def readerPollUntilEmpty(self, task):
         """ continuously polls for new messages on the server """
         while self.readerPollOnce():
@@ -525,13 +537,11 @@ class ServerRepository:
                     targetId,
                     dclass.getName(), dcfield.getName(), doId, client.doIdBase))
                 return
-            self.cw.send(dg, target.connection)
-            self.needsFlush.add(target)
+            self.sendToClient(dg, target)
 
         elif dcfield.hasKeyword('p2p'):
             # p2p: to object owner only
-            self.cw.send(dg, owner.connection)
-            self.needsFlush.add(owner)
+            self.sendToClient(dg, owner)
 
         elif dcfield.hasKeyword('broadcast'):
             # Broadcast: to everyone except orig sender
@@ -621,8 +631,7 @@ class ServerRepository:
         for client in self.zonesToClients[oldZoneId]:
             if client != owner:
                 if zoneId not in client.currentInterestZoneIds:
-                    self.cw.send(datagram, client.connection)
-                    self.needsFlush.add(client)
+                    self.sendToClient(datagram, client)
 
         # The client is now responsible for sending a generate for the
         # object that just switched zones, to inform the clients that
@@ -637,8 +646,7 @@ class ServerRepository:
         datagram.addUint32(client.doIdBase)
         datagram.addUint32(self.doIdRange)
 
-        self.cw.send(datagram, client.connection)
-        self.needsFlush.add(client)
+        self.sendToClient(datagram, client)
 
     # a client disconnected from us, we need to update our data, also
     # tell other clients to remove the disconnected clients objects
@@ -668,8 +676,7 @@ class ServerRepository:
         id = client.doIdBase // self.doIdRange
         self.idAllocator.free(id)
 
-        self.qcr.removeConnection(client.connection)
-        self.qcm.closeConnection(client.connection)
+        self.closeConnection(client)
 
 
     def handleClientSetInterest(self, client, dgi):
@@ -718,10 +725,13 @@ class ServerRepository:
             # objects in this zone should be disabled for the client.
             for object in self.objectsByZoneId.get(zoneId, []):
                 datagram.addUint32(object.doId)
-        self.cw.send(datagram, client.connection)
+        self.sendToClient(datagram, client)
 
-        self.needsFlush.add(client)
 
+    def closeConnection(self, client):
+        """ Stops listening to the client and closes its connection. """
+        self.qcr.removeConnection(client.connection)
+        self.qcm.closeConnection(client.connection)
 
     def clientHardDisconnectTask(self, task):
         """ client did not tell us he was leaving but we lost connection to
@@ -731,6 +741,11 @@ class ServerRepository:
                 self.handleClientDisconnect(client)
         return Task.cont
 
+    def sendToClient(self, datagram, client):
+        """ Sends a message to the indicated client. """
+        self.cw.send(datagram, client.connection)
+        self.needsFlush.add(client)
+
     def sendToZoneExcept(self, zoneId, datagram, exceptionList):
         """sends a message to everyone who has interest in the
         indicated zone, except for the clients on exceptionList."""
@@ -745,8 +760,7 @@ class ServerRepository:
                 if self.notify.getDebug():
                     self.notify.debug(
                         "  -> %s" % (client.doIdBase))
-                self.cw.send(datagram, client.connection)
-                self.needsFlush.add(client)
+                self.sendToClient(datagram, client)
 
     def sendToAllExcept(self, datagram, exceptionList):
         """ sends a message to all connected clients, except for
@@ -762,5 +776,4 @@ class ServerRepository:
                 if self.notify.getDebug():
                     self.notify.debug(
                         "  -> %s" % (client.doIdBase))
-                self.cw.send(datagram, client.connection)
-                self.needsFlush.add(client)
+                self.sendToClient(datagram, client)
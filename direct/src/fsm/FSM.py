@@ -276,8 +276,9 @@ class FSM(DirectObject):
         self.fsmLock.acquire()
         try:
             assert isinstance(request, str)
-            self.notify.debug("%s.forceTransition(%s, %s" % (
-                self._name, request, str(args)[1:]))
+            if self.notify.getDebug():
+                self.notify.debug("%s.forceTransition(%s, %s" % (
+                    self._name, request, str(args)[1:]))
 
             if not self.state:
                 # Queue up the request.
@@ -357,8 +358,9 @@ class FSM(DirectObject):
         self.fsmLock.acquire()
         try:
             assert isinstance(request, str)
-            self.notify.debug("%s.request(%s, %s" % (
-                self._name, request, str(args)[1:]))
+            if self.notify.getDebug():
+                self.notify.debug("%s.request(%s, %s" % (
+                    self._name, request, str(args)[1:]))
 
             filter = self.getCurrentFilter()
             result = filter(request, args)
@@ -408,7 +410,8 @@ class FSM(DirectObject):
             # We can always go to the "Off" state.
             return (request,) + args
 
-        if self.defaultTransitions is None:
+        defaultTransitions = self.defaultTransitions
+        if defaultTransitions is None:
             # If self.defaultTransitions is None, it means to accept
             # all requests whose name begins with a capital letter.
             # These are direct requests to a particular state.
@@ -420,28 +423,31 @@ class FSM(DirectObject):
             # of the map is the current state name; for that key, the
             # value is a list of allowed transitions from the
             # indicated state.
-            if request in self.defaultTransitions.get(self.state, []):
+            ANY = FSM.EnumStates.ANY
+            fromState = defaultTransitions.get(self.state, ())
+            if request in fromState:
                 # This transition is listed in the defaultTransitions map;
                 # accept it.
                 return (request,) + args
 
-            elif FSM.EnumStates.ANY in self.defaultTransitions.get(self.state, []):
+            elif ANY in fromState:
                 # Whenever we have a '*' as our to transition, we allow
                 # to transit to any other state
                 return (request,) + args
 
-            elif request in self.defaultTransitions.get(FSM.EnumStates.ANY, []):
+            fromAny = defaultTransitions.get(ANY, ())
+            if request in fromAny:
                 # If the requested state is in the default transitions
                 # from any state list, we also alow to transit to the
                 # new state
                 return (request,) + args
 
-            elif FSM.EnumStates.ANY in self.defaultTransitions.get(FSM.EnumStates.ANY, []):
+            elif ANY in fromAny:
                 # This is like we had set the defaultTransitions to None.
                 # Any state can transit to any other state
                 return (request,) + args
 
-            elif request in self.defaultTransitions.get(FSM.EnumStates.DEFAULT, []):
+            elif request in defaultTransitions.get(FSM.EnumStates.DEFAULT, ()):
                 # This is the fallback state that we use whenever no
                 # other trnasition was possible
                 return (request,) + args
@@ -108,9 +108,17 @@ from direct.directtools.DirectUtil import ROUND_TO
 from direct.showbase import DirectObject
 from direct.task import Task
 from direct.task.TaskManagerGlobal import taskMgr
+from contextlib import contextmanager
 
 _track_gui_items = ConfigVariableBool('track-gui-items', False)
 
+# While option updates are being batched, this maps id(widget) to a tuple of
+# the widget and a dict whose keys are the option callbacks that still need
+# to be called for that widget.  It is None when updates are not batched.
+_pendingUpdates = None
+_batchDepth = 0
+_deferredUpdates = False
+
 
 class DirectGuiBase(DirectObject.DirectObject):
     """Base class of all DirectGUI widgets."""
@@ -444,7 +452,21 @@ class DirectGuiBase(DirectObject.DirectObject):
         for func, options in indirectOptions.items():
             func(**options)
 
-        # Call the configuration callback function for each option.
+        # Call the configuration callback function for each option.  If
+        # updates are being batched, just remember which callbacks need to
+        # be called; each one is then only called once per widget.
+        if _pendingUpdates is not None and not self.fInit:
+            pending = _pendingUpdates.get(id(self))
+            if pending is None:
+                pending = (self, {})
+                _pendingUpdates[id(self)] = pending
+            funcs = pending[1]
+            for option in directOptions:
+                func = optionInfo[option][FUNCTION]
+                if func is not None:
+                    funcs[func] = None
+            return
+
         for option in directOptions:
             info = optionInfo[option]
             func = info[DGG._OPT_FUNCTION]
@@ -665,6 +687,91 @@ class DirectGuiBase(DirectObject.DirectObject):
         self.ignore(gEvent)
 
 
+def beginBatchUpdate():
+    """Starts collecting the option callbacks triggered by configure() on any
+    widget, rather than calling them immediately.  The new option values are
+    stored right away, but the callbacks (which often regenerate the frame
+    geometry) are only called by the matching endBatchUpdate(), once per
+    widget, no matter how many options were changed in the meantime.
+
+    Calls may be nested; only the outermost endBatchUpdate() runs the
+    callbacks.  See also :func:`batchUpdate`."""
+    global _pendingUpdates, _batchDepth
+    if _pendingUpdates is None:
+        _pendingUpdates = {}
+    _batchDepth += 1
+
+
+def endBatchUpdate():
+    """Ends a batch started with beginBatchUpdate(), calling all of the
+    option callbacks that were collected."""
+    global _batchDepth
+    assert _batchDepth > 0
+    _batchDepth -= 1
+    if _batchDepth == 0 and not _deferredUpdates:
+        flushPendingUpdates()
+
+
+@contextmanager
+def batchUpdate():
+    """Context manager that batches the option updates made inside it::
+
+        with batchUpdate():
+            for label, score in zip(labels, scores):
+                label['text'] = str(score)
+                label['frameColor'] = getColor(score)
+    """
+    beginBatchUpdate()
+    try:
+        yield
+    finally:
+        endBatchUpdate()
+
+
+def flushPendingUpdates():
+    """Immediately calls any option callbacks that have been deferred by
+    batchUpdate() or setDeferredUpdates()."""
+    global _pendingUpdates
+    while _pendingUpdates:
+        pending = _pendingUpdates
+        # Callbacks may themselves configure widgets; these end up in a new
+        # dict, which is processed in the next iteration.
+        _pendingUpdates = {}
+        for widget, funcs in pending.values():
+            if not hasattr(widget, '_optionInfo'):
+                # The widget was destroyed in the meantime.
+                continue
+            for func in funcs:
+                func()
+
+    if _batchDepth == 0 and not _deferredUpdates:
+        _pendingUpdates = None
+
+
+def setDeferredUpdates(deferred):
+    """Enables or disables frame-deferred updates.  When enabled, option
+    callbacks triggered by configure() are collected for the whole frame and
+    called once per widget by a task that runs just before rendering."""
+    global _deferredUpdates, _pendingUpdates
+    if deferred == _deferredUpdates:
+        return
+
+    _deferredUpdates = deferred
+    if deferred:
+        if _pendingUpdates is None:
+            _pendingUpdates = {}
+        taskMgr.add(_flushUpdatesTask, 'flushDirectGuiUpdates', sort = 48)
+    else:
+        taskMgr.remove('flushDirectGuiUpdates')
+        if _batchDepth == 0:
+            flushPendingUpdates()
+
+
+def _flushUpdatesTask(task):
+    flushPendingUpdates()
+    return task.cont
+
+
 def toggleGuiGridSnap():
     DirectGuiWidget.snapToGrid = 1 - DirectGuiWidget.snapToGrid
 
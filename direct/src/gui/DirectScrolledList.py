@@ -50,6 +50,20 @@ class DirectScrolledListItem(DirectButton):
 
 
 class DirectScrolledList(DirectFrame):
+    """
+    A list of items of which only numItemsVisible are shown at a time, with
+    buttons to scroll through them.
+
+    By default, every item is its own widget, which is created on demand if
+    the items list contains strings.  For very large lists, pass
+    ``virtualized=True`` instead; the items list then holds plain data, and a
+    fixed pool of numItemsVisible row widgets is recycled while scrolling.
+    Rows are created with itemMakeFunction (or as a DirectFrame showing the
+    item text), and are bound to a new item by calling
+    ``itemBindFunction(row, item, index, itemMakeExtraArgs)``.  If no
+    itemBindFunction is given, the default text rows are updated in place,
+    and rows made by itemMakeFunction are destroyed and created anew.
+    """
     notify = DirectNotifyGlobal.directNotify.newCategory("DirectScrolledList")
 
     def __init__(self, parent = None, **kw):
@@ -57,6 +71,14 @@ class DirectScrolledList(DirectFrame):
         self.index = 0
         self.__forceHeight = None
 
+        # Recycled row widgets for the virtualized mode.  The item at index i
+        # is always shown by the row in slot i % numItemsVisible, so that
+        # scrolling by one rebinds only a single row.
+        self.__rows = []
+        self.__rowIndices = []
+        self.__rowItems = []
+        self.__selectedIndex = None
+
         """ If one were to want a scrolledList that makes and adds its items
            as needed, simply pass in an items list of strings (type 'str')
            and when that item is needed, itemMakeFunction will be called
@@ -86,6 +108,8 @@ class DirectScrolledList(DirectFrame):
             ('extraArgs',          [],        None),
             ('itemMakeFunction',   None,      None),
             ('itemMakeExtraArgs',  [],        None),
+            ('itemBindFunction',   None,      None),
+            ('virtualized',        False,     DGG.INITOPT),
             ('numItemsVisible',    1,         self.setNumItemsVisible),
             ('scrollSpeed',        8,         self.setScrollSpeed),
             ('forceHeight',        None,      self.setForceHeight),
@@ -94,6 +118,7 @@ class DirectScrolledList(DirectFrame):
         )
         # Merge keyword options with default options
         self.defineoptions(kw, optiondefs)
+        self.__virtualized = self['virtualized']
 
         # Initialize superclasses
         DirectFrame.__init__(self, parent)
@@ -111,9 +136,10 @@ class DirectScrolledList(DirectFrame):
         self.itemFrame = self.createcomponent("itemFrame", (), None,
                                               DirectFrame, (self,),
                                               )
-        for item in self["items"]:
-            if not isinstance(item, str):
-                item.reparentTo(self.itemFrame)
+        if not self.__virtualized:
+            for item in self["items"]:
+                if not isinstance(item, str):
+                    item.reparentTo(self.itemFrame)
 
         self.initialiseoptions(DirectScrolledList)
         self.recordMaxHeight()
@@ -127,6 +153,11 @@ class DirectScrolledList(DirectFrame):
         assert self.notify.debugStateCall(self)
         if self.__forceHeight is not None:
             self.maxHeight = self.__forceHeight
+        elif self.__virtualized:
+            self.maxHeight = 0.0
+            for row in self.__rows:
+                if row is not None:
+                    self.maxHeight = max(self.maxHeight, row.getHeight())
         else:
             self.maxHeight = 0.0
             for item in self["items"]:
@@ -144,6 +175,9 @@ class DirectScrolledList(DirectFrame):
         assert self.notify.debugStateCall(self)
         # Items per second to move
         self.__numItemsVisible = self["numItemsVisible"]
+        if self.__rows and len(self.__rows) != self.__numItemsVisible:
+            # The slot assignment depends on the number of visible items.
+            self.__destroyRows()
 
     def destroy(self):
         assert self.notify.debugStateCall(self)
@@ -156,10 +190,17 @@ class DirectScrolledList(DirectFrame):
             self.__decButtonCallback = None
         self.incButton.destroy()
         self.decButton.destroy()
+        self.__destroyRows()
         DirectFrame.destroy(self)
 
     def selectListItem(self, item):
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            # Remember the item rather than the row, which gets recycled.
+            for slot, row in enumerate(self.__rows):
+                if row is item:
+                    self.__selectedIndex = self.__rowIndices[slot]
+                    break
         if hasattr(self, "currentSelected"):
             self.currentSelected['state'] = DGG.NORMAL
         item['state'] = DGG.DISABLED
@@ -242,6 +283,17 @@ class DirectScrolledList(DirectFrame):
 
         #print "self.index set to ", self.index
 
+        if self.__virtualized:
+            self.__layoutRows(numItemsTotal, numItemsVisible)
+        else:
+            self.__layoutItems(numItemsTotal, numItemsVisible)
+
+        if self['command']:
+            # Pass any extra args to command
+            self['command'](*self['extraArgs'])
+        return ret
+
+    def __layoutItems(self, numItemsTotal, numItemsVisible):
         # Hide them all
         for item in self["items"]:
             if not isinstance(item, str):
@@ -273,13 +325,88 @@ class DirectScrolledList(DirectFrame):
             item.setPos(0, 0,  -(i-self.index) * self.maxHeight)
             #print 'height bug tracker: i-%s idx-%s h-%s' % (i, self.index, self.maxHeight)
 
-        if self['command']:
-            # Pass any extra args to command
-            self['command'](*self['extraArgs'])
-        return ret
+    def __layoutRows(self, numItemsTotal, numItemsVisible):
+        # Only touches the pooled rows, so that the cost of scrolling does
+        # not depend on the number of items in the list.
+        rows = self.__rows
+        if len(rows) < numItemsVisible:
+            extra = numItemsVisible - len(rows)
+            rows.extend([None] * extra)
+            self.__rowIndices.extend([None] * extra)
+            self.__rowItems.extend([None] * extra)
+
+        items = self["items"]
+        numRows = min(numItemsTotal, numItemsVisible)
+        used = set()
+        for i in range(self.index, self.index + numRows):
+            slot = i % numItemsVisible
+            used.add(slot)
+            row = self.__bindRow(slot, items[i], i)
+            row.show()
+            row.setPos(0, 0, -(i - self.index) * self.maxHeight)
+
+        for slot in range(numItemsVisible):
+            if slot not in used and rows[slot] is not None:
+                rows[slot].hide()
+
+    def __bindRow(self, slot, item, index):
+        row = self.__rows[slot]
+        if row is not None and self.__rowIndices[slot] == index and \
+           self.__rowItems[slot] is item:
+            return row
+
+        if row is None:
+            row = self.__makeRow(slot, item, index)
+        elif self['itemBindFunction']:
+            self['itemBindFunction'](row, item, index, self['itemMakeExtraArgs'])
+        elif self['itemMakeFunction']:
+            # We don't know how to rebind this row, so make a new one.
+            if hasattr(self, "currentSelected") and self.currentSelected is row:
+                del self.currentSelected
+            row.destroy()
+            row = self.__makeRow(slot, item, index)
+        else:
+            row['text'] = item
+
+        self.__rowIndices[slot] = index
+        self.__rowItems[slot] = item
+
+        if self.__selectedIndex is not None:
+            if index == self.__selectedIndex:
+                self.selectListItem(row)
+            elif hasattr(self, "currentSelected") and self.currentSelected is row:
+                row['state'] = DGG.NORMAL
+                del self.currentSelected
+        return row
+
+    def __makeRow(self, slot, item, index):
+        if self['itemMakeFunction']:
+            row = self['itemMakeFunction'](item, index, self['itemMakeExtraArgs'])
+        else:
+            row = DirectFrame(text = item,
+                              text_align = self['itemsAlign'],
+                              text_wordwrap = self['itemsWordwrap'],
+                              relief = None)
+        row.reparentTo(self.itemFrame)
+        self.__rows[slot] = row
+        self.recordMaxHeight()
+        return row
+
+    def __destroyRows(self):
+        for row in self.__rows:
+            if row is not None:
+                if hasattr(self, "currentSelected") and self.currentSelected is row:
+                    del self.currentSelected
+                row.destroy()
+        self.__rows = []
+        self.__rowIndices = []
+        self.__rowItems = []
 
     def makeAllItems(self):
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            # There is nothing to make; the rows are created as needed.
+            return
         for i in range(len(self['items'])):
             item = self["items"][i]
             # If the item is a 'str', then it has not been created
@@ -351,6 +478,12 @@ class DirectScrolledList(DirectFrame):
         Add this string and extraArg to the list
         """
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            self['items'].append(item)
+            if refresh:
+                self.refresh()
+            return len(self['items']) - 1
+
         if not isinstance(item, str):
             # cant add attribs to non-classes (like strings & ints)
             item.itemID = self.nextItemID
@@ -372,6 +505,10 @@ class DirectScrolledList(DirectFrame):
         #print "items list", self['items']
         if item in self["items"]:
             #print "removing item", item
+            if self.__virtualized:
+                self.__removeData(item)
+                self.refresh()
+                return 1
             if hasattr(self, "currentSelected") and self.currentSelected is item:
                 del self.currentSelected
             self["items"].remove(item)
@@ -388,6 +525,11 @@ class DirectScrolledList(DirectFrame):
         """
         assert self.notify.debugStateCall(self)
         if item in self["items"]:
+            if self.__virtualized:
+                # The items are data; the rows are owned by the list.
+                self.__removeData(item)
+                self.refresh()
+                return 1
             if hasattr(self, "currentSelected") and self.currentSelected is item:
                 del self.currentSelected
             if hasattr(item, 'destroy') and hasattr(item.destroy, '__call__'):
@@ -406,6 +548,9 @@ class DirectScrolledList(DirectFrame):
         Warning 2006_10_19 tested only in the trolley metagame
         """
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            return self.__removeAllData(refresh)
+
         retval = 0
         #print "remove item called", item
         #print "items list", self['items']
@@ -432,6 +577,9 @@ class DirectScrolledList(DirectFrame):
         Warning 2006_10_19 tested only in the trolley metagame
         """
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            return self.__removeAllData(refresh)
+
         retval = 0
         while len(self["items"]) > 0:
             item = self['items'][0]
@@ -449,6 +597,30 @@ class DirectScrolledList(DirectFrame):
             self.refresh()
         return retval
 
+    def __removeData(self, item):
+        index = self["items"].index(item)
+        del self["items"][index]
+        if self.__selectedIndex is not None:
+            if index == self.__selectedIndex:
+                self.__selectedIndex = None
+                if hasattr(self, "currentSelected"):
+                    self.currentSelected['state'] = DGG.NORMAL
+                    del self.currentSelected
+            elif index < self.__selectedIndex:
+                self.__selectedIndex -= 1
+
+    def __removeAllData(self, refresh):
+        if not self["items"]:
+            return 0
+        del self["items"][:]
+        self.__selectedIndex = None
+        if hasattr(self, "currentSelected"):
+            self.currentSelected['state'] = DGG.NORMAL
+            del self.currentSelected
+        if refresh:
+            self.refresh()
+        return 1
+
     def refresh(self):
         """
         Update the list - useful when adding or deleting items
@@ -465,6 +637,9 @@ class DirectScrolledList(DirectFrame):
 
     def getSelectedText(self):
         assert self.notify.debugStateCall(self)
+        if self.__virtualized:
+            row = self.__rows[self.index % self.__numItemsVisible]
+            return row['text']
         if isinstance(self['items'][self.index], str):
             return self['items'][self.index]
         else:
@@ -4,9 +4,9 @@ See the :ref:`onscreentext` page in the programming manual for explanation of
 this class.
 """
 
-__all__ = ['OnscreenText', 'Plain', 'ScreenTitle', 'ScreenPrompt', 'NameConfirm', 'BlackOnWhite']
+__all__ = ['OnscreenText', 'TextLayoutCache', 'Plain', 'ScreenTitle', 'ScreenPrompt', 'NameConfirm', 'BlackOnWhite']
 
-from panda3d.core import LColor, Mat4, NodePath, Point3, TextNode, TextProperties, Vec3
+from panda3d.core import LColor, Mat4, NodePath, PandaNode, Point3, TextNode, TextProperties, TransformState, Vec3
 from . import DirectGuiGlobals as DGG
 import warnings
 
@@ -21,8 +21,56 @@ NameConfirm = 4
 BlackOnWhite = 5
 
 
+class TextLayoutCache:
+    """
+    A least-recently-used cache of generated text geometry, used by
+    OnscreenText objects created with the layoutCache parameter.  The
+    geometry is keyed on the text along with all properties that affect its
+    appearance, such as the font, wordwrap, alignment and colors, but not on
+    the position or scale of the text, so that the same node can be shared
+    by any number of OnscreenText objects.
+    """
+
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.__nodes = {}
+
+        #: The number of lookups that found previously generated geometry.
+        self.numHits = 0
+        #: The number of lookups that required generating new geometry.
+        self.numMisses = 0
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def get(self, key):
+        """Returns the node stored for the given key, or None."""
+        node = self.__nodes.pop(key, None)
+        if node is None:
+            self.numMisses += 1
+            return None
+
+        # Move it to the end, marking it as most recently used.
+        self.__nodes[key] = node
+        self.numHits += 1
+        return node
+
+    def store(self, key, node):
+        nodes = self.__nodes
+        nodes.pop(key, None)
+        nodes[key] = node
+        while len(nodes) > self.maxSize:
+            del nodes[next(iter(nodes))]
+
+    def clear(self):
+        self.__nodes.clear()
+
+
 class OnscreenText(NodePath):
 
+    #: The TextLayoutCache used when passing layoutCache=True.
+    defaultLayoutCache = TextLayoutCache()
+
     def __init__(self, text = '',
                  style = Plain,
                  pos = (0, 0),
@@ -41,7 +89,9 @@ class OnscreenText(NodePath):
                  parent = None,
                  sort = 0,
                  mayChange = True,
-                 direction = None):
+                 direction = None,
+                 layoutCache = None,
+                 numberDisplay = False):
         """
         Make a text node from string, put it into the 2d sg and set it
         up with all the indicated parameters.
@@ -104,6 +154,20 @@ class OnscreenText(NodePath):
 
           direction: this can be set to 'ltr' or 'rtl' to override the
               direction of the text.
+
+          layoutCache: pass True or a TextLayoutCache object to reuse
+              the generated geometry whenever the text changes back to a
+              value that has been shown before, which is useful for
+              timers, counters and status strings.  The node of this
+              NodePath is then a plain PandaNode rather than the TextNode,
+              and properties must be changed through this object rather
+              than directly on the TextNode.
+
+          numberDisplay: if this is True along with layoutCache, every
+              character is shown in its own fixed-width cell, so that
+              changing the text only replaces the glyphs of the characters
+              that changed.  This is meant for single-line numeric
+              displays; cards and frames are not drawn in this mode.
         """
         if parent is None:
             from direct.showbase import ShowBaseGlobal
@@ -116,6 +180,23 @@ class OnscreenText(NodePath):
         # We ARE a node path.  Initially, we're an empty node path.
         NodePath.__init__(self)
 
+        if layoutCache is not None and layoutCache is not False:
+            if layoutCache is True:
+                layoutCache = self.defaultLayoutCache
+            # The text is shown by instancing cached geometry under the
+            # layout node, which also carries the transform of the text.
+            self.__layoutCache = layoutCache
+            self.__numberDisplay = numberDisplay
+            self.__layoutStyle = None
+            self.__shownKey = None
+            self.__cellWidth = 0.0
+            self.__cells = []
+            self.__rootNode = PandaNode('')
+            self.__layoutNode = PandaNode('layout')
+            self.__rootNode.addChild(self.__layoutNode)
+        else:
+            self.__layoutCache = None
+
         # Choose the default parameters according to the selected
         # style.
         if style == Plain:
@@ -171,12 +252,14 @@ class OnscreenText(NodePath):
         self.__pos = pos
         self.__roll = roll
         self.__wordwrap = wordwrap
+        self.__font = font
 
         if decal:
             textNode.setCardDecal(True)
 
         if font is None:
             font = DGG.getDefaultFont()
+            self.__font = font
 
         textNode.setFont(font)
         textNode.setTextColor(fg[0], fg[1], fg[2], fg[3])
@@ -231,6 +314,12 @@ class OnscreenText(NodePath):
             self.mayChange = mayChange
 
         # Ok, now update the node.
+        if self.__layoutCache is not None:
+            # The TextNode is only used to generate the cached geometry.
+            self.isClean = 0
+            self.assign(parent.attachNewNode(self.__rootNode, sort))
+            return
+
         if not self.mayChange:
             # If we aren't going to change the text later, we can
             # throw away the TextNode.
@@ -265,6 +354,7 @@ class OnscreenText(NodePath):
 
     def setDecal(self, decal):
         self.textNode.setCardDecal(decal)
+        self.__styleChanged()
 
     def getDecal(self):
         return self.textNode.getCardDecal()
@@ -272,7 +362,9 @@ class OnscreenText(NodePath):
     decal = property(getDecal, setDecal)
 
     def setFont(self, font):
+        self.__font = font
         self.textNode.setFont(font)
+        self.__styleChanged()
 
     def getFont(self):
         return self.textNode.getFont()
@@ -281,14 +373,21 @@ class OnscreenText(NodePath):
 
     def clearText(self):
         self.textNode.clearText()
+        self.__textChanged()
 
     def setText(self, text):
         assert not isinstance(text, bytes)
-        self.textNode.setWtext(text)
+        textNode = self.textNode
+        if textNode.getWtext() == text:
+            # Don't make the TextNode regenerate its geometry needlessly.
+            return
+        textNode.setWtext(text)
+        self.__textChanged()
 
     def appendText(self, text):
         assert not isinstance(text, bytes)
         self.textNode.appendWtext(text)
+        self.__textChanged()
 
     def getText(self):
         return self.textNode.getWtext()
@@ -467,7 +566,11 @@ class OnscreenText(NodePath):
             Mat4.rotateMat(self.__roll, Vec3.back()) *
             Mat4.translateMat(Point3.rfu(self.__pos[0], 0, self.__pos[1]))
         )
-        self.textNode.setTransform(mat)
+        if self.__layoutCache is not None:
+            # Keep the cached geometry independent of the transform.
+            self.__layoutNode.setTransform(TransformState.makeMat(mat))
+        else:
+            self.textNode.setTransform(mat)
 
     def setWordwrap(self, wordwrap):
         self.__wordwrap = wordwrap
@@ -476,6 +579,7 @@ class OnscreenText(NodePath):
             self.textNode.setWordwrap(wordwrap)
         else:
             self.textNode.clearWordwrap()
+        self.__styleChanged()
 
     def getWordwrap(self):
         return self.__wordwrap
@@ -487,6 +591,7 @@ class OnscreenText(NodePath):
 
     def setFg(self, fg):
         self.textNode.setTextColor(fg[0], fg[1], fg[2], fg[3])
+        self.__styleChanged()
 
     fg = property(__getFg, setFg)
 
@@ -504,6 +609,7 @@ class OnscreenText(NodePath):
         else:
             # Otherwise, remove the card.
             self.textNode.clearCard()
+        self.__styleChanged()
 
     bg = property(__getBg, setBg)
 
@@ -518,6 +624,7 @@ class OnscreenText(NodePath):
         else:
             # Otherwise, remove the shadow.
             self.textNode.clearShadow()
+        self.__styleChanged()
 
     shadow = property(__getShadow, setShadow)
 
@@ -532,6 +639,7 @@ class OnscreenText(NodePath):
         else:
             # Otherwise, remove the frame.
             self.textNode.clearFrame()
+        self.__styleChanged()
 
     frame = property(__getFrame, setFrame)
 
@@ -585,8 +693,118 @@ class OnscreenText(NodePath):
 
     def setAlign(self, align):
         self.textNode.setAlign(align)
+        self.__styleChanged()
 
     align = property(__getAlign, setAlign)
 
     # Allow index style refererences
     __getitem__ = cget
+
+    def getLayoutCache(self):
+        """Returns the TextLayoutCache in use, or None."""
+        return self.__layoutCache
+
+    def __styleChanged(self):
+        if self.__layoutCache is not None:
+            self.__layoutStyle = None
+            self.__textChanged()
+
+    def __textChanged(self):
+        if self.__layoutCache is None:
+            return
+
+        textNode = self.textNode
+        style = self.__layoutStyle
+        if style is None:
+            style = self.__getLayoutStyle()
+            self.__layoutStyle = style
+            if self.__numberDisplay:
+                self.__cellWidth = max(textNode.calcWidth(char) for char in '0123456789')
+                for cellInfo in self.__cells:
+                    cellInfo[1] = None
+                    cellInfo[2] = None
+
+        text = textNode.getWtext()
+        if self.__numberDisplay:
+            self.__updateCells(style, text)
+            return
+
+        key = (style, text)
+        if key == self.__shownKey:
+            return
+        self.__shownKey = key
+
+        node = self.__layoutCache.get(key)
+        if node is None:
+            node = textNode.generate()
+            self.__layoutCache.store(key, node)
+
+        layoutNode = self.__layoutNode
+        layoutNode.removeAllChildren()
+        layoutNode.addChild(node)
+
+    def __getLayoutStyle(self):
+        # Everything about the TextNode that affects the generated geometry,
+        # except for the text and the transform.
+        textNode = self.textNode
+        return (
+            self.__font,
+            textNode.getWordwrap() if textNode.hasWordwrap() else None,
+            textNode.getAlign(),
+            tuple(textNode.getTextColor()),
+            (tuple(textNode.getShadowColor()), tuple(textNode.getShadow()))
+                if textNode.hasShadow() else None,
+            (tuple(textNode.getCardColor()), tuple(textNode.getCardAsSet()),
+             textNode.getCardDecal()) if textNode.hasCard() else None,
+            (tuple(textNode.getFrameColor()), tuple(textNode.getFrameAsSet()))
+                if textNode.hasFrame() else None,
+            textNode.getBin(),
+            textNode.getDrawOrder(),
+            textNode.getDirection(),
+        )
+
+    def __updateCells(self, style, text):
+        # Every character gets its own cell, which only needs a new glyph if
+        # its character changed.
+        cells = self.__cells
+        layoutNode = self.__layoutNode
+        while len(cells) < len(text):
+            cell = PandaNode('cell')
+            layoutNode.addChild(cell)
+            cells.append([cell, None, None])
+        while len(cells) > len(text):
+            layoutNode.removeChild(cells.pop()[0])
+
+        cellWidth = self.__cellWidth
+        width = cellWidth * len(text)
+        align = self.textNode.getAlign()
+        if align == TextNode.ARight:
+            x = -width
+        elif align == TextNode.ACenter:
+            x = -width * 0.5
+        else:
+            x = 0.0
+        x += cellWidth * 0.5
+
+        for cellInfo, char in zip(cells, text):
+            cell = cellInfo[0]
+            if cellInfo[2] != x:
+                cellInfo[2] = x
+                cell.setTransform(TransformState.makePos(Point3(x, 0, 0)))
+            x += cellWidth
+            if cellInfo[1] == char:
+                continue
+            cellInfo[1] = char
+
+            cell.removeAllChildren()
+            key = (style, None, char)
+            glyph = self.__layoutCache.get(key)
+            if glyph is None:
+                # This copies the text properties, but not the card or frame.
+                generator = TextNode('', self.textNode)
+                generator.setAlign(TextNode.ACenter)
+                generator.clearWordwrap()
+                generator.setWtext(char)
+                glyph = generator.generate()
+                self.__layoutCache.store(key, glyph)
+            cell.addChild(glyph)
@@ -12,6 +12,11 @@ from . import Interval
 import math
 
 class ActorInterval(Interval.Interval):
+    __slots__ = (
+        'actor', 'animName', 'controls', 'loopAnim', 'constrainedLoop',
+        'forceUpdate', 'playRate', 'frameRate', 'startFrame', 'endFrame',
+        'reverse', 'numFrames', 'implicitDuration',
+    )
 
     # create ActorInterval DirectNotify category
     notify = directNotify.newCategory('ActorInterval')
@@ -45,9 +50,6 @@ class ActorInterval(Interval.Interval):
                  startFrame=None, endFrame=None,
                  playRate=1.0, name=None, forceUpdate=0,
                  partName=None, lodName=None):
-        # Generate unique id
-        id = 'Actor-%s-%d' % (animName, ActorInterval.animNum)
-        ActorInterval.animNum += 1
         # Record class specific variables
         self.actor = actor
         self.animName = animName
@@ -58,10 +60,6 @@ class ActorInterval(Interval.Interval):
         self.forceUpdate = forceUpdate
         self.playRate = playRate
 
-        # If no name specified, use id as name
-        if name is None:
-            name = id
-
         if len(self.controls) == 0:
             self.notify.warning("Unknown animation for actor: %s" % (self.animName))
             self.frameRate = 1.0
@@ -118,9 +116,15 @@ class ActorInterval(Interval.Interval):
             self.implicitDuration = 1
             duration = float(self.numFrames) / self.frameRate
 
-        # Initialize superclass
+        # Initialize superclass.  If no name is given, a unique name is
+        # generated when it is first needed.
         Interval.Interval.__init__(self, name, duration)
 
+    def _makeName(self):
+        name = 'Actor-%s-%d' % (self.animName, ActorInterval.animNum)
+        ActorInterval.animNum += 1
+        return name
+
     def getCurrentFrame(self):
         """Calculate the current frame playing in this interval.
 
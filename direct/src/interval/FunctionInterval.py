@@ -11,6 +11,8 @@ from . import Interval
 
 
 class FunctionInterval(Interval.Interval):
+    __slots__ = ('function', 'extraArgs', 'kw')
+
     # Name counter
     functionIntervalNum = 1
 
@@ -50,10 +52,9 @@ class FunctionInterval(Interval.Interval):
         # Record instance variables
         self.function = function
 
-        # Create a unique name for the interval if necessary
-        if name is None:
-            name = self.makeUniqueName(function)
-        assert isinstance(name, str)
+        # If no name is given, a unique one is created by _makeName() when
+        # it is first needed.
+        assert name is None or isinstance(name, str)
 
         # Record any arguments
         self.extraArgs = extraArgs
@@ -80,16 +81,22 @@ class FunctionInterval(Interval.Interval):
             name = '%s-%s' % (name, str(suffix))
         return name
 
+    def _makeName(self):
+        return self.makeUniqueName(self.function)
+
     def privInstant(self):
         # Evaluate the function
         self.function(*self.extraArgs, **self.kw)
         # Print debug information
-        self.notify.debug(
-            'updateFunc() - %s: executing Function' % self.name)
+        if self.notify.getDebug():
+            self.notify.debug(
+                'updateFunc() - %s: executing Function' % self.getName())
 
 
 ### FunctionInterval subclass for throwing events ###
 class EventInterval(FunctionInterval):
+    __slots__ = ()
+
     # Initialization
     def __init__(self, event, sentArgs=[]):
         """__init__(event, sentArgs)
@@ -101,6 +108,8 @@ class EventInterval(FunctionInterval):
 
 ### FunctionInterval subclass for accepting hooks ###
 class AcceptInterval(FunctionInterval):
+    __slots__ = ()
+
     # Initialization
     def __init__(self, dirObj, event, function, name = None):
         """__init__(dirObj, event, function, name)
@@ -115,6 +124,8 @@ class AcceptInterval(FunctionInterval):
 
 ### FunctionInterval subclass for ignoring events ###
 class IgnoreInterval(FunctionInterval):
+    __slots__ = ()
+
     # Initialization
     def __init__(self, dirObj, event, name = None):
         """__init__(dirObj, event, name)
@@ -129,6 +140,8 @@ class IgnoreInterval(FunctionInterval):
 
 ### Function Interval subclass for adjusting scene graph hierarchy ###
 class ParentInterval(FunctionInterval):
+    __slots__ = ()
+
     # ParentInterval counter
     parentIntervalNum = 1
     # Initialization
@@ -146,6 +159,8 @@ class ParentInterval(FunctionInterval):
 
 ### Function Interval subclass for adjusting scene graph hierarchy ###
 class WrtParentInterval(FunctionInterval):
+    __slots__ = ()
+
     # WrtParentInterval counter
     wrtParentIntervalNum = 1
     # Initialization
@@ -164,6 +179,8 @@ class WrtParentInterval(FunctionInterval):
 
 ### Function Interval subclasses for instantaneous pose changes ###
 class PosInterval(FunctionInterval):
+    __slots__ = ()
+
     # PosInterval counter
     posIntervalNum = 1
     # Initialization
@@ -185,6 +202,8 @@ class PosInterval(FunctionInterval):
         FunctionInterval.__init__(self, posFunc, name = name)
 
 class HprInterval(FunctionInterval):
+    __slots__ = ()
+
     # HprInterval counter
     hprIntervalNum = 1
     # Initialization
@@ -206,6 +225,8 @@ class HprInterval(FunctionInterval):
         FunctionInterval.__init__(self, hprFunc, name = name)
 
 class ScaleInterval(FunctionInterval):
+    __slots__ = ()
+
     # ScaleInterval counter
     scaleIntervalNum = 1
     # Initialization
@@ -227,6 +248,8 @@ class ScaleInterval(FunctionInterval):
         FunctionInterval.__init__(self, scaleFunc, name = name)
 
 class PosHprInterval(FunctionInterval):
+    __slots__ = ()
+
     # PosHprInterval counter
     posHprIntervalNum = 1
     # Initialization
@@ -248,6 +271,8 @@ class PosHprInterval(FunctionInterval):
         FunctionInterval.__init__(self, posHprFunc, name = name)
 
 class HprScaleInterval(FunctionInterval):
+    __slots__ = ()
+
     # HprScaleInterval counter
     hprScaleIntervalNum = 1
     # Initialization
@@ -271,6 +296,8 @@ class HprScaleInterval(FunctionInterval):
         FunctionInterval.__init__(self, hprScaleFunc, name = name)
 
 class PosHprScaleInterval(FunctionInterval):
+    __slots__ = ()
+
     # PosHprScaleInterval counter
     posHprScaleIntervalNum = 1
     # Initialization
@@ -297,6 +324,8 @@ class PosHprScaleInterval(FunctionInterval):
 
 
 class Func(FunctionInterval):
+    __slots__ = ()
+
     def __init__(self, *args, **kw):
         function = args[0]
         assert hasattr(function, '__call__')
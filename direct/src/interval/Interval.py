@@ -17,19 +17,34 @@ import math
 class Interval(DirectObject):
     """Interval class: Base class for timeline functionality"""
 
+    # Intervals are often created by the thousands as part of large
+    # Sequences, so their attributes are stored in slots.  DirectObject
+    # still provides an instance dictionary, but it is not created unless
+    # an attribute that has no slot is set, as subclasses may do.
+    __slots__ = (
+        '_name', 'duration', 'state', 'currT', 'doneEvent', 'setTHooks',
+        '__startT', '__startTAtStart', '__endT', '__endTAtEnd',
+        '__playRate', '__doLoop', '__loopCount', '__clockStart',
+        'openEnded', 'pstats', 'pname', 'es',
+        '_taskList', '_MSGRmessengerId', '__weakref__',
+    )
+
     # create Interval DirectNotify category
     notify = directNotify.newCategory("Interval")
 
     playbackCounter = 0
+    intervalNum = 1
 
     # Class methods
     def __init__(self, name, duration, openEnded=1):
-        self.name = name
+        # If name is None, a unique name is only generated when it is
+        # first asked for, which may be never for intervals that are
+        # only ever played as part of a MetaInterval.
+        self._name = name
         self.duration = max(duration, 0.0)
         self.state = CInterval.SInitial
         self.currT = 0.0
         self.doneEvent = None
-        self.setTHooks = []
         self.__startT = 0
         self.__startTAtStart = 1
         self.__endT = duration
@@ -40,7 +55,7 @@ class Interval(DirectObject):
 
         self.pstats = None
         if __debug__ and TaskManager.taskTimerVerbose:
-            self.pname = name.split('-', 1)[0]
+            self.pname = self.getName().split('-', 1)[0]
             self.pstats = PStatCollector("App:Tasks:ivalLoop:%s" % (self.pname))
 
         # Set true if the interval should be invoked if it was
@@ -49,7 +64,26 @@ class Interval(DirectObject):
         self.openEnded = openEnded
 
     def getName(self):
-        return self.name
+        name = self._name
+        if name is None:
+            name = self._makeName()
+            self._name = name
+        return name
+
+    def setName(self, name):
+        self._name = name
+
+    def hasName(self):
+        """Returns true if the interval was given a name, or has already
+        generated one."""
+        return self._name is not None
+
+    def _makeName(self):
+        # Subclasses may redefine this function to generate a more
+        # descriptive unique name.
+        name = '%s-%d' % (self.__class__.__name__, Interval.intervalNum)
+        Interval.intervalNum += 1
+        return name
 
     def getDuration(self):
         return self.duration
@@ -400,8 +434,9 @@ class Interval(DirectObject):
         space = ''
         for l in range(indent):
             space = space + ' '
-        return space + self.name + ' dur: %.2f' % self.duration
+        return space + self.getName() + ' dur: %.2f' % self.duration
 
+    name = property(getName, setName)
     open_ended = property(getOpenEnded)
     stopped = property(isStopped)
     t = property(getT, setT)
@@ -107,27 +107,39 @@ class IntervalManager(CIntervalManager):
         # It is important to call all of the python callbacks on the
         # just-removed intervals before we call any of the callbacks
         # on the still-running intervals.
-        index = self.getNextRemoval()
-        while index >= 0:
-            # We have to clear the interval first before we call
-            # privPostEvent() on it, because the interval might itself
-            # try to add a new interval.
-            ival = self.ivals[index]
-            self.ivals[index] = None
-            ival.privPostEvent()
-            index = self.getNextRemoval()
-
-        index = self.getNextEvent()
-        while index >= 0:
-            self.ivals[index].privPostEvent()
-            index = self.getNextEvent()
+        ivals = self.ivals
+        removals = self.getNextRemovals()
+        while removals:
+            # We have to clear the intervals first before we call
+            # privPostEvent() on them, because the interval might itself
+            # try to add a new interval, which might reuse one of these
+            # slots.
+            removed = [ivals[index] for index in removals]
+            for index in removals:
+                ivals[index] = None
+            for ival in removed:
+                ival.privPostEvent()
+            removals = self.getNextRemovals()
+
+        # The C++ side hands us all of the pending events at once, to
+        # avoid a round-trip per interval.  An earlier callback may
+        # have removed a later interval in the list, though, so we
+        # have to check that each one is still the same interval.
+        events = self.getNextEvents()
+        while events:
+            pending = [(index, ivals[index]) for index in events]
+            for index, ival in pending:
+                if ival is not None and ivals[index] is ival:
+                    ival.privPostEvent()
+            events = self.getNextEvents()
 
         # Finally, throw all the events on the custom event queue.
         # These are the done events that may have been generated in
         # C++.  We use a custom event queue so we can service all of
         # these immediately, rather than waiting for the global event
         # queue to be serviced (which might not be till next frame).
-        self.MyEventmanager.doEvents()
+        if not self.eventQueue.isQueueEmpty():
+            self.MyEventmanager.doEvents()
 
 
     def __storeInterval(self, interval, index):
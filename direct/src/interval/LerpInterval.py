@@ -9,7 +9,10 @@ __all__ = [
     'LerpPosHprScaleShearInterval', 'LerpPosQuatScaleShearInterval',
     'LerpColorInterval', 'LerpColorScaleInterval',
     'LerpTexOffsetInterval', 'LerpTexRotateInterval', 'LerpTexScaleInterval',
-    'LerpFunctionInterval', 'LerpFunc','LerpFunctionNoStateInterval','LerpFuncNS'
+    'LerpFunctionInterval', 'LerpFunc','LerpFunctionNoStateInterval','LerpFuncNS',
+    'LerpNodePathCollectionInterval', 'LerpPosCollectionInterval',
+    'LerpHprCollectionInterval', 'LerpScaleCollectionInterval',
+    'LerpColorScaleCollectionInterval',
 ]
 
 from panda3d.core import LOrientationf, NodePath
@@ -887,3 +890,164 @@ class LerpFunctionInterval(Interval.Interval):
 class LerpFunc(LerpFunctionInterval):
     def __init__(self, *args, **kw):
         LerpFunctionInterval.__init__(self, *args, **kw)
+
+
+class LerpNodePathCollectionInterval(Interval.Interval):
+    """
+    Base class for intervals that lerp the same property on many NodePaths
+    at once, such as the members of a formation or the rows of a list.
+    Rather than creating and managing a separate LerpNodePathInterval for
+    each node, a single interval with a shared blend curve updates all of
+    the nodes in one step.
+
+    The start and end values may either be a single value, which is used
+    for all nodes, or a sequence containing one value for each node (such
+    as a list of Point3, or a NumPy array with one row per node).  If no
+    start values are given, the current values are captured from the nodes
+    each time the interval is started.
+    """
+
+    # Interval counter
+    lerpCollectionNum = 1
+    notify = directNotify.newCategory('LerpNodePathCollectionInterval')
+
+    # Subclasses define these to the NodePath methods that read and write
+    # the property being lerped, wrapped in staticmethod, since they are
+    # called with the NodePath as first argument.
+    getter = None
+    setter = None
+
+    # The number of components of the property; a single number is expanded
+    # to this many components.
+    numComponents = 3
+
+    def __init__(self, nodePaths, duration, values, startValues = None,
+                 other = None, blendType = 'noBlend', name = None):
+        if name is None:
+            name = '%s-%d' % (self.__class__.__name__,
+                              LerpNodePathCollectionInterval.lerpCollectionNum)
+            LerpNodePathCollectionInterval.lerpCollectionNum += 1
+        elif "%d" in name:
+            name = name % LerpNodePathCollectionInterval.lerpCollectionNum
+            LerpNodePathCollectionInterval.lerpCollectionNum += 1
+
+        self.nodePaths = list(nodePaths)
+        self.other = other
+        self.blendType = LerpBlendHelpers.getBlend(blendType)
+        self.endValues = self.__makeValues(values)
+        if startValues is not None:
+            self.startValues = self.__makeValues(startValues)
+        else:
+            self.startValues = None
+
+        self.__starts = self.startValues
+        self.__deltas = None
+
+        Interval.Interval.__init__(self, name, duration)
+
+    def __makeValues(self, values):
+        # Converts the given value or array of values into a list with one
+        # tuple of floats per node.
+        count = len(self.nodePaths)
+        if not hasattr(values, '__len__'):
+            return [(float(values), ) * self.numComponents] * count
+        if len(values) > 0 and hasattr(values[0], '__len__'):
+            if len(values) != count:
+                raise ValueError("expected %d values, got %d" % (count, len(values)))
+            return [tuple(map(float, value)) for value in values]
+        else:
+            return [tuple(map(float, values))] * count
+
+    def __captureStart(self):
+        # Records the current values of all the nodes as the starting point,
+        # if none were given, and precomputes the distance to the end values.
+        if self.startValues is None:
+            getter = self.getter
+            if self.other is not None:
+                other = self.other
+                self.__starts = [tuple(getter(np, other)) for np in self.nodePaths]
+            else:
+                self.__starts = [tuple(getter(np)) for np in self.nodePaths]
+
+        self.__deltas = [
+            tuple([e - s for s, e in zip(start, end)])
+            for start, end in zip(self.__starts, self.endValues)
+        ]
+
+    def privInitialize(self, t):
+        self.__captureStart()
+        Interval.Interval.privInitialize(self, t)
+
+    def privInstant(self):
+        self.__captureStart()
+        Interval.Interval.privInstant(self)
+
+    def privReverseInitialize(self, t):
+        if self.__deltas is None:
+            self.__captureStart()
+        Interval.Interval.privReverseInitialize(self, t)
+
+    def privReverseInstant(self):
+        if self.__deltas is None:
+            self.__captureStart()
+        Interval.Interval.privReverseInstant(self)
+
+    def privStep(self, t):
+        if self.duration == 0.0 or t >= self.duration:
+            bt = 1.0
+        else:
+            bt = self.blendType(t / self.duration)
+
+        setter = self.setter
+        if self.other is not None:
+            other = self.other
+            for np, start, delta in zip(self.nodePaths, self.__starts, self.__deltas):
+                setter(np, other, *[s + d * bt for s, d in zip(start, delta)])
+        else:
+            for np, start, delta in zip(self.nodePaths, self.__starts, self.__deltas):
+                setter(np, *[s + d * bt for s, d in zip(start, delta)])
+
+        self.state = CInterval.SStarted
+        self.currT = t
+
+
+class LerpPosCollectionInterval(LerpNodePathCollectionInterval):
+    getter = staticmethod(NodePath.getPos)
+    setter = staticmethod(NodePath.setPos)
+
+    def __init__(self, nodePaths, duration, pos, startPos = None,
+                 other = None, blendType = 'noBlend', name = None):
+        LerpNodePathCollectionInterval.__init__(
+            self, nodePaths, duration, pos, startPos, other, blendType, name)
+
+
+class LerpHprCollectionInterval(LerpNodePathCollectionInterval):
+    getter = staticmethod(NodePath.getHpr)
+    setter = staticmethod(NodePath.setHpr)
+
+    def __init__(self, nodePaths, duration, hpr, startHpr = None,
+                 other = None, blendType = 'noBlend', name = None):
+        LerpNodePathCollectionInterval.__init__(
+            self, nodePaths, duration, hpr, startHpr, other, blendType, name)
+
+
+class LerpScaleCollectionInterval(LerpNodePathCollectionInterval):
+    getter = staticmethod(NodePath.getScale)
+    setter = staticmethod(NodePath.setScale)
+
+    def __init__(self, nodePaths, duration, scale, startScale = None,
+                 other = None, blendType = 'noBlend', name = None):
+        LerpNodePathCollectionInterval.__init__(
+            self, nodePaths, duration, scale, startScale, other, blendType, name)
+
+
+class LerpColorScaleCollectionInterval(LerpNodePathCollectionInterval):
+    getter = staticmethod(NodePath.getColorScale)
+    setter = staticmethod(NodePath.setColorScale)
+    numComponents = 4
+
+    def __init__(self, nodePaths, duration, colorScale, startColorScale = None,
+                 blendType = 'noBlend', name = None):
+        LerpNodePathCollectionInterval.__init__(
+            self, nodePaths, duration, colorScale, startColorScale, None,
+            blendType, name)
@@ -332,7 +332,14 @@ class MetaInterval(CMetaInterval):
             self.pythonIvals.append(ival)
             if self.pstats:
                 ival.pstats = PStatCollector(self.pstats, ival.pname)
-            self.addExtIndex(index, ival.getName(), ival.getDuration(),
+            # Don't force an unnamed interval to generate a unique name
+            # just to be part of this MetaInterval; its class name will
+            # do for identifying it in the timeline.
+            if ival.hasName():
+                name = ival.getName()
+            else:
+                name = ival.__class__.__name__
+            self.addExtIndex(index, name, ival.getDuration(),
                              ival.getOpenEnded(), relTime, relTo)
 
         else:
@@ -493,15 +500,13 @@ class MetaInterval(CMetaInterval):
         ival = None
         try:
             while self.isEventReady():
-                index = self.getEventIndex()
-                t = self.getEventT()
-                eventType = self.getEventType()
-                self.popEvent()
-
-                ival = self.pythonIvals[index]
-                ival.privDoEvent(t, eventType)
-                ival.privPostEvent()
-                ival = None
+                # Pop all of the ready events in one call, rather than
+                # querying them one at a time.
+                for index, t, eventType in self.popEvents():
+                    ival = self.pythonIvals[index]
+                    ival.privDoEvent(t, eventType)
+                    ival.privPostEvent()
+                    ival = None
         except:
             if ival is not None:
                 print("Exception occurred while processing %s of %s:" % (ival.getName(), self.getName()))
@@ -8,6 +8,12 @@ from . import Interval
 import random
 
 class SoundInterval(Interval.Interval):
+    __slots__ = (
+        'sound', 'soundDuration', 'fLoop', '_fLoop', 'volume', 'startTime',
+        'node', 'listenerNode', 'cutOff', '_seamlessLoop', '_soundPlaying',
+        '_reverse', '_inFinish',
+    )
+
     # Name counter
     soundNum = 1
     # create SoundInterval DirectNotify category
@@ -34,9 +40,6 @@ class SoundInterval(Interval.Interval):
                  seamlessLoop=True, listenerNode = None, cutOff = None):
         """__init__(sound, loop, name)
         """
-        # Generate unique name
-        id = 'Sound-%d' % SoundInterval.soundNum
-        SoundInterval.soundNum += 1
         # Record instance variables
         self.sound = sound
         if sound:
@@ -54,6 +57,7 @@ class SoundInterval(Interval.Interval):
             self._fLoop = True
         self._soundPlaying = False
         self._reverse = False
+        self._inFinish = False
         # If no duration given use sound's duration as interval's duration
         if float(duration) == 0.0 and self.sound is not None:
             duration = max(self.soundDuration - self.startTime, 0)
@@ -61,12 +65,15 @@ class SoundInterval(Interval.Interval):
             #    self.notify.warning('zero length duration!')
 
 
-        # Generate unique name if necessary
-        if name is None:
-            name = id
-        # Initialize superclass
+        # Initialize superclass.  If no name is given, a unique name is
+        # generated when it is first needed.
         Interval.Interval.__init__(self, name, duration)
 
+    def _makeName(self):
+        name = 'Sound-%d' % SoundInterval.soundNum
+        SoundInterval.soundNum += 1
+        return name
+
     def privInitialize(self, t):
         # If it's within a 10th of a second of the start,
         # start at the beginning
@@ -107,14 +114,16 @@ class SoundInterval(Interval.Interval):
 
     def finish(self, *args, **kArgs):
         self._inFinish = True
-        Interval.Interval.finish(self, *args, **kArgs)
-        del self._inFinish
+        try:
+            Interval.Interval.finish(self, *args, **kArgs)
+        finally:
+            self._inFinish = False
 
     def privFinalize(self):
         # if we're just coming to the end of a seamlessloop, leave the sound alone,
         # let the audio subsystem loop it
         if self._seamlessLoop and self._soundPlaying and self.getLoop() and \
-           not hasattr(self, '_inFinish'):
+           not self._inFinish:
             base.sfxPlayer.setFinalVolume(self.sound, self.node, self.volume,
                                           self.listenerNode, self.cutOff)
             return
@@ -319,6 +319,40 @@ get_next_event() {
   return -1;
 }
 
+/**
+ * Appends to the vector the index numbers of all of the remaining intervals
+ * that have events requiring servicing by the scripting language, and
+ * advances past them, so that each interval is returned only once.  This
+ * differs from repeated calls to get_next_event(), which keeps returning the
+ * same meta interval until all of its events have been popped.
+ *
+ * The scripting language must service all of the events of every returned
+ * interval.
+ */
+void CIntervalManager::
+collect_next_events(vector_int &indices) {
+  MutexHolder holder(_lock);
+
+  while (_next_event_index < (int)_intervals.size()) {
+    IntervalDef &def = _intervals[_next_event_index];
+    if (def._interval != nullptr) {
+      if ((def._flags & F_external) != 0 &&
+          def._interval->check_t_callback()) {
+        indices.push_back(_next_event_index);
+
+      } else if ((def._flags & F_meta_interval) != 0) {
+        CMetaInterval *meta_interval;
+        DCAST_INTO_V(meta_interval, def._interval);
+        if (meta_interval->is_event_ready()) {
+          nassertv((def._flags & F_external) != 0);
+          indices.push_back(_next_event_index);
+        }
+      }
+    }
+    _next_event_index++;
+  }
+}
+
 /**
  * This should be called by the scripting language after each call to step().
  * It returns the index number of an interval that was recently removed, or -1
@@ -21,6 +21,7 @@
 #include "pmap.h"
 #include "vector_int.h"
 #include "pmutex.h"
+#include "extension.h"
 
 class EventQueue;
 
@@ -57,12 +58,17 @@ PUBLISHED:
   void step();
   int get_next_event();
   int get_next_removal();
+  EXTENSION(PyObject *get_next_events());
+  EXTENSION(PyObject *get_next_removals());
 
   void output(std::ostream &out) const;
   void write(std::ostream &out) const;
 
   static CIntervalManager *get_global_ptr();
 
+public:
+  void collect_next_events(vector_int &indices);
+
 private:
   void finish_interval(CInterval *interval);
   void remove_index(int index);
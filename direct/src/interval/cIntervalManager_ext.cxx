@@ -0,0 +1,61 @@
+/**
+ * PANDA 3D SOFTWARE
+ * Copyright (c) Carnegie Mellon University.  All rights reserved.
+ *
+ * All use of this software is subject to the terms of the revised BSD
+ * license.  You should have received a copy of this license along
+ * with this source code in a file named "LICENSE."
+ *
+ * @file cIntervalManager_ext.cxx
+ * @date 2026-10-19
+ */
+
+#include "cIntervalManager_ext.h"
+
+#ifdef HAVE_PYTHON
+
+/**
+ * Returns a list of the indices of all intervals that have events requiring
+ * servicing by the scripting language.  This allows all pending events of a
+ * step to be retrieved with a single call.  Each interval is listed only
+ * once, so the caller must service all of its events, which privPostEvent()
+ * does.
+ */
+PyObject *Extension<CIntervalManager>::
+get_next_events() {
+  vector_int indices;
+  _this->collect_next_events(indices);
+
+  PyObject *list = PyList_New(indices.size());
+  if (list == nullptr) {
+    return nullptr;
+  }
+  for (size_t i = 0; i < indices.size(); ++i) {
+    PyList_SET_ITEM(list, i, PyLong_FromLong(indices[i]));
+  }
+  return list;
+}
+
+/**
+ * Returns a list of the indices of all intervals that were recently removed,
+ * in the order in which they would be returned by repeated calls to
+ * get_next_removal().
+ */
+PyObject *Extension<CIntervalManager>::
+get_next_removals() {
+  PyObject *list = PyList_New(0);
+  if (list == nullptr) {
+    return nullptr;
+  }
+
+  int index = _this->get_next_removal();
+  while (index >= 0) {
+    PyObject *item = PyLong_FromLong(index);
+    PyList_Append(list, item);
+    Py_DECREF(item);
+    index = _this->get_next_removal();
+  }
+  return list;
+}
+
+#endif  // HAVE_PYTHON
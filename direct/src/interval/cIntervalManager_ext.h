@@ -0,0 +1,37 @@
+/**
+ * PANDA 3D SOFTWARE
+ * Copyright (c) Carnegie Mellon University.  All rights reserved.
+ *
+ * All use of this software is subject to the terms of the revised BSD
+ * license.  You should have received a copy of this license along
+ * with this source code in a file named "LICENSE."
+ *
+ * @file cIntervalManager_ext.h
+ * @date 2026-10-19
+ */
+
+#ifndef CINTERVALMANAGER_EXT_H
+#define CINTERVALMANAGER_EXT_H
+
+#include "dtoolbase.h"
+
+#ifdef HAVE_PYTHON
+
+#include "extension.h"
+#include "cIntervalManager.h"
+#include "py_panda.h"
+
+/**
+ * This class defines the extension methods for CIntervalManager, which are
+ * called instead of any C++ methods with the same prototype.
+ */
+template<>
+class Extension<CIntervalManager> : public ExtensionBase<CIntervalManager> {
+public:
+  PyObject *get_next_events();
+  PyObject *get_next_removals();
+};
+
+#endif  // HAVE_PYTHON
+
+#endif  // CINTERVALMANAGER_EXT_H
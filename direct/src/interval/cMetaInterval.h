@@ -85,6 +85,7 @@ PUBLISHED:
   INLINE double get_event_t() const;
   INLINE EventType get_event_type() const;
   void pop_event();
+  EXTENSION(PyObject *pop_events());
 
   virtual void write(std::ostream &out, int indent_level) const;
   void timeline(std::ostream &out) const;
@@ -0,0 +1,45 @@
+/**
+ * PANDA 3D SOFTWARE
+ * Copyright (c) Carnegie Mellon University.  All rights reserved.
+ *
+ * All use of this software is subject to the terms of the revised BSD
+ * license.  You should have received a copy of this license along
+ * with this source code in a file named "LICENSE."
+ *
+ * @file cMetaInterval_ext.cxx
+ * @date 2026-10-19
+ */
+
+#include "cMetaInterval_ext.h"
+
+#ifdef HAVE_PYTHON
+
+/**
+ * Pops all of the events that are currently ready off the queue, and returns
+ * them as a list of (index, t, event_type) tuples.  This is equivalent to
+ * calling get_event_index(), get_event_t(), get_event_type() and pop_event()
+ * while is_event_ready() returns true, but requires only a single call.
+ */
+PyObject *Extension<CMetaInterval>::
+pop_events() {
+  PyObject *list = PyList_New(0);
+  if (list == nullptr) {
+    return nullptr;
+  }
+
+  while (_this->is_event_ready()) {
+    PyObject *item = Py_BuildValue("(idi)", _this->get_event_index(),
+                                   _this->get_event_t(),
+                                   (int)_this->get_event_type());
+    if (item == nullptr) {
+      Py_DECREF(list);
+      return nullptr;
+    }
+    PyList_Append(list, item);
+    Py_DECREF(item);
+    _this->pop_event();
+  }
+  return list;
+}
+
+#endif  // HAVE_PYTHON
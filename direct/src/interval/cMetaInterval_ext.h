@@ -0,0 +1,36 @@
+/**
+ * PANDA 3D SOFTWARE
+ * Copyright (c) Carnegie Mellon University.  All rights reserved.
+ *
+ * All use of this software is subject to the terms of the revised BSD
+ * license.  You should have received a copy of this license along
+ * with this source code in a file named "LICENSE."
+ *
+ * @file cMetaInterval_ext.h
+ * @date 2026-10-19
+ */
+
+#ifndef CMETAINTERVAL_EXT_H
+#define CMETAINTERVAL_EXT_H
+
+#include "dtoolbase.h"
+
+#ifdef HAVE_PYTHON
+
+#include "extension.h"
+#include "cMetaInterval.h"
+#include "py_panda.h"
+
+/**
+ * This class defines the extension methods for CMetaInterval, which are
+ * called instead of any C++ methods with the same prototype.
+ */
+template<>
+class Extension<CMetaInterval> : public ExtensionBase<CMetaInterval> {
+public:
+  PyObject *pop_events();
+};
+
+#endif  // HAVE_PYTHON
+
+#endif  // CMETAINTERVAL_EXT_H
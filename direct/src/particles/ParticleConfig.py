@@ -0,0 +1,419 @@
+"""Data-only particle effect configuration format.
+
+The traditional .ptf format written by :meth:`.ParticleEffect.saveConfig` is
+Python source code that is executed every time an effect is loaded.  This
+module defines an equivalent declarative format, stored as JSON, which
+describes the parameters of every :class:`.Particles` and
+:class:`.ForceGroup` in an effect without containing any code.
+
+A loaded configuration is turned into a :class:`ParticleEffectTemplate`, in
+which all type names and constants have already been resolved.  Templates are
+cached by filename, so that spawning the same effect repeatedly does not
+involve any file access or parsing at all.
+
+Existing .ptf files can be converted to the new format using
+:func:`convertPtfFile`, or from the command-line::
+
+    python -m direct.particles.ParticleConfig effect.ptf effect.json
+"""
+
+__all__ = [
+    'ParticleEffectTemplate', 'ptfToConfig', 'convertPtfFile',
+    'loadTemplate', 'clearTemplateCache',
+]
+
+from panda3d import core, physics
+from panda3d.core import Filename, VirtualFileSystem, getModelPath
+
+from . import Particles
+from . import ForceGroup
+
+import ast
+import json
+
+#: The version number written to the "version" key of new config files.
+CONFIG_VERSION = 1
+
+# The Loader methods that a config file may refer to for model and texture
+# references.
+_loaderMethods = ('loadModel', 'loadTexture')
+
+# Cache of ParticleEffectTemplate objects, indexed by the filename as it was
+# passed to loadTemplate, so that a cache hit does not involve a file search.
+_templateCache: dict[str, 'ParticleEffectTemplate'] = {}
+
+
+def _lookupType(name):
+    """Returns the Panda3D class with the given name, for use in type and
+    constant references.  Only classes from panda3d.core and panda3d.physics
+    may be referenced by a config file."""
+    if name.startswith('_'):
+        raise ValueError("invalid type name in particle config: %r" % (name))
+
+    for module in (core, physics):
+        cls = getattr(module, name, None)
+        if isinstance(cls, type):
+            return cls
+
+    raise ValueError("unknown type in particle config: %r" % (name))
+
+
+class _LoaderRef:
+    """Stands in for a model or texture that has to be loaded at the time the
+    template is applied, rather than at the time it is built."""
+
+    def __init__(self, method, args, result=None):
+        if method not in _loaderMethods:
+            raise ValueError("invalid loader method in particle config: %r" % (method))
+        if result is not None and (not result.isidentifier() or result.startswith('_')):
+            raise ValueError("invalid loader result in particle config: %r" % (result))
+        self.method = method
+        self.args = args
+        self.result = result
+
+    def resolve(self):
+        from direct.showbase import ShowBaseGlobal
+        value = getattr(ShowBaseGlobal.base.loader, self.method)(*self.args)
+        if self.result is not None:
+            value = getattr(value, self.result)()
+        return value
+
+
+def _buildValue(value):
+    """Converts a JSON value from a config file into the value that should be
+    passed to the relevant setter."""
+    if isinstance(value, dict):
+        if 'type' in value:
+            cls = _lookupType(value['type'])
+            return cls(*[_buildValue(arg) for arg in value.get('args', ())])
+        elif 'const' in value:
+            typeName, _, constName = value['const'].partition('.')
+            if not constName or constName.startswith('_'):
+                raise ValueError("invalid constant in particle config: %r" % (value['const']))
+            return getattr(_lookupType(typeName), constName)
+        elif 'loader' in value:
+            args = [_buildValue(arg) for arg in value.get('args', ())]
+            return _LoaderRef(value['loader'], args, value.get('result'))
+        raise ValueError("invalid value in particle config: %r" % (value))
+
+    elif isinstance(value, list):
+        return [_buildValue(arg) for arg in value]
+
+    return value
+
+
+def _buildCall(param):
+    """Converts a [path, arg, ...] entry into a (path, method, args, deferred)
+    tuple, in which the path is a tuple of (attribute, isCall) pairs."""
+    path = param[0].split('.')
+    method = path.pop()
+    if not method.isidentifier() or method.startswith('_'):
+        raise ValueError("invalid method in particle config: %r" % (param[0]))
+
+    steps = []
+    for step in path:
+        isCall = step.endswith('()')
+        name = step[:-2] if isCall else step
+        if not name.isidentifier() or name.startswith('_'):
+            raise ValueError("invalid method in particle config: %r" % (param[0]))
+        steps.append((name, isCall))
+
+    args = [_buildValue(arg) for arg in param[1:]]
+    deferred = any(isinstance(arg, _LoaderRef) for arg in args)
+    return tuple(steps), method, args, deferred
+
+
+def _applyCalls(obj, calls):
+    for steps, method, args, deferred in calls:
+        target = obj
+        for name, isCall in steps:
+            target = getattr(target, name)
+            if isCall:
+                target = target()
+
+        if deferred:
+            args = [arg.resolve() if isinstance(arg, _LoaderRef) else arg
+                    for arg in args]
+        getattr(target, method)(*args)
+
+
+class ParticleEffectTemplate:
+    """A pre-processed particle effect configuration, which can be applied to
+    any number of :class:`.ParticleEffect` objects without needing to look at
+    the original configuration again."""
+
+    def __init__(self, config):
+        version = config.get('version', CONFIG_VERSION)
+        if version > CONFIG_VERSION:
+            raise ValueError("particle config version %d is not supported" % (version))
+
+        self.pos = tuple(config.get('pos', (0, 0, 0)))
+        self.hpr = tuple(config.get('hpr', (0, 0, 0)))
+        self.scale = tuple(config.get('scale', (1, 1, 1)))
+
+        self.particles = []
+        for spec in config.get('particles', ()):
+            calls = [_buildCall(param) for param in spec.get('params', ())]
+            attribs = dict(spec.get('attributes', {}))
+            self.particles.append((spec['name'], calls, attribs))
+
+        self.forceGroups = []
+        for spec in config.get('forceGroups', ()):
+            forces = []
+            for force in spec.get('forces', ()):
+                cls = _lookupType(force['type'])
+                if not issubclass(cls, physics.BaseForce):
+                    raise ValueError("%s is not a force type" % (force['type']))
+                args = [_buildValue(arg) for arg in force.get('args', ())]
+                calls = [_buildCall(param) for param in force.get('params', ())]
+                forces.append((cls, args, calls))
+            self.forceGroups.append((spec['name'], forces))
+
+    def apply(self, effect):
+        """Replaces the contents of the given ParticleEffect with a new set of
+        particles and force groups, as described by this template."""
+        effect.reset()
+        effect.setPos(*self.pos)
+        effect.setHpr(*self.hpr)
+        effect.setScale(*self.scale)
+
+        for name, calls, attribs in self.particles:
+            p = Particles.Particles(name)
+            _applyCalls(p, calls)
+            for key, value in attribs.items():
+                setattr(p, key, value)
+            effect.addParticles(p)
+
+        for name, forces in self.forceGroups:
+            fg = ForceGroup.ForceGroup(name)
+            for cls, args, calls in forces:
+                force = cls(*args)
+                _applyCalls(force, calls)
+                fg.addForce(force)
+            effect.addForceGroup(fg)
+
+
+class _PtfConverter:
+    """Walks the syntax tree of a .ptf file, as written by saveConfig, and
+    builds up the equivalent config dictionary.  The file is never executed;
+    anything other than the limited set of statements that saveConfig
+    generates is rejected with a ValueError."""
+
+    def __init__(self):
+        self.config = {'version': CONFIG_VERSION}
+        self.particles = {}
+        self.forceGroups = {}
+        self.forces = {}
+        self.values = {}
+
+    def error(self, node, message):
+        raise ValueError("line %d: %s" % (node.lineno, message))
+
+    def checkName(self, node, name):
+        # Private and special attributes could be used to reach outside of
+        # the particle objects, so they may not be referenced.
+        if name.startswith('_'):
+            self.error(node, "invalid name: %s" % (name))
+        return name
+
+    def convert(self, source):
+        tree = ast.parse(source)
+        for stmt in tree.body:
+            if isinstance(stmt, ast.Assign):
+                self.convertAssign(stmt)
+            elif isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+                self.convertCall(stmt.value)
+            else:
+                self.error(stmt, "unsupported statement")
+
+        self.config['particles'] = list(self.particles.values())
+        self.config['forceGroups'] = list(self.forceGroups.values())
+        return self.config
+
+    def convertAssign(self, stmt):
+        if len(stmt.targets) != 1:
+            self.error(stmt, "unsupported assignment")
+        target = stmt.targets[0]
+        value = stmt.value
+
+        if isinstance(target, ast.Attribute):
+            # Eg. p0.geomReference = "..."
+            if not isinstance(target.value, ast.Name) or target.value.id not in self.particles:
+                self.error(stmt, "unsupported assignment")
+            attribs = self.particles[target.value.id].setdefault('attributes', {})
+            attribs[self.checkName(stmt, target.attr)] = self.convertValue(value)
+            return
+
+        if not isinstance(target, ast.Name) or not isinstance(value, ast.Call):
+            self.error(stmt, "unsupported assignment")
+
+        func = self.dottedName(value.func)
+        args = [self.convertValue(arg) for arg in value.args]
+        if func == 'Particles.Particles':
+            self.particles[target.id] = {'name': args[0], 'params': []}
+        elif func == 'ForceGroup.ForceGroup':
+            self.forceGroups[target.id] = {'name': args[0], 'forces': []}
+        elif func == 'loader.loadModel' or func == 'loader.loadTexture':
+            self.values[target.id] = self.convertValue(value)
+        elif func is not None and '.' not in func:
+            self.forces[target.id] = {'type': func, 'args': args, 'params': []}
+        else:
+            self.error(stmt, "unsupported assignment")
+
+    def convertCall(self, call):
+        func = call.func
+        if not isinstance(func, ast.Attribute):
+            self.error(call, "unsupported function call")
+
+        # Unwind the chain of attribute lookups and calls leading up to the
+        # method being called, eg. p0.renderer.getColorInterpolationManager()
+        path = [self.checkName(call, func.attr)]
+        node = func.value
+        while not isinstance(node, ast.Name):
+            if isinstance(node, ast.Attribute):
+                path.append(self.checkName(call, node.attr))
+                node = node.value
+            elif isinstance(node, ast.Call) and not node.args and isinstance(node.func, ast.Attribute):
+                path.append(self.checkName(call, node.func.attr) + '()')
+                node = node.func.value
+            else:
+                self.error(call, "unsupported function call")
+        path.reverse()
+        var = node.id
+        method = '.'.join(path)
+
+        if var == 'self':
+            self.convertEffectCall(call, method)
+        elif var in self.particles:
+            self.particles[var]['params'].append([method] + [self.convertValue(arg) for arg in call.args])
+        elif var in self.forces:
+            self.forces[var]['params'].append([method] + [self.convertValue(arg) for arg in call.args])
+        elif var in self.forceGroups and method == 'addForce':
+            force = self.forces.get(self.argName(call))
+            if force is None:
+                self.error(call, "unknown force")
+            self.forceGroups[var]['forces'].append(force)
+        else:
+            self.error(call, "unsupported function call")
+
+    def convertEffectCall(self, call, method):
+        if method == 'reset':
+            pass
+        elif method in ('setPos', 'setHpr', 'setScale'):
+            self.config[method[3:].lower()] = [self.convertValue(arg) for arg in call.args]
+        elif method in ('addParticles', 'addForceGroup'):
+            # Particles and force groups are added in the order in which they
+            # were created, which is also the order in which they are added.
+            if self.argName(call) not in self.particles and self.argName(call) not in self.forceGroups:
+                self.error(call, "unknown particles or force group")
+        else:
+            self.error(call, "unsupported method: %s" % (method))
+
+    def argName(self, call):
+        if len(call.args) != 1 or not isinstance(call.args[0], ast.Name):
+            self.error(call, "expected a variable name")
+        return call.args[0].id
+
+    def dottedName(self, node):
+        if isinstance(node, ast.Name):
+            return self.checkName(node, node.id)
+        elif isinstance(node, ast.Attribute):
+            prefix = self.dottedName(node.value)
+            if prefix is not None:
+                return prefix + '.' + self.checkName(node, node.attr)
+        return None
+
+    def convertValue(self, node):
+        if isinstance(node, ast.Constant):
+            return node.value
+
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub) \
+             and isinstance(node.operand, ast.Constant):
+            return -node.operand.value
+
+        elif isinstance(node, ast.Name):
+            if node.id in self.values:
+                return self.values[node.id]
+            elif node.id in ('True', 'False'):
+                return node.id == 'True'
+            self.error(node, "unknown variable: %s" % (node.id))
+
+        elif isinstance(node, ast.Attribute):
+            name = self.dottedName(node)
+            if name is None or name.count('.') != 1:
+                self.error(node, "unsupported constant")
+            return {'const': name}
+
+        elif isinstance(node, ast.Call):
+            func = self.dottedName(node.func)
+            args = [self.convertValue(arg) for arg in node.args]
+            if func in ('loader.loadModel', 'loader.loadTexture'):
+                return {'loader': func[7:], 'args': args}
+
+            elif isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name) \
+                 and node.func.value.id in self.values and not args:
+                # Eg. geomRef.node()
+                value = dict(self.values[node.func.value.id])
+                value['result'] = self.checkName(node, node.func.attr)
+                return value
+
+            elif func is not None and '.' not in func:
+                return {'type': func, 'args': args}
+
+        self.error(node, "unsupported value")
+
+
+def ptfToConfig(source):
+    """Converts the source code of a .ptf file, as written by
+    :meth:`.ParticleEffect.saveConfig`, into a config dictionary that can be
+    stored as JSON.  The source is parsed, but never executed."""
+    if isinstance(source, bytes):
+        source = source.decode('utf-8')
+    return _PtfConverter().convert(source.replace('\r', ''))
+
+
+def convertPtfFile(ptfFilename, jsonFilename):
+    """Reads the given .ptf file and writes the equivalent JSON config."""
+    ptfFilename = Filename(ptfFilename)
+    jsonFilename = Filename(jsonFilename)
+
+    with open(ptfFilename.toOsSpecific(), 'rb') as f:
+        config = ptfToConfig(f.read())
+
+    with open(jsonFilename.toOsSpecific(), 'w') as f:
+        json.dump(config, f, indent=1)
+
+
+def loadTemplate(filename):
+    """Returns the ParticleEffectTemplate for the given JSON config file,
+    reading it from disk only if it has not been loaded before."""
+    fn = Filename(filename)
+    key = fn.getFullpath()
+    template = _templateCache.get(key)
+    if template is None:
+        vfs = VirtualFileSystem.getGlobalPtr()
+        if not vfs.resolveFilename(fn, getModelPath().value) and not fn.isRegularFile():
+            raise FileNotFoundError("could not find particle file: %s" % (filename))
+
+        config = json.loads(vfs.readFile(fn, True))
+        template = ParticleEffectTemplate(config)
+        _templateCache[key] = template
+
+    return template
+
+
+def clearTemplateCache():
+    """Forgets all cached templates, so that config files will be read again
+    the next time they are loaded."""
+    _templateCache.clear()
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: %s input.ptf output.json" % (sys.argv[0]))
+        sys.exit(1)
+
+    convertPtfFile(Filename.fromOsSpecific(sys.argv[1]),
+                   Filename.fromOsSpecific(sys.argv[2]))
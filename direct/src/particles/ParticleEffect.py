@@ -6,8 +6,11 @@ from panda3d.core import * # pylint: disable=unused-import
 from panda3d.physics import * # pylint: disable=unused-import
 from . import Particles # pylint: disable=unused-import
 from . import ForceGroup # pylint: disable=unused-import
+from . import ParticleConfig
 
 from direct.directnotify import DirectNotifyGlobal
+import io
+import json
 
 
 class ParticleEffect(NodePath):
@@ -168,45 +171,71 @@ class ParticleEffect(NodePath):
         return self.forceGroupDict
 
     def saveConfig(self, filename):
+        """Writes the effect's particles and force groups to the given file.
+        If the filename has a .json extension, the data-only format defined
+        in :mod:`.ParticleConfig` is written; otherwise, a .ptf file is
+        written."""
         filename = Filename(filename)
-        with open(filename.toOsSpecific(), 'w') as f:
-            # Add a blank line
-            f.write('\n')
-
-            # Make sure we start with a clean slate
-            f.write('self.reset()\n')
-
-            pos = self.getPos()
-            hpr = self.getHpr()
-            scale = self.getScale()
-            f.write('self.setPos(%0.3f, %0.3f, %0.3f)\n' %
-                    (pos[0], pos[1], pos[2]))
-            f.write('self.setHpr(%0.3f, %0.3f, %0.3f)\n' %
-                    (hpr[0], hpr[1], hpr[2]))
-            f.write('self.setScale(%0.3f, %0.3f, %0.3f)\n' %
-                    (scale[0], scale[1], scale[2]))
-
-            # Save all the particles to file
-            num = 0
-            for p in list(self.particlesDict.values()):
-                target = 'p%d' % num
-                num = num + 1
-                f.write(target + ' = Particles.Particles(\'%s\')\n' % p.getName())
-                p.printParams(f, target)
-                f.write('self.addParticles(%s)\n' % target)
-
-            # Save all the forces to file
-            num = 0
-            for fg in list(self.forceGroupDict.values()):
-                target = 'f%d' % num
-                num = num + 1
-                f.write(target + ' = ForceGroup.ForceGroup(\'%s\')\n' % \
-                                                    fg.getName())
-                fg.printParams(f, target)
-                f.write('self.addForceGroup(%s)\n' % target)
+        if filename.getExtension() == 'json':
+            buf = io.StringIO()
+            self.__writePtf(buf)
+            config = ParticleConfig.ptfToConfig(buf.getvalue())
+            with open(filename.toOsSpecific(), 'w') as f:
+                json.dump(config, f, indent=1)
+        else:
+            with open(filename.toOsSpecific(), 'w') as f:
+                self.__writePtf(f)
+
+    def __writePtf(self, f):
+        # Add a blank line
+        f.write('\n')
+
+        # Make sure we start with a clean slate
+        f.write('self.reset()\n')
+
+        pos = self.getPos()
+        hpr = self.getHpr()
+        scale = self.getScale()
+        f.write('self.setPos(%0.3f, %0.3f, %0.3f)\n' %
+                (pos[0], pos[1], pos[2]))
+        f.write('self.setHpr(%0.3f, %0.3f, %0.3f)\n' %
+                (hpr[0], hpr[1], hpr[2]))
+        f.write('self.setScale(%0.3f, %0.3f, %0.3f)\n' %
+                (scale[0], scale[1], scale[2]))
+
+        # Save all the particles to file
+        num = 0
+        for p in list(self.particlesDict.values()):
+            target = 'p%d' % num
+            num = num + 1
+            f.write(target + ' = Particles.Particles(\'%s\')\n' % p.getName())
+            p.printParams(f, target)
+            f.write('self.addParticles(%s)\n' % target)
+
+        # Save all the forces to file
+        num = 0
+        for fg in list(self.forceGroupDict.values()):
+            target = 'f%d' % num
+            num = num + 1
+            f.write(target + ' = ForceGroup.ForceGroup(\'%s\')\n' % \
+                                                fg.getName())
+            fg.printParams(f, target)
+            f.write('self.addForceGroup(%s)\n' % target)
 
     def loadConfig(self, filename):
+        """Replaces the contents of this effect with the particles and force
+        groups described in the given file.  Files with a .json extension are
+        read using :mod:`.ParticleConfig`, and are only parsed the first time
+        they are loaded; other files are executed as .ptf files."""
         fn = Filename(filename)
+        if fn.getExtension() == 'json':
+            try:
+                ParticleConfig.loadTemplate(fn).apply(self)
+            except Exception:
+                self.notify.warning('loadConfig: failed to load particle file: '+ repr(filename))
+                raise
+            return
+
         vfs = VirtualFileSystem.getGlobalPtr()
         try:
             if not vfs.resolveFilename(fn, getModelPath().value) and not fn.isRegularFile():
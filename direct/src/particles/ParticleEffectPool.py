@@ -0,0 +1,217 @@
+"""Contains the ParticleEffectPool class, which recycles ParticleEffect
+objects for effects that are spawned very frequently."""
+
+__all__ = ['ParticleEffectPool']
+
+from panda3d.core import NodePath
+from direct.directnotify import DirectNotifyGlobal
+from direct.showbase.DirectObject import DirectObject
+from direct.showbase.PythonUtil import uniqueName
+from direct.task.TaskManagerGlobal import taskMgr
+
+from .ParticleEffect import ParticleEffect
+
+
+class ParticleEffectPool(DirectObject):
+    """Hands out pre-built ParticleEffect instances for short-lived effects
+    like hit sparks or muzzle flashes, which would otherwise construct and
+    tear down a complete set of Particles, factories, renderers and emitters
+    every time they are spawned.
+
+    Effects are identified by the filename of their config file, as accepted
+    by :meth:`.ParticleEffect.loadConfig`.  For JSON config files, the parsed
+    template is cached too, so that building a new instance is cheap as well.
+
+    Typical usage::
+
+        pool = ParticleEffectPool()
+        pool.warmUp('spark.json', 20)
+
+        effect = pool.spawn('spark.json', render)
+        effect.setPos(hitPos)
+        ...
+        pool.softStop(effect)   # returns to the pool once all particles died
+    """
+
+    notify = DirectNotifyGlobal.directNotify.newCategory('ParticleEffectPool')
+
+    def __init__(self, maxSize=16, taskName=None):
+        #: The default maximum number of idle effects kept per config file.
+        self.maxSize = maxSize
+        if taskName is None:
+            taskName = uniqueName('particleEffectPool')
+        self.taskName = taskName
+
+        self.__maxSizes = {}
+        self.__free = {}
+        self.__effectKeys = {}
+        # the transform that each effect had after loading its config
+        self.__initialTransforms = {}
+        self.__draining = []
+        # ids of the effects that are in a free list, or in __draining
+        self.__idleIds = set()
+        self.__drainingIds = set()
+
+        # idle effects are kept under this node, which is never rendered
+        self.__hiddenNode = NodePath('particleEffectPool')
+        self.__hiddenNode.hide()
+
+        #: The number of ParticleEffect objects that had to be built.
+        self.numCreated = 0
+        #: The number of spawns that were satisfied from the pool.
+        self.numReused = 0
+        #: The number of released effects cleaned up because the pool was full.
+        self.numDiscarded = 0
+
+    def setMaxSize(self, filename, maxSize):
+        """Sets the maximum number of idle effects that are kept around for
+        the given config file, overriding the pool-wide maxSize."""
+        key = str(filename)
+        self.__maxSizes[key] = maxSize
+
+        free = self.__free.get(key)
+        while free and len(free) > maxSize:
+            effect = free.pop()
+            self.__idleIds.discard(id(effect))
+            del self.__effectKeys[id(effect)]
+            del self.__initialTransforms[id(effect)]
+            effect.cleanup()
+            self.numDiscarded += 1
+
+    def getMaxSize(self, filename):
+        return self.__maxSizes.get(str(filename), self.maxSize)
+
+    def getNumFree(self, filename):
+        """Returns the number of idle effects ready to be spawned."""
+        return len(self.__free.get(str(filename), ()))
+
+    def getAllocationsAvoided(self):
+        """Returns the number of spawns that did not need a new effect."""
+        return self.numReused
+
+    def warmUp(self, filename, count):
+        """Builds idle effects until there are at least count of them
+        available for the given config file (limited by the pool size)."""
+        key = str(filename)
+        free = self.__free.setdefault(key, [])
+        count = min(count, self.getMaxSize(key))
+        while len(free) < count:
+            effect = self.__makeEffect(key)
+            self.__idleIds.add(id(effect))
+            free.append(effect)
+
+    def spawn(self, filename, parent=None, renderParent=None, firstBirthDelay=None):
+        """Returns a ready-to-use effect for the given config file, which has
+        been started and soft-started.  Use softStop() or release() to hand
+        it back to the pool when it is no longer needed."""
+        key = str(filename)
+        free = self.__free.get(key)
+        if free:
+            effect = free.pop()
+            self.__idleIds.discard(id(effect))
+            self.numReused += 1
+        else:
+            effect = self.__makeEffect(key)
+
+        effect.start(parent, renderParent)
+        effect.softStart(firstBirthDelay)
+        return effect
+
+    def softStop(self, effect):
+        """Stops the effect from emitting new particles, and returns it to
+        the pool as soon as all its live particles have died off."""
+        assert id(effect) in self.__effectKeys, "effect does not belong to this pool"
+        if id(effect) in self.__idleIds or id(effect) in self.__drainingIds:
+            # it was already handed back
+            return
+        effect.softStop()
+        self.__draining.append(effect)
+        self.__drainingIds.add(id(effect))
+        if len(self.__draining) == 1:
+            taskMgr.add(self.__drainTask, self.taskName)
+
+    def release(self, effect):
+        """Immediately returns the effect to the pool, cutting off any
+        particles that are still alive.  Releasing an effect that is
+        already idle does nothing."""
+        if id(effect) in self.__idleIds:
+            return
+        if id(effect) in self.__drainingIds:
+            self.__drainingIds.discard(id(effect))
+            self.__draining = [e for e in self.__draining if e is not effect]
+            if not self.__draining:
+                taskMgr.remove(self.taskName)
+        self.__recycle(effect)
+
+    def cleanup(self):
+        """Destroys all effects that are idle or draining.  Effects that are
+        still in use remain valid, but are no longer tracked by the pool."""
+        taskMgr.remove(self.taskName)
+        for effect in self.__draining:
+            effect.cleanup()
+        self.__draining = []
+        self.__drainingIds = set()
+
+        for free in self.__free.values():
+            for effect in free:
+                effect.cleanup()
+        self.__free = {}
+        self.__idleIds = set()
+        self.__effectKeys = {}
+        self.__initialTransforms = {}
+
+    def __makeEffect(self, key):
+        effect = ParticleEffect()
+        effect.loadConfig(key)
+        effect.reparentTo(self.__hiddenNode)
+        self.__effectKeys[id(effect)] = key
+        self.__initialTransforms[id(effect)] = effect.getTransform()
+        self.numCreated += 1
+        return effect
+
+    def __recycle(self, effect):
+        key = self.__effectKeys.get(id(effect))
+        assert key is not None, "effect does not belong to this pool"
+
+        free = self.__free.setdefault(key, [])
+        if len(free) >= self.getMaxSize(key):
+            del self.__effectKeys[id(effect)]
+            del self.__initialTransforms[id(effect)]
+            effect.cleanup()
+            self.numDiscarded += 1
+            return
+
+        # Undo whatever the previous user did to the effect, so that the
+        # next spawn gets it in the same state as a newly built one.
+        effect.disable()
+        effect.clearToInitial()
+        effect.setTransform(self.__initialTransforms[id(effect)])
+        effect.reparentTo(self.__hiddenNode)
+        free.append(effect)
+        self.__idleIds.add(id(effect))
+
+    def __drainTask(self, task):
+        draining = self.__draining
+        i = 0
+        while i < len(draining):
+            effect = draining[i]
+            for particles in effect.getParticlesList():
+                if particles.getLivingParticles() > 0:
+                    i += 1
+                    break
+            else:
+                del draining[i]
+                self.__drainingIds.discard(id(effect))
+                self.__recycle(effect)
+
+        if draining:
+            return task.cont
+        return task.done
+
+    # Snake-case aliases.
+    set_max_size = setMaxSize
+    get_max_size = getMaxSize
+    get_num_free = getNumFree
+    get_allocations_avoided = getAllocationsAvoided
+    warm_up = warmUp
+    soft_stop = softStop
@@ -22,6 +22,13 @@ class Audio3DManager:
         self.vel_dict = {}
         self.listener_vel = VBase3(0, 0, 0)
 
+        # The transform of each object relative to the root as of the last
+        # update, so that objects that did not move can be skipped.
+        self.__transforms = {}
+        self.__forceUpdate = True
+        self.__cullDistance = None
+        self.__culledSounds = set()
+
         taskMgr.add(self.update, "Audio3DManager-updateTask", taskPriority)
 
     def loadSfx(self, name):
@@ -128,6 +135,7 @@ class Audio3DManager:
         if not isinstance(velocity, VBase3):
             raise TypeError("Invalid argument 1, expected <VBase3>")
         self.vel_dict[sound] = velocity
+        self.__forceUpdate = True
 
     def setSoundVelocityAuto(self, sound):
         """
@@ -137,6 +145,7 @@ class Audio3DManager:
         transformation between frames.
         """
         self.vel_dict[sound]=None
+        self.__forceUpdate = True
 
     def getSoundVelocity(self, sound):
         """
@@ -215,6 +224,7 @@ class Audio3DManager:
             self.sound_dict[WeakNodePath(object)] = []
 
         self.sound_dict[object].append(sound)
+        self.__forceUpdate = True
         return 1
 
 
@@ -229,6 +239,10 @@ class Audio3DManager:
                     # if there are no other sounds, don't track
                     # the object any more
                     del self.sound_dict[known_object]
+                    self.__transforms.pop(known_object, None)
+                if sound in self.__culledSounds:
+                    self.__culledSounds.discard(sound)
+                    sound.setActive(True)
                 return 1
         return 0
 
@@ -260,6 +274,37 @@ class Audio3DManager:
         return 1
 
 
+    def setCullDistance(self, distance):
+        """
+        Sounds attached to objects that are farther than the given distance
+        (in units of the root) from the listener are deactivated, and
+        reactivated once they come back in range.  This saves the audio
+        library the trouble of mixing sounds that are too far away to be
+        heard anyway.  Pass None to disable this, which is the default.
+        """
+        self.__cullDistance = distance
+        if distance is None:
+            self.__uncullAll()
+        self.__forceUpdate = True
+
+    def getCullDistance(self):
+        """
+        Returns the distance set by setCullDistance, or None.
+        """
+        return self.__cullDistance
+
+    def getNumCulledSounds(self):
+        """
+        Returns the number of sounds that are currently deactivated because
+        they are too far away from the listener.
+        """
+        return len(self.__culledSounds)
+
+    def __uncullAll(self):
+        for sound in self.__culledSounds:
+            sound.setActive(True)
+        self.__culledSounds.clear()
+
     def update(self, task=None):
         """
         Updates position of sounds in the 3D audio system. Will be called automatically
@@ -271,25 +316,76 @@ class Audio3DManager:
         # The audio manager is not active so do nothing
         if hasattr(self.audio_manager, "getActive"):
             if self.audio_manager.getActive()==0:
+                # Make sure everything is updated once it becomes active.
+                self.__forceUpdate = True
                 return Task.cont
 
+        root = self.root
+        transforms = self.__transforms
+        vel_dict = self.vel_dict
+        forceUpdate = self.__forceUpdate
+        self.__forceUpdate = False
+
+        listener_pos = None
+        if self.listener_target:
+            listener_pos = self.listener_target.getPos(root)
+
+        cull_dist_sq = None
+        if self.__cullDistance is not None:
+            cull_dist_sq = self.__cullDistance * self.__cullDistance
+            if listener_pos is None:
+                listener_pos = VBase3(0, 0, 0)
+            culled_sounds = self.__culledSounds
+
+        zero_vel = VBase3(0, 0, 0)
+        dt = None
         for known_object, sounds in list(self.sound_dict.items()):
             node_path = known_object.getNodePath()
             if not node_path:
                 # The node has been deleted.
                 del self.sound_dict[known_object]
+                transforms.pop(known_object, None)
+                self.__culledSounds.difference_update(sounds)
                 continue
 
-            pos = node_path.getPos(self.root)
+            # Transforms are uniquified, so this comparison is cheap.
+            transform = node_path.getTransform(root)
+            prev_transform = transforms.get(known_object)
+            moved = forceUpdate or prev_transform is None or \
+                not (prev_transform == transform)
+            transforms[known_object] = transform
+            pos = transform.getPos()
+
+            if cull_dist_sq is not None:
+                if (pos - listener_pos).lengthSquared() > cull_dist_sq:
+                    for sound in sounds:
+                        if sound not in culled_sounds and sound.getActive():
+                            sound.setActive(False)
+                            culled_sounds.add(sound)
+                    continue
+
+                for sound in sounds:
+                    if sound in culled_sounds:
+                        culled_sounds.discard(sound)
+                        sound.setActive(True)
+                        moved = True
 
             for sound in sounds:
-                vel = self.getSoundVelocity(sound)
+                vel = vel_dict.get(sound, zero_vel)
+                if vel is None:
+                    # The velocity is determined automatically, so this
+                    # sound needs updating even if the object stood still.
+                    if dt is None:
+                        dt = ClockObject.getGlobalClock().getDt()
+                    vel = node_path.getPosDelta(root) / dt
+                elif not moved:
+                    continue
                 sound.set3dAttributes(pos[0], pos[1], pos[2], vel[0], vel[1], vel[2])
 
         # Update the position of the listener based on the object
         # to which it is attached
         if self.listener_target:
-            pos = self.listener_target.getPos(self.root)
+            pos = listener_pos
             forward = self.root.getRelativeVector(self.listener_target, Vec3.forward())
             up = self.root.getRelativeVector(self.listener_target, Vec3.up())
             vel = self.getListenerVelocity()
@@ -304,11 +400,15 @@ class Audio3DManager:
         """
         taskMgr.remove("Audio3DManager-updateTask")
         self.detachListener()
+        self.__uncullAll()
         for object in list(self.sound_dict.keys()):
             for sound in self.sound_dict[object]:
                 self.detachSound(sound)
 
     #snake_case alias:
+    set_cull_distance = setCullDistance
+    get_cull_distance = getCullDistance
+    get_num_culled_sounds = getNumCulledSounds
     get_doppler_factor = getDopplerFactor
     set_listener_velocity_auto = setListenerVelocityAuto
     attach_listener = attachListener
@@ -9,10 +9,16 @@ from direct.showbase.Job import Job
 from direct.showbase.JobManagerGlobal import jobMgr
 from direct.showbase.MessengerGlobal import messenger
 from direct.task.TaskManagerGlobal import taskMgr
+from collections import deque
 import types
 import weakref
 import random
 import builtins
+import heapq
+import itertools
+import math
+import sys
+import time
 
 
 deadEndTypes = frozenset((
@@ -1139,3 +1145,413 @@ class ContainerLeakDetector(Job):
                         self._scheduleNextPruning)
         jobMgr.add(self._pruneContainersJob)
         return task.done
+
+
+class _SampledContainer:
+    # A container that was picked by the ContainerLeakSampler.  The container
+    # itself is not referenced; it is found again through a weak reference
+    # to the object that holds it, plus a short path of attribute names and
+    # dict keys from there.
+    __slots__ = ('ownerRef', 'path', 'name', 'key', 'u', 'observations',
+                 'reportedLen')
+
+    def __init__(self, ownerRef, path, name, key, u, maxObservations):
+        self.ownerRef = ownerRef
+        self.path = path
+        self.name = name
+        self.key = key
+        self.u = u
+        self.observations = deque(maxlen=maxObservations)
+        self.reportedLen = None
+
+    def getContainer(self):
+        # returns None if the container is gone
+        obj = self.ownerRef()
+        if obj is None:
+            return None
+        try:
+            for kind, key in self.path:
+                if kind == 'a':
+                    obj = getattr(obj, key)
+                else:
+                    obj = obj[key]
+        except Exception:
+            return None
+        if not hasattr(obj, '__len__'):
+            return None
+        return obj
+
+    def getGrowthRate(self):
+        # returns (slope, standard error) of the least-squares fit of the
+        # container length against time, in items per second, or None if
+        # there are not enough observations
+        n = len(self.observations)
+        if n < 3:
+            return None
+        meanT = sum(t for t, l in self.observations) / n
+        meanL = sum(l for t, l in self.observations) / n
+        sTT = sum((t - meanT) ** 2 for t, l in self.observations)
+        if sTT <= 0.:
+            return None
+        sTL = sum((t - meanT) * (l - meanL) for t, l in self.observations)
+        slope = sTL / sTT
+        intercept = meanL - slope * meanT
+        sse = sum((l - (intercept + slope * t)) ** 2 for t, l in self.observations)
+        stdErr = math.sqrt(sse / (n - 2) / sTT)
+        return slope, stdErr
+
+
+class ContainerLeakSampler:
+    """
+    Cheap alternative to the ContainerLeakDetector that can be left running on
+    a live server.  Rather than discovering every container in the process,
+    it takes a few steps of a random walk of the object graph at a time, and
+    keeps a weighted reservoir sample of the containers that it comes across,
+    favoring the larger ones, since a leaking container is bound to become
+    large.  The number of sampled containers and the number of length
+    measurements kept for each one are fixed, so the memory overhead is
+    bounded no matter how big the heap is.
+
+    Sampled containers are not referenced directly; they are located again
+    through a weak reference to the module, class or instance that holds
+    them.  Each check measures every sampled container, and reports a
+    container as leaking once a linear fit of its length over time shows
+    growth with the configured confidence.
+
+    These are the Config.prc variables that control the sampler:
+
+        leak-sampler-period 60
+        leak-sampler-size 512
+        leak-sampler-steps 200
+        leak-sampler-observations 16
+        leak-sampler-min-observations 6
+    """
+    notify = directNotify.newCategory("ContainerLeakSampler")
+
+    # types that have a length but can't grow
+    FixedSizeTypes = (
+        str, bytes, tuple, frozenset, range, memoryview, type, types.MappingProxyType,
+    )
+
+    # two-sided 95% critical values of Student's t distribution, by degrees
+    # of freedom; above the end of the table, the normal value is close enough
+    TCritical95 = (None, 12.71, 4.30, 3.18, 2.78, 2.57, 2.45, 2.36, 2.31, 2.26,
+                   2.23, 2.20, 2.18, 2.16, 2.14, 2.13, 2.12, 2.11, 2.10, 2.09,
+                   2.09, 2.08, 2.07, 2.07, 2.06, 2.06, 2.06, 2.05, 2.05, 2.05,
+                   2.04)
+
+    # the walk starts over from a random root with this probability, so
+    # that it does not get stuck in one corner of the graph
+    RestartChance = .1
+    # the most attributes or elements that are looked at in one step
+    MaxChildrenPerStep = 32
+
+    def __init__(self, name, period=None, sampleSize=None, roots=None):
+        self._serialNum = serialNum()
+        self._name = name
+        if period is None:
+            period = config.GetFloat('leak-sampler-period', 60.)
+        if sampleSize is None:
+            sampleSize = config.GetInt('leak-sampler-size', 512)
+        self._period = period
+        self._sampleSize = max(sampleSize, 1)
+        self._stepsPerCheck = config.GetInt('leak-sampler-steps', 200)
+        self._maxObservations = max(config.GetInt('leak-sampler-observations', 16), 3)
+        self._minObservations = max(config.GetInt('leak-sampler-min-observations', 6), 3)
+
+        # the objects that the walk starts from; by default, every module,
+        # which includes builtins and therefore base and simbase
+        self._roots = roots
+        self._rootRefs = []
+        self._curRef = None
+
+        # min-heap of (key, serial, sample), and the samples by location
+        self._reservoir = []
+        self._key2sample = {}
+
+        #: The number of containers that were offered to the reservoir.
+        self.numOffered = 0
+        #: The number of steps that the walk has taken.
+        self.numSteps = 0
+
+        ContainerLeakDetector.addPrivateObj(ContainerLeakDetector.PrivateIds)
+        ContainerLeakDetector.addPrivateObj(self.__dict__)
+        ContainerLeakDetector.addPrivateObj(self._reservoir)
+        ContainerLeakDetector.addPrivateObj(self._key2sample)
+
+        taskMgr.doMethodLater(self._period, self._checkTask, self._getCheckTaskName())
+
+    def destroy(self):
+        taskMgr.remove(self._getCheckTaskName())
+        ContainerLeakDetector.removePrivateObj(self._reservoir)
+        ContainerLeakDetector.removePrivateObj(self._key2sample)
+        ContainerLeakDetector.removePrivateObj(self.__dict__)
+        self._reservoir = []
+        self._key2sample = {}
+        self._rootRefs = []
+        self._curRef = None
+
+    def getLeakEvent(self):
+        # sent when a leak is detected
+        # passes the container and its description string as arguments
+        return 'containerLeakSampled-%s' % self._serialNum
+
+    def _getCheckTaskName(self):
+        return 'sampleLeakingContainers-%s' % self._serialNum
+
+    def getNumSamples(self):
+        return len(self._reservoir)
+
+    def getSampleNames(self):
+        return [sample.name for key, serial, sample in self._reservoir]
+
+    def getGrowthRates(self):
+        """Returns a list of (name, length, items per second, half-width of
+        the 95% confidence interval) for every sampled container that has
+        been measured enough times, fastest-growing first."""
+        rates = []
+        for key, serial, sample in self._reservoir:
+            fit = sample.getGrowthRate()
+            if fit is None:
+                continue
+            slope, stdErr = fit
+            margin = self._getTCritical(len(sample.observations) - 2) * stdErr
+            rates.append((sample.name, sample.observations[-1][1], slope, margin))
+        rates.sort(key=lambda rate: rate[2], reverse=True)
+        return rates
+
+    def _getTCritical(self, dof):
+        if dof < len(self.TCritical95):
+            return self.TCritical95[max(dof, 1)]
+        return 1.96
+
+    def _checkTask(self, task):
+        self.walk(self._stepsPerCheck)
+        self.checkContainers()
+        return task.again
+
+    def walk(self, numSteps):
+        """Takes the indicated number of steps of the random walk, offering
+        the containers that it passes to the reservoir."""
+        if self._curRef is None or not self._rootRefs:
+            self._refreshRoots()
+        for i in range(numSteps):
+            self.numSteps += 1
+            obj = None
+            if self._curRef is not None and random.random() >= self.RestartChance:
+                obj = self._curRef()
+            if obj is None:
+                if not self._rootRefs:
+                    return
+                obj = random.choice(self._rootRefs)()
+                if obj is None:
+                    self._refreshRoots()
+                    continue
+            self._curRef = self._step(obj)
+
+    def _refreshRoots(self):
+        roots = self._roots
+        if roots is None:
+            roots = [module for module in list(sys.modules.values())
+                     if isinstance(module, types.ModuleType)]
+        self._rootRefs = []
+        for root in roots:
+            try:
+                self._rootRefs.append(weakref.ref(root))
+            except TypeError:
+                pass
+        self._curRef = None
+
+    def _step(self, obj):
+        # looks at the attributes of obj, and returns a weak reference to the
+        # object that the walk goes to next, or None to start over
+        try:
+            objDict = object.__getattribute__(obj, '__dict__')
+        except AttributeError:
+            return None
+        try:
+            ownerRef = weakref.ref(obj)
+        except TypeError:
+            return None
+
+        items = list(objDict.items())
+        if len(items) > self.MaxChildrenPerStep:
+            items = random.sample(items, self.MaxChildrenPerStep)
+
+        nextObjs = []
+        for attr, value in items:
+            if not isinstance(attr, str) or id(value) in ContainerLeakDetector.PrivateIds:
+                continue
+            if self._isContainer(value):
+                path = (('a', attr), )
+                self._offer(ownerRef, path, value)
+                if type(value) is dict:
+                    # look one level down, for the likes of a dict of lists
+                    element = self._pickElement(value)
+                    if element is not None:
+                        elemKey, elemValue = element
+                        if (self._isContainer(elemValue) and
+                            id(elemValue) not in ContainerLeakDetector.PrivateIds):
+                            self._offer(ownerRef, path + (('k', elemKey), ), elemValue)
+                        elif self._isNode(elemValue):
+                            nextObjs.append(elemValue)
+                elif type(value) in (list, deque):
+                    if len(value):
+                        elemValue = value[random.randrange(len(value))]
+                        if self._isNode(elemValue):
+                            nextObjs.append(elemValue)
+            elif self._isNode(value):
+                nextObjs.append(value)
+
+        while nextObjs:
+            nextObj = nextObjs.pop(random.randrange(len(nextObjs)))
+            try:
+                return weakref.ref(nextObj)
+            except TypeError:
+                pass
+        return None
+
+    def _pickElement(self, container):
+        # returns a random (key, value) pair of a dict whose key can be stored
+        # safely, without a strong reference to anything interesting
+        numItems = len(container)
+        if not numItems:
+            return None
+        index = random.randrange(min(numItems, 1000))
+        key, value = next(itertools.islice(container.items(), index, None))
+        if type(key) in (str, int, bool, float):
+            return key, value
+        return None
+
+    def _isContainer(self, obj):
+        if isinstance(obj, self.FixedSizeTypes):
+            return False
+        objType = type(obj)
+        if objType in deadEndTypes and objType is not list:
+            return False
+        if not hasattr(objType, '__len__'):
+            return False
+        try:
+            len(obj)
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _isNode(obj):
+        if isinstance(obj, (types.ModuleType, type)):
+            return True
+        objType = type(obj)
+        if objType in deadEndTypes or isinstance(obj, (types.MethodType, types.FrameType)):
+            return False
+        return hasattr(obj, '__dict__')
+
+    def _offer(self, ownerRef, path, container):
+        # weighted reservoir sampling (Efraimidis and Spirakis): every
+        # container gets the key u ** (1 / weight), and the largest keys are
+        # kept, so that a bigger container is more likely to be sampled.
+        # The walk comes across the same containers over and over, so u is
+        # derived from the location of the container rather than drawn anew
+        # each time; otherwise every visit would be another chance to get in.
+        self.numOffered += 1
+        location = (id(ownerRef()), path)
+        if location in self._key2sample:
+            return
+        u = self._getUniform(location)
+        key = self._getKey(u, len(container))
+        reservoir = self._reservoir
+        if len(reservoir) >= self._sampleSize:
+            if key <= reservoir[0][0]:
+                return
+            oldKey, serial, old = heapq.heappop(reservoir)
+            del self._key2sample[old.key]
+        sample = _SampledContainer(ownerRef, path, self._getName(ownerRef(), path),
+                                   location, u, self._maxObservations)
+        self._key2sample[location] = sample
+        heapq.heappush(reservoir, (key, serialNum(), sample))
+
+    @staticmethod
+    def _getUniform(location):
+        # maps the location to a number in (0, 1)
+        return ((hash(location) & 0xffffffff) + .5) / float(1 << 32)
+
+    @staticmethod
+    def _getKey(u, length):
+        return u ** (1. / (length + 1))
+
+    @staticmethod
+    def _getName(owner, path):
+        if isinstance(owner, types.ModuleType):
+            name = owner.__name__
+        elif isinstance(owner, type):
+            name = '%s.%s' % (owner.__module__, owner.__qualname__)
+        else:
+            name = '<%s object at %s>' % (itype(owner).__name__, hex(id(owner)))
+        for kind, key in path:
+            if kind == 'a':
+                name += '.%s' % key
+            else:
+                name += '[%s]' % fastRepr(key)
+        return name
+
+    def checkContainers(self, now=None):
+        """Measures every sampled container, drops the ones that are gone,
+        and reports the ones that are growing.  Returns the list of
+        (container, name) that were reported."""
+        if now is None:
+            now = time.monotonic()
+        leaks = []
+        reservoir = []
+        for key, serial, sample in self._reservoir:
+            container = self._getContainer(sample)
+            if container is None:
+                del self._key2sample[sample.key]
+                continue
+            length = len(container)
+            sample.observations.append((now, length))
+            # the key goes up as the container grows
+            reservoir.append((self._getKey(sample.u, length), serial, sample))
+            if self._isLeaking(sample):
+                leaks.append((container, sample.name))
+            container = None
+
+        # the reservoir is modified in place, since it is a private object
+        heapq.heapify(reservoir)
+        self._reservoir[:] = reservoir
+
+        for container, name in leaks:
+            messenger.send(self.getLeakEvent(), [container, name])
+        return leaks
+
+    @staticmethod
+    def _getContainer(sample):
+        try:
+            return sample.getContainer()
+        except Exception:
+            return None
+
+    def _isLeaking(self, sample):
+        numObservations = len(sample.observations)
+        if numObservations < self._minObservations:
+            return False
+        fit = sample.getGrowthRate()
+        if fit is None:
+            return False
+        slope, stdErr = fit
+        margin = self._getTCritical(numObservations - 2) * stdErr
+        if slope - margin <= 0.:
+            return False
+        # the growth must be worth mentioning, and is not reported again
+        # until the container has doubled in size
+        curLen = sample.observations[-1][1]
+        firstLen = sample.observations[0][1]
+        if curLen - firstLen < numObservations:
+            return False
+        if sample.reportedLen is not None and curLen < sample.reportedLen * 2:
+            return False
+        sample.reportedLen = curLen
+        self.notify.warning(
+            '%s (%s) is growing at %.2f items/min (+/- %.2f, 95%% confidence), '
+            'length %s' % (sample.name, itype(self._getContainer(sample)).__name__,
+                           slope * 60., margin * 60., curLen))
+        return True
@@ -12,6 +12,7 @@ class DirectObject:
     """
     This is the class that all Direct/SAL classes should inherit from
     """
+
     #def __del__(self):
         # This next line is useful for debugging leaks
         #print "Destructing: ", self.__class__.__name__
@@ -0,0 +1,266 @@
+"""Contains the GarbageCollectScheduler class, which moves Python's full
+garbage collections into idle frame time.
+
+Python collects its youngest generations often, and cheaply.  A collection of
+the oldest generation, however, visits every tracked object in the process,
+and on a long-running client or server it can pause a frame for many
+milliseconds at an unpredictable moment.  The scheduler leaves the young
+generations to Python, but disables the automatic full collections and runs
+them itself at the end of a frame that has time to spare.  It measures every
+collection to predict how long the next full collection will take.
+
+The scheduler can also call gc.freeze() some time after startup, which moves
+every object that exists at that point, such as modules, classes and the DC
+file, out of reach of future collections.
+
+These are the Config.prc variables that control the scheduler:
+
+    gc-frame-budget 0.016667
+    gc-max-delay 10
+    gc-freeze-delay 30
+    gc-pause-report-interval 0
+
+The pause times are also sent to PStats, under "Garbage collection".
+"""
+
+__all__ = ['GarbageCollectScheduler']
+
+from panda3d.core import (
+    ClockObject,
+    ConfigVariableDouble,
+    PStatCollector,
+)
+from direct.directnotify.DirectNotifyGlobal import directNotify
+from direct.task import Task
+from direct.task.TaskManagerGlobal import taskMgr
+import bisect
+import gc
+import sys
+import time
+
+
+class GarbageCollectScheduler:
+    """Runs full garbage collections in idle frame time, and keeps
+    histograms of the time spent in every collection."""
+
+    notify = directNotify.newCategory("GarbageCollectScheduler")
+
+    #: The upper bounds of the buckets of the pause histograms, in seconds.
+    #: Longer pauses go in one more bucket at the end.
+    PauseBuckets = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                    0.01, 0.025, 0.05, 0.1, 0.25)
+
+    NumGenerations = 3
+
+    def __init__(self, frameBudget=None, maxDelay=None, freezeDelay=None,
+                 taskName='adaptiveGarbageCollect'):
+        # frameBudget is the time that a frame may take, in seconds; the
+        # rest of it is idle time in which a full collection may run.
+        # maxDelay is the longest time that a due full collection may be
+        # put off for lack of idle time.
+        # freezeDelay is the time after start() at which freeze() is
+        # called, or a negative number to not do so.
+        if frameBudget is None:
+            frameBudget = ConfigVariableDouble('gc-frame-budget', 1.0 / 60.0).value
+        if maxDelay is None:
+            maxDelay = ConfigVariableDouble('gc-max-delay', 10.0).value
+        if freezeDelay is None:
+            freezeDelay = ConfigVariableDouble('gc-freeze-delay', 30.0).value
+        self.frameBudget = frameBudget
+        self.maxDelay = maxDelay
+        self.freezeDelay = freezeDelay
+        self.reportInterval = ConfigVariableDouble('gc-pause-report-interval', 0.0).value
+        self.taskName = taskName
+
+        #: The predicted duration of the next full collection, in seconds,
+        #: or None if no full collection has been measured yet.
+        self.fullPauseEstimate = None
+
+        #: The number of full collections that ran in idle time, and that
+        #: ran late because there was no idle time.
+        self.numIdleCollections = 0
+        self.numForcedCollections = 0
+
+        self.resetPauseStats()
+
+        self._pstats = [PStatCollector('Garbage collection:Gen %s' % (gen))
+                        for gen in range(self.NumGenerations)]
+        self._collectStart = None
+        self._collectGeneration = None
+        self._dueSince = None
+        self._freezeTime = None
+        self._nextReportTime = None
+        self._frozenBlocks = 0
+        self._liveBlocksAfterFull = 0
+        self._origThreshold = gc.get_threshold()
+        self._task = None
+
+    def start(self):
+        """Installs the scheduler, and starts its task.  The task runs late
+        in the frame, to see how much of the frame budget is left."""
+        if self._task is not None:
+            return
+
+        self._origThreshold = gc.get_threshold()
+        threshold0, threshold1, threshold2 = self._origThreshold
+        # Python does not collect the oldest generation on its own anymore.
+        gc.set_threshold(threshold0, threshold1, 1 << 30)
+        gc.enable()
+        gc.callbacks.append(self._gcCallback)
+        self._liveBlocksAfterFull = self._getLiveBlocks()
+
+        now = ClockObject.getGlobalClock().getRealTime()
+        if self.freezeDelay >= 0:
+            self._freezeTime = now + self.freezeDelay
+        if self.reportInterval > 0:
+            self._nextReportTime = now + self.reportInterval
+        self._task = taskMgr.add(self._scheduleTask, self.taskName, 200)
+
+    def stop(self):
+        """Removes the scheduler, and gives the full collections back to
+        Python.  Objects frozen by freeze() are not unfrozen."""
+        if self._task is None:
+            return
+        taskMgr.remove(self._task)
+        self._task = None
+        gc.callbacks.remove(self._gcCallback)
+        gc.set_threshold(*self._origThreshold)
+
+    def isRunning(self):
+        return self._task is not None
+
+    def freeze(self):
+        """Collects all garbage, and then moves every object that is left
+        to the permanent generation, so that no future collection has to
+        visit it.  Call this once the application has finished starting
+        up; this is also done automatically after gc-freeze-delay seconds.
+        """
+        self._freezeTime = None
+        gc.collect()
+        gc.freeze()
+        self._frozenBlocks = sys.getallocatedblocks()
+        self._liveBlocksAfterFull = 0
+        # Full collections will be much quicker from now on.
+        self.fullPauseEstimate = None
+        self.notify.info('froze %s objects' % (gc.get_freeze_count()))
+
+    def isFullCollectDue(self):
+        """Returns true if Python would have run a full collection by now:
+        the oldest generation has reached its threshold, and the heap has
+        grown by a quarter since the last full collection."""
+        if gc.get_count()[2] < self._origThreshold[2]:
+            return False
+        liveBlocks = self._getLiveBlocks()
+        return liveBlocks - self._liveBlocksAfterFull > self._liveBlocksAfterFull // 4
+
+    def collectIfIdle(self, idleTime):
+        """Runs a full collection if one is due and is expected to fit in the
+        indicated idle time, or if it has been put off for longer than
+        maxDelay.  Returns true if a collection was run."""
+        if not self.isFullCollectDue():
+            self._dueSince = None
+            return False
+
+        now = time.perf_counter()
+        if self._dueSince is None:
+            self._dueSince = now
+
+        estimate = self.fullPauseEstimate or 0.0
+        if estimate <= idleTime:
+            self.numIdleCollections += 1
+        elif now - self._dueSince >= self.maxDelay:
+            self.notify.debug('forcing full collection, due for %.1f s' % (
+                now - self._dueSince))
+            self.numForcedCollections += 1
+        else:
+            return False
+
+        gc.collect(2)
+        self._dueSince = None
+        self._liveBlocksAfterFull = self._getLiveBlocks()
+        return True
+
+    def resetPauseStats(self):
+        self._pauseCounts = [[0] * (len(self.PauseBuckets) + 1)
+                             for gen in range(self.NumGenerations)]
+        self._pauseTotals = [0.0] * self.NumGenerations
+        self._pauseMaxes = [0.0] * self.NumGenerations
+
+    def getPauseHistogram(self, generation):
+        """Returns the number of collections of the indicated generation in
+        each bucket of PauseBuckets, plus the number of longer ones."""
+        return list(self._pauseCounts[generation])
+
+    def getNumCollections(self, generation):
+        return sum(self._pauseCounts[generation])
+
+    def getTotalPause(self, generation):
+        return self._pauseTotals[generation]
+
+    def getMaxPause(self, generation):
+        return self._pauseMaxes[generation]
+
+    def recordPause(self, generation, pause):
+        """Adds a collection of the indicated generation that took the
+        indicated number of seconds to the pause statistics."""
+        self._pauseCounts[generation][bisect.bisect_left(self.PauseBuckets, pause)] += 1
+        self._pauseTotals[generation] += pause
+        if pause > self._pauseMaxes[generation]:
+            self._pauseMaxes[generation] = pause
+
+        if generation == self.NumGenerations - 1:
+            # Weigh the latest full collection heavily; the heap changes.
+            if self.fullPauseEstimate is None:
+                self.fullPauseEstimate = pause
+            else:
+                self.fullPauseEstimate += (pause - self.fullPauseEstimate) * 0.5
+
+    def reportPauses(self):
+        """Writes the pause histograms to the log."""
+        labels = ['<%gms' % (bound * 1000.0) for bound in self.PauseBuckets]
+        labels.append('more')
+        lines = ['garbage collection pauses:']
+        for gen in range(self.NumGenerations):
+            numCollections = self.getNumCollections(gen)
+            if numCollections == 0:
+                continue
+            lines.append('  gen %s: %s collections, %.1f ms total, %.2f ms max' % (
+                gen, numCollections, self._pauseTotals[gen] * 1000.0,
+                self._pauseMaxes[gen] * 1000.0))
+            lines.append('    ' + ' '.join(
+                '%s:%s' % (label, count)
+                for label, count in zip(labels, self._pauseCounts[gen])
+                if count))
+        self.notify.info('\n'.join(lines))
+
+    def _getLiveBlocks(self):
+        return max(sys.getallocatedblocks() - self._frozenBlocks, 0)
+
+    def _scheduleTask(self, task):
+        clock = ClockObject.getGlobalClock()
+        now = clock.getRealTime()
+        if self._freezeTime is not None and now >= self._freezeTime:
+            self.freeze()
+
+        idleTime = self.frameBudget - (now - clock.getFrameTime())
+        self.collectIfIdle(idleTime)
+
+        if self._nextReportTime is not None and now >= self._nextReportTime:
+            self._nextReportTime = now + self.reportInterval
+            self.reportPauses()
+        return Task.cont
+
+    def _gcCallback(self, phase, info):
+        generation = info['generation']
+        if phase == 'start':
+            self._collectStart = time.perf_counter()
+            self._collectGeneration = generation
+            self._pstats[generation].start()
+            return
+
+        if self._collectStart is None or generation != self._collectGeneration:
+            return
+        pause = time.perf_counter() - self._collectStart
+        self._collectStart = None
+        self._pstats[generation].stop()
+        self.recordPause(generation, pause)
@@ -3,12 +3,14 @@
 __all__ = ['FakeObject', '_createGarbage', 'GarbageReport', 'GarbageLogger']
 
 from direct.directnotify.DirectNotifyGlobal import directNotify
-from direct.showbase.PythonUtil import ScratchPad, Stack, AlphabetCounter
+from direct.showbase.PythonUtil import ScratchPad, AlphabetCounter
 from direct.showbase.PythonUtil import itype, deeptype, fastRepr
 from direct.showbase.Job import Job
 from direct.showbase.JobManagerGlobal import jobMgr
 from direct.showbase.MessengerGlobal import messenger
 from panda3d.core import ConfigVariableBool
+from array import array
+from collections import deque
 import gc
 
 GarbageCycleCountAnnounceEvent = 'announceGarbageCycleDesc2num'
@@ -38,6 +40,8 @@ def _createGarbage(num=1):
 class GarbageReport(Job):
     """Detects leaked Python objects (via gc.collect()) and reports on garbage
     items, garbage-to-garbage references, and garbage cycles.
+    Each group of garbage items that all refer to each other, directly or
+    not, is reported as one cycle: the shortest one through its first item.
     If you just want to dump the report to the log, use GarbageLogger."""
     notify = directNotify.newCategory("GarbageReport")
 
@@ -140,7 +144,6 @@ class GarbageReport(Job):
 
         self.cycles = []
         self.cyclesBySyntax = []
-        self.uniqueCycleSets = set()
         self.cycleIds = set()
 
         # make the id->index table to speed up the next steps
@@ -149,29 +152,19 @@ class GarbageReport(Job):
             if i % 20 == 0:
                 yield None
 
-        # grab the referrers (pointing to garbage)
+        # build the graph of references between garbage items in one pass
+        if self._args.verbose and self.numGarbage > 0:
+            self.notify.info('getting referents...')
+        for result in self._buildGraph():
+            yield None
+
+        # grab the referrers (pointing to garbage). Nothing outside of the
+        # garbage can refer to a garbage item, so they come from the graph.
         if self._args.fullReport and (self.numGarbage != 0):
             if self._args.verbose:
                 self.notify.info('getting referrers...')
-            for i in range(self.numGarbage):
+            for result in self._getReferrers():
                 yield None
-                for result in self._getReferrers(self.garbage[i]):
-                    yield None
-                byNum, byRef = result
-                self.referrersByNumber[i] = byNum
-                self.referrersByReference[i] = byRef
-
-        # grab the referents (pointed to by garbage)
-        if self.numGarbage > 0:
-            if self._args.verbose:
-                self.notify.info('getting referents...')
-            for i in range(self.numGarbage):
-                yield None
-                for result in self._getReferents(self.garbage[i]):
-                    yield None
-                byNum, byRef = result
-                self.referentsByNumber[i] = byNum
-                self.referentsByReference[i] = byRef
 
         for i in range(self.numGarbage):
             if hasattr(self.garbage[i], '_garbageInfo') and callable(self.garbage[i]._garbageInfo):
@@ -189,10 +182,19 @@ class GarbageReport(Job):
         if self._args.findCycles and self.numGarbage > 0:
             if self._args.verbose:
                 self.notify.info('calculating cycles...')
-            for i in range(self.numGarbage):
+            for components in self._getStronglyConnectedComponents():
                 yield None
-                for newCycles in self._getCycles(i, self.uniqueCycleSets):
-                    yield None
+            for component in components:
+                yield None
+                # cycles with no instances that define __del__ will be
+                # cleaned up by Python
+                if self._args.delOnly:
+                    for i in component:
+                        if id(self.garbage[i]) in self.garbageInstanceIds:
+                            break
+                    else:
+                        continue
+                newCycles = [self._getComponentCycle(component)]
                 self.cycles.extend(newCycles)
                 # create a representation of the cycle in human-readable form
                 newCyclesBySyntax = []
@@ -276,9 +278,7 @@ class GarbageReport(Job):
                 self.cyclesBySyntax.extend(newCyclesBySyntax)
                 # if we're not doing a full report, add this cycle's IDs to the master set
                 if not self._args.fullReport:
-                    for cycle in newCycles:
-                        yield None
-                        self.cycleIds.update(set(cycle))
+                    self.cycleIds.update(component)
 
         self.numCycles = len(self.cycles)
 
@@ -412,6 +412,9 @@ class GarbageReport(Job):
         del self.referentsByNumber
         if hasattr(self, 'cycles'):
             del self.cycles
+        if hasattr(self, '_refOffsets'):
+            del self._refOffsets
+            del self._refTargets
         del self._report
         if hasattr(self, '_reportStr'):
             del self._reportStr
@@ -439,112 +442,140 @@ class GarbageReport(Job):
                 self._reportStr += '\n' + str
         return self._reportStr
 
-    def _getReferrers(self, obj):
-        # referrers (pointing to garbage)
-        # returns two lists, first by index into gc.garbage, second by
-        # direct reference
-        yield None
-        byRef = gc.get_referrers(obj)
-        yield None
-        # look to see if each referrer is another garbage item
-        byNum = []
-        for i in range(len(byRef)):
+    def _buildGraph(self):
+        # stores the references between garbage items as compressed sparse
+        # rows: the garbage items that item i refers to are
+        # self._refTargets[self._refOffsets[i]:self._refOffsets[i+1]]
+        # this takes one pass over the garbage, and a few bytes per reference
+        id2index = self._id2index
+        fullReport = self._args.fullReport
+        offsets = array('l', [0])
+        targets = array('l')
+        for i in range(self.numGarbage):
             if i % 20 == 0:
                 yield None
-            referrer = byRef[i]
-            num = self._id2index.get(id(referrer), None)
-            byNum.append(num)
-        yield byNum, byRef
-
-    def _getReferents(self, obj):
-        # referents (pointed to by garbage)
-        # returns two lists, first by index into gc.garbage, second by
-        # direct reference
-        yield None
-        byRef = gc.get_referents(obj)
+            byRef = gc.get_referents(self.garbage[i])
+            byNum = [id2index.get(id(referent)) for referent in byRef]
+            targets.extend([num for num in byNum if num is not None])
+            offsets.append(len(targets))
+            if fullReport:
+                self.referentsByNumber[i] = byNum
+                self.referentsByReference[i] = byRef
+        self._refOffsets = offsets
+        self._refTargets = targets
         yield None
-        # look to see if each referent is another garbage item
-        byNum = []
-        for i in range(len(byRef)):
+
+    def _getReferrers(self):
+        # fills in the referrers of every garbage item, both by index into
+        # gc.garbage and by direct reference
+        offsets = self._refOffsets
+        targets = self._refTargets
+        referrersByNumber = self.referrersByNumber
+        for i in range(self.numGarbage):
+            referrersByNumber[i] = []
+        for i in range(self.numGarbage):
             if i % 20 == 0:
                 yield None
-            referent = byRef[i]
-            num = self._id2index.get(id(referent), None)
-            byNum.append(num)
-        yield byNum, byRef
-
-    def _getNormalizedCycle(self, cycle):
-        # returns a representation of a cycle (list of indices) that will be
-        # reliably derived from a unique cycle regardless of ordering
-        # this lets us detect duplicate cycles that appear different because of
-        # which element appears first
-        if len(cycle) == 0:
-            return cycle
-        min = 1<<30
-        minIndex = None
-        for i in range(len(cycle)):
-            elem = cycle[i]
-            if elem < min:
-                min = elem
-                minIndex = i
-        return cycle[minIndex:] + cycle[:minIndex]
-
-    def _getCycles(self, index, uniqueCycleSets=None):
-        # detect garbage cycles for a particular item of garbage
-        assert self.notify.debugCall()
-        # returns list of lists, sublists are garbage reference cycles
-        cycles = []
-        # this lets us eliminate duplicate cycles
-        if uniqueCycleSets is None:
-            uniqueCycleSets = set()
-        stateStack = Stack()
-        rootId = index
-        # check if the root object is one of the garbage instances (has __del__)
-        objId = id(self.garbage[rootId])
-        numDelInstances = int(objId in self.garbageInstanceIds)
-        stateStack.push(([rootId], rootId, numDelInstances, 0))
-        while True:
-            yield None
-            if len(stateStack) == 0:
-                break
-            candidateCycle, curId, numDelInstances, resumeIndex = stateStack.pop()
-            if self.notify.getDebug():
-                if self._args.delOnly:
-                    print('restart: %s root=%s cur=%s numDelInstances=%s resume=%s' % (
-                        candidateCycle, rootId, curId, numDelInstances, resumeIndex))
-                else:
-                    print('restart: %s root=%s cur=%s resume=%s' % (
-                        candidateCycle, rootId, curId, resumeIndex))
-            for index in range(resumeIndex, len(self.referentsByNumber[curId])):
+            for edge in range(offsets[i], offsets[i + 1]):
+                referrersByNumber[targets[edge]].append(i)
+        for i in range(self.numGarbage):
+            if i % 20 == 0:
                 yield None
-                refId = self.referentsByNumber[curId][index]
-                if self.notify.getDebug():
-                    print('       : %s -> %s' % (curId, refId))
-                if refId == rootId:
-                    # we found a cycle! mark it down and move on to the next refId
-                    normCandidateCycle = self._getNormalizedCycle(candidateCycle)
-                    normCandidateCycleTuple = tuple(normCandidateCycle)
-                    if not normCandidateCycleTuple in uniqueCycleSets:
-                        # cycles with no instances that define __del__ will be
-                        # cleaned up by Python
-                        if (not self._args.delOnly) or numDelInstances >= 1:
-                            if self.notify.getDebug():
-                                print('  FOUND: ', normCandidateCycle + [normCandidateCycle[0],])
-                            cycles.append(normCandidateCycle + [normCandidateCycle[0],])
-                            uniqueCycleSets.add(normCandidateCycleTuple)
-                elif refId in candidateCycle:
-                    pass
-                elif refId is not None:
-                    # check if this object is one of the garbage instances (has __del__)
-                    objId = id(self.garbage[refId])
-                    numDelInstances += int(objId in self.garbageInstanceIds)
-                    # this refId does not complete a cycle. Mark down
-                    # where we are in this list of referents, then
-                    # start looking through the referents of the new refId
-                    stateStack.push((list(candidateCycle), curId, numDelInstances, index+1))
-                    stateStack.push((list(candidateCycle) + [refId], refId, numDelInstances, 0))
-                    break
-        yield cycles
+            self.referrersByReference[i] = [self.garbage[num] for num in referrersByNumber[i]]
+        yield None
+
+    def _getStronglyConnectedComponents(self):
+        # finds the sets of garbage items that are all reachable from each
+        # other, with Tarjan's algorithm. Every reference is followed once,
+        # so this takes linear time. Yields a list of the components that
+        # contain a cycle, each a sorted list of garbage item indices.
+        offsets = self._refOffsets
+        targets = self._refTargets
+        numGarbage = self.numGarbage
+        indices = array('l', [-1]) * numGarbage
+        lowLinks = array('l', [0]) * numGarbage
+        onStack = bytearray(numGarbage)
+        stack = []
+        components = []
+        nextIndex = 0
+        numSteps = 0
+        for root in range(numGarbage):
+            if indices[root] != -1:
+                continue
+            indices[root] = lowLinks[root] = nextIndex
+            nextIndex += 1
+            stack.append(root)
+            onStack[root] = 1
+            # the recursion is kept on a list of (item, next edge to follow)
+            callStack = [(root, offsets[root])]
+            while callStack:
+                numSteps += 1
+                if numSteps % 100 == 0:
+                    yield None
+                node, edge = callStack[-1]
+                end = offsets[node + 1]
+                while edge < end:
+                    target = targets[edge]
+                    edge += 1
+                    if indices[target] == -1:
+                        # descend into the target, and come back to the
+                        # next edge afterwards
+                        callStack[-1] = (node, edge)
+                        indices[target] = lowLinks[target] = nextIndex
+                        nextIndex += 1
+                        stack.append(target)
+                        onStack[target] = 1
+                        callStack.append((target, offsets[target]))
+                        break
+                    elif onStack[target] and indices[target] < lowLinks[node]:
+                        lowLinks[node] = indices[target]
+                else:
+                    # all of the references of this item have been followed
+                    callStack.pop()
+                    if callStack:
+                        parent = callStack[-1][0]
+                        if lowLinks[node] < lowLinks[parent]:
+                            lowLinks[parent] = lowLinks[node]
+                    if lowLinks[node] == indices[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            onStack[member] = 0
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in targets[offsets[node]:offsets[node + 1]]:
+                            component.sort()
+                            components.append(component)
+        components.sort()
+        yield components
+
+    def _getComponentCycle(self, component):
+        # returns the shortest cycle through the first item of a strongly
+        # connected component, as a list of indices that starts and ends with
+        # that item
+        offsets = self._refOffsets
+        targets = self._refTargets
+        members = set(component)
+        start = component[0]
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if target == start:
+                    cycle = [start]
+                    while node is not None:
+                        cycle.append(node)
+                        node = parents[node]
+                    cycle.reverse()
+                    return cycle
+                if target in members and target not in parents:
+                    parents[target] = node
+                    queue.append(target)
+        # not reached, every member of a component is on a cycle
+        return [start, start]
 
 
 class GarbageLogger(GarbageReport):
@@ -1097,7 +1097,7 @@ class Loader(DirectObject):
                            gotList, callback, origModelList, extraArgs):
         """ The asynchronous flatten operation has completed; quietly
         drop in the new models. """
-        self.notify.debug("asyncFlattenDone: %s" % (models,))
+        self.notify.debug("asyncFlattenDone: %s", models)
         assert len(models) == len(origModelList)
         for i, model in enumerate(models):
             origModelList[i].getChildren().detach()
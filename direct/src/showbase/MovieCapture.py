@@ -0,0 +1,190 @@
+"""Contains the MovieCapture class, which `.ShowBase.movie()` uses to capture
+the frames of a movie without stalling the render loop.
+
+Every frame is read back from the graphics card asynchronously, and is then
+encoded and written to disk by a pool of worker threads, so that capturing a
+long sequence is no longer limited by how fast one core can compress images.
+The number of frames that are waiting to be encoded is bounded, so that the
+capture does not use up all memory if the disk cannot keep up; the render loop
+waits for the workers instead.
+
+The following Config.prc variables control the capture:
+
+    movie-async-capture true
+    movie-capture-threads 0
+    movie-capture-max-frames 16
+
+Setting movie-capture-threads to 0 uses one thread per CPU core.
+"""
+
+__all__ = ['MovieCapture']
+
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableInt,
+    Filename,
+)
+from direct.directnotify.DirectNotifyGlobal import directNotify
+from direct.showbase.MessengerGlobal import messenger
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import os
+import time
+
+
+movie_async_capture = ConfigVariableBool('movie-async-capture', True, "If true, ShowBase.movie() captures frames from a window or buffer asynchronously, and encodes them in a pool of threads.")
+movie_capture_threads = ConfigVariableInt('movie-capture-threads', 0, "The number of threads that encode the frames captured by ShowBase.movie(), or 0 for one per CPU core.")
+movie_capture_max_frames = ConfigVariableInt('movie-capture-max-frames', 16, "The largest number of frames captured by ShowBase.movie() that may wait to be encoded before the render loop waits for the encoder.")
+
+
+class MovieCapture:
+    """
+    Captures frames from a GraphicsOutput, and writes them either to
+    individual image files or to a single file containing a stream of raw
+    images.
+
+    The single file is a sequence of binary PPM images, which most video
+    tools can read directly; for instance, to encode it with ffmpeg::
+
+        ffmpeg -framerate 30 -f ppm_pipe -i movie.ppm movie.mp4
+
+    Call captureFrame() once per frame, and poll() once per frame until it
+    returns true, which it does when all captured frames have been written.
+    """
+    notify = directNotify.newCategory('MovieCapture')
+
+    def __init__(self, source, numThreads=None, maxFrames=None,
+                 containerFilename=None):
+        if numThreads is None:
+            numThreads = movie_capture_threads.value
+        if numThreads <= 0:
+            numThreads = os.cpu_count() or 1
+        if maxFrames is None:
+            maxFrames = movie_capture_max_frames.value
+
+        self.source = source
+        self.maxFrames = max(maxFrames, 1)
+        self.numFramesCaptured = 0
+        self.numFramesWritten = 0
+
+        #: The number of frames written per second of wall-clock time,
+        #: available once finish() has been called.
+        self.fps = None
+
+        self.__pool = ThreadPoolExecutor(numThreads, 'MovieCapture')
+        self.__readbacks = deque()
+        self.__encodes = deque()
+        self.__startTime = None
+
+        self.__container = None
+        self.__writer = None
+        if containerFilename is not None:
+            filename = Filename(containerFilename)
+            filename.makeDir()
+            self.__container = open(filename.toOsSpecific(), 'wb')
+            # A single thread writes the frames, so that they end up in the
+            # file in order.
+            self.__writer = ThreadPoolExecutor(1, 'MovieCaptureWriter')
+
+    def captureFrame(self, filename=None):
+        """
+        Requests the frame that was last rendered to the source, to be written
+        to the indicated image file, or to the container file.
+        """
+        if self.__startTime is None:
+            self.__startTime = time.perf_counter()
+
+        request = self.source.getAsyncScreenshot()
+        self.__readbacks.append((request, filename))
+        self.numFramesCaptured += 1
+
+    def poll(self):
+        """
+        Hands the frames that have been read back to the workers, and returns
+        true once all captured frames have been written.
+        """
+        readbacks = self.__readbacks
+        while readbacks and readbacks[0][0].done():
+            request, filename = readbacks.popleft()
+            if request.cancelled():
+                self.notify.warning("Could not capture frame %s" % (
+                    filename or self.numFramesWritten))
+            else:
+                self.__encode(request.result(), filename)
+
+        encodes = self.__encodes
+        while encodes and encodes[0][0].done():
+            self.__finishEncode()
+
+        return not readbacks and not encodes
+
+    def finish(self):
+        """
+        Shuts down the workers, and closes the container file.  Frames that
+        have been captured but not yet read back are dropped.
+        """
+        while self.__encodes:
+            self.__finishEncode()
+        self.__readbacks.clear()
+
+        self.__pool.shutdown()
+        if self.__writer is not None:
+            self.__writer.shutdown()
+            self.__writer = None
+        if self.__container is not None:
+            self.__container.close()
+            self.__container = None
+
+        if self.__startTime is not None and self.numFramesWritten:
+            elapsed = time.perf_counter() - self.__startTime
+            self.fps = self.numFramesWritten / max(elapsed, 1e-6)
+            self.notify.info("Wrote %s frames in %.2f s (%.1f fps)" % (
+                self.numFramesWritten, elapsed, self.fps))
+
+    def __encode(self, tex, filename):
+        encodes = self.__encodes
+        while len(encodes) >= self.maxFrames:
+            # The workers are falling behind; wait for the oldest frame.
+            self.__finishEncode()
+
+        if self.__container is None:
+            future = self.__pool.submit(self.__writeImage, tex, filename)
+        else:
+            data = self.__pool.submit(self.__makePPM, tex)
+            future = self.__writer.submit(self.__writeContainer, data)
+        encodes.append((future, filename))
+
+    def __finishEncode(self):
+        future, filename = self.__encodes.popleft()
+        try:
+            saved = future.result()
+        except Exception as ex:
+            self.notify.warning("Could not write frame %s: %s" % (
+                filename or self.numFramesWritten, ex))
+            return
+
+        if saved:
+            self.numFramesWritten += 1
+            if filename is not None:
+                # Announce to anybody that a screenshot has been taken
+                messenger.send('screenshot', [filename])
+
+    @staticmethod
+    def __writeImage(tex, filename):
+        # Texture.write() releases the GIL, so that this may run in parallel.
+        return tex.write(filename)
+
+    @staticmethod
+    def __makePPM(tex):
+        xSize = tex.getXSize()
+        ySize = tex.getYSize()
+        data = memoryview(tex.getRamImageAs('RGB'))
+
+        # Panda stores the rows from the bottom up.
+        rowSize = xSize * 3
+        rows = [data[y * rowSize:(y + 1) * rowSize] for y in range(ySize - 1, -1, -1)]
+        return b'P6\n%d %d\n255\n' % (xSize, ySize) + b''.join(rows)
+
+    def __writeContainer(self, data):
+        self.__container.write(data.result())
+        return True
@@ -10,9 +10,6 @@ from panda3d.core import (
     Vec4,
 )
 
-from direct.gui import OnscreenText
-from direct.directtools import DirectUtil
-
 
 class OnScreenDebug:
 
@@ -28,6 +25,11 @@ class OnScreenDebug:
         if self.onScreenText:
             return
 
+        # These are imported here, so that a ShowBase without a window does
+        # not need to import the GUI modules.
+        from direct.gui import OnscreenText
+        from direct.directtools import DirectUtil
+
         fontPath = ConfigVariableString("on-screen-debug-font", "cmtt12").value
         fontScale = ConfigVariableDouble("on-screen-debug-font-scale", 0.05).value
 
@@ -114,7 +114,7 @@ from panda3d.core import (
     WindowProperties,
     getModelPath,
 )
-from panda3d.direct import throw_new_frame, init_app_for_gui
+from panda3d.direct import throw_new_frame, init_app_for_gui, CIntervalManager
 from panda3d.direct import storeAccessibilityShortcutKeys, allowAccessibilityShortcutKeys
 from . import DConfig
 
@@ -137,8 +137,6 @@ from .JobManagerGlobal import jobMgr
 from .EventManagerGlobal import eventMgr
 from .PythonUtil import Stack
 #from PythonUtil import *
-from direct.interval import IntervalManager
-from direct.showbase.BufferViewer import BufferViewer
 from direct.task import Task
 from . import Loader
 import time
@@ -146,8 +144,7 @@ import atexit
 import importlib
 from direct.showbase import ExceptionVarDump
 from . import DirectObject
-from . import SfxPlayer
-from typing import Callable, ClassVar, Literal, NoReturn
+from typing import TYPE_CHECKING, Callable, ClassVar, Literal, NoReturn
 if __debug__:
     from direct.showbase import GarbageReport
     from direct.directutil import DeltaProfiler
@@ -177,7 +174,8 @@ class ShowBase(DirectObject.DirectObject):
     aspect2d: NodePath
     pixel2d: NodePath
 
-    def __init__(self, fStartDirect: bool = True, windowType: str | None = None) -> None:
+    def __init__(self, fStartDirect: bool = True, windowType: str | None = None,
+                 headless: bool | None = None) -> None:
         """Opens a window, sets up a 3-D and several 2-D scene graphs, and
         everything else needed to render the scene graph to the window.
 
@@ -186,6 +184,13 @@ class ShowBase(DirectObject.DirectObject):
         specified, the default value is taken from the 'window-type'
         configuration variable.
 
+        Set headless to True (or the 'headless-showbase' configuration
+        variable) for a lean ShowBase without a window, as used by AI and UD
+        servers.  This does not set up the 2-D scene graphs, the data graph,
+        the input devices, the audio managers, the buffer viewer or the screen
+        transitions, and does not import the modules they need; each of these
+        is set up instead the first time it is accessed.
+
         This constructor will add various things to the Python builtins scope,
         including this instance itself (under the name ``base``).
         """
@@ -229,6 +234,20 @@ class ShowBase(DirectObject.DirectObject):
         self.printEnvDebugInfo()
         vfs = VirtualFileSystem.getGlobalPtr()
 
+        #: Set if this is a headless ShowBase; see the constructor.
+        if headless is None:
+            headless = ConfigVariableBool('headless-showbase', False).value
+        self.headless = headless
+        if headless:
+            if windowType not in (None, 'none'):
+                raise ValueError("A headless ShowBase cannot open a window")
+            windowType = 'none'
+
+        self.__ivalMgr = None
+        if not headless:
+            from direct.interval.IntervalManager import ivalMgr
+            self.__ivalMgr = ivalMgr
+
         self.nextWindowIndex = 1
         self.__directStarted = False
         self.__deadInputs = 0
@@ -237,7 +256,7 @@ class ShowBase(DirectObject.DirectObject):
         self.sfxActive = ConfigVariableBool('audio-sfx-active', True).value
         self.musicActive = ConfigVariableBool('audio-music-active', True).value
         self.wantFog = ConfigVariableBool('want-fog', True).value
-        self.wantRender2dp = ConfigVariableBool('want-render2dp', True).value
+        self.wantRender2dp = ConfigVariableBool('want-render2dp', True).value and not headless
 
         self.screenshotExtension = ConfigVariableString('screenshot-extension', 'jpg').value
         self.musicManager: AudioManager | None = None
@@ -367,8 +386,9 @@ class ShowBase(DirectObject.DirectObject):
         self.graphicsEngine = GraphicsEngine.getGlobalPtr()
         self.graphics_engine = self.graphicsEngine
         self.setupRender()
-        self.setupRender2d()
-        self.setupDataGraph()
+        if not headless:
+            self.setupRender2d()
+            self.setupDataGraph()
 
         if self.wantRender2dp:
             self.setupRender2dp()
@@ -465,7 +485,8 @@ class ShowBase(DirectObject.DirectObject):
 
         #: This is the global :class:`~panda3d.core.InputDeviceManager`, which
         #: keeps track of connected input devices.
-        self.devices = InputDeviceManager.getGlobalPtr()
+        if not headless:
+            self.devices = InputDeviceManager.getGlobalPtr()
         self.__inputDeviceNodes: dict[InputDevice, NodePath] = {}
 
         self.createStats()
@@ -520,9 +541,10 @@ class ShowBase(DirectObject.DirectObject):
         # DO NOT ADD TO THIS LIST.  We're trying to phase out the use of
         # built-in variables by ShowBase.  Use a Global module if necessary.
         builtins.base = self
-        builtins.render2d = self.render2d
-        builtins.aspect2d = self.aspect2d
-        builtins.pixel2d = self.pixel2d
+        if not headless:
+            builtins.render2d = self.render2d
+            builtins.aspect2d = self.aspect2d
+            builtins.pixel2d = self.pixel2d
         builtins.render = self.render
         builtins.hidden = self.hidden
         builtins.camera = self.camera
@@ -562,7 +584,8 @@ class ShowBase(DirectObject.DirectObject):
         else:
             ShowBase.notify.info('__dev__ == %s' % self.__dev__)
 
-        self.createBaseAudioManagers()
+        if not headless:
+            self.createBaseAudioManagers()
 
         if self.__dev__ and ConfigVariableBool('track-gui-items', False):
             # dict of guiId to gui item, for tracking down leaks
@@ -585,11 +608,9 @@ class ShowBase(DirectObject.DirectObject):
         self.__prevWindowProperties: WindowProperties | None = None
         self.__directObject.accept('window-event', self.windowEvent)
 
-        # Transition effects (fade, iris, etc)
-        from . import Transitions
-
-        #: `.Transitions.Transitions` object.
-        self.transitions = Transitions.Transitions(self.loader)
+        if not headless:
+            # Transition effects (fade, iris, etc)
+            self.__setupTransitions()
 
         if self.win:
             # Setup the window controls - handy for multiwindow applications
@@ -606,8 +627,8 @@ class ShowBase(DirectObject.DirectObject):
         # to zero in the out of focus windows
         self.multiClientSleep = ConfigVariableBool('multi-sleep', False)
 
-        #: Utility for viewing offscreen buffers, see :mod:`.BufferViewer`.
-        self.bufferViewer = BufferViewer(self.win, self.render2dp if self.wantRender2dp else self.render2d)
+        if not headless:
+            self.__setupBufferViewer()
 
         if self.windowType != 'none':
             if fStartDirect: # [gjeon] if this is False let them start direct manually
@@ -622,6 +643,60 @@ class ShowBase(DirectObject.DirectObject):
         # Start IGLOOP
         self.restart()
 
+    #: The subsystems that a headless ShowBase sets up on first use, by the
+    #: name of an attribute that they set.
+    __deferredSetups: ClassVar[dict[str, str]] = {
+        'devices': '_ShowBase__setupDevices',
+        'dataRoot': 'setupDataGraph',
+        'dataRootNode': 'setupDataGraph',
+        'sfxPlayer': 'createBaseAudioManagers',
+        'transitions': '_ShowBase__setupTransitions',
+        'bufferViewer': '_ShowBase__setupBufferViewer',
+        'render2d': 'setupRender2d',
+        'aspect2d': 'setupRender2d',
+        'pixel2d': 'setupRender2d',
+        'a2dBackground': 'setupRender2d',
+        'a2dTop': 'setupRender2d',
+        'a2dBottom': 'setupRender2d',
+        'a2dLeft': 'setupRender2d',
+        'a2dRight': 'setupRender2d',
+    }
+    for _name in ('TopCenter', 'BottomCenter', 'LeftCenter', 'RightCenter',
+                  'TopLeft', 'TopRight', 'BottomLeft', 'BottomRight'):
+        __deferredSetups['a2d' + _name] = 'setupRender2d'
+        __deferredSetups['a2d' + _name + 'Ns'] = 'setupRender2d'
+    del _name
+
+    # Hidden from type checkers, which would otherwise accept any attribute
+    # name on a ShowBase.
+    if not TYPE_CHECKING:
+        def __getattr__(self, name: str) -> Any:
+            # Only called for attributes that have not been set.  A headless
+            # ShowBase sets up the subsystem that the attribute belongs to.
+            setup = ShowBase.__deferredSetups.get(name)
+            if setup is None or not self.__dict__.get('headless'):
+                raise AttributeError("'%s' object has no attribute '%s'" % (
+                    type(self).__name__, name))
+
+            self.notify.info("Setting up %s on first use" % (name))
+            getattr(self, setup)()
+            return self.__dict__[name]
+
+    def __setupDevices(self) -> None:
+        self.devices = InputDeviceManager.getGlobalPtr()
+
+    def __setupTransitions(self) -> None:
+        from . import Transitions
+
+        #: `.Transitions.Transitions` object.
+        self.transitions = Transitions.Transitions(self.loader)
+
+    def __setupBufferViewer(self) -> None:
+        from .BufferViewer import BufferViewer
+
+        #: Utility for viewing offscreen buffers, see :mod:`.BufferViewer`.
+        self.bufferViewer = BufferViewer(self.win, self.render2dp if self.wantRender2dp else self.render2d)
+
     # add a collision traverser via pushCTrav and remove it via popCTrav
     # that way the owner of the new cTrav doesn't need to hold onto the
     # previous one in order to put it back
@@ -697,9 +772,10 @@ class ShowBase(DirectObject.DirectObject):
             if ShowBaseGlobal:
                 del ShowBaseGlobal.base
 
-        self.aspect2d.node().removeAllChildren()
-        self.render2d.node().removeAllChildren()
-        self.aspect2d.reparent_to(self.render2d)
+        if 'render2d' in self.__dict__:
+            self.aspect2d.node().removeAllChildren()
+            self.render2d.node().removeAllChildren()
+            self.aspect2d.reparent_to(self.render2d)
 
         # [gjeon] restore sticky key settings
         if self.__disabledStickyKeys:
@@ -2055,8 +2131,10 @@ class ShowBase(DirectObject.DirectObject):
     def createBaseAudioManagers(self):
         """
         Creates the default SFX and music manager.  Called automatically from
-        the ShowBase constructor.
+        the ShowBase constructor, or by a headless ShowBase when `sfxPlayer` is
+        first accessed.
         """
+        from . import SfxPlayer
         self.sfxPlayer = SfxPlayer.SfxPlayer()
         sfxManager = AudioManager.createAudioManager()
         self.addSfxManager(sfxManager)
@@ -2069,6 +2147,9 @@ class ShowBase(DirectObject.DirectObject):
             self.musicManager.setConcurrentSoundLimit(1)
             self.musicManager.setActive(self.musicActive)
 
+        if self.headless and not self.taskMgr.hasTaskNamed('audioLoop'):
+            self.taskMgr.add(self.__audioLoop, 'audioLoop', sort = 60)
+
     # enableMusic/enableSoundEffects are meant to be called in response
     # to a user request so sfxActive/musicActive represent how things
     # *should* be, regardless of App/OS/HW state
@@ -2199,7 +2280,15 @@ class ShowBase(DirectObject.DirectObject):
 
     def __ivalLoop(self, state):
         # Execute all intervals in the global ivalMgr.
-        IntervalManager.ivalMgr.step()
+        ivalMgr = self.__ivalMgr
+        if ivalMgr is None:
+            # A headless ShowBase does not import the interval manager
+            # until the first interval is started.
+            if not CIntervalManager.getGlobalPtr().getNumIntervals():
+                return Task.cont
+            from direct.interval.IntervalManager import ivalMgr
+            self.__ivalMgr = ivalMgr
+        ivalMgr.step()
         return Task.cont
 
     def initShadowTrav(self):
@@ -2337,8 +2426,10 @@ class ShowBase(DirectObject.DirectObject):
         self.taskMgr.add(
             self.__resetPrevTransform, 'resetPrevTransform', sort = -51)
         # give the dataLoop task a reasonably "early" sort,
-        # so that it will get run before most tasks
-        self.taskMgr.add(self.__dataLoop, 'dataLoop', sort = -50)
+        # so that it will get run before most tasks.  A headless
+        # ShowBase has no inputs to read.
+        if not self.headless:
+            self.taskMgr.add(self.__dataLoop, 'dataLoop', sort = -50)
         self.__deadInputs = 0
         # spawn the ivalLoop with a later sort, so that it will
         # run after most tasks, but before igLoop.
@@ -2359,7 +2450,8 @@ class ShowBase(DirectObject.DirectObject):
             self.taskMgr.add(self.__igLoopSync, 'igLoop', sort = 50)
         # the audioLoop updates the positions of 3D sounds.
         # as such, it needs to run after the cull traversal in the igLoop.
-        self.taskMgr.add(self.__audioLoop, 'audioLoop', sort = 60)
+        if not self.headless or self.musicManager is not None:
+            self.taskMgr.add(self.__audioLoop, 'audioLoop', sort = 60)
         self.eventMgr.restart()
 
     def shutdown(self) -> None:
@@ -3029,10 +3121,15 @@ class ShowBase(DirectObject.DirectObject):
         return saved
 
     def movie(self, namePrefix = 'movie', duration = 1.0, fps = 30,
-              format = 'png', sd = 4, source = None):
+              format = 'png', sd = 4, source = None, singleFile = False):
         """
         Spawn a task to capture a movie using the screenshot function.
 
+        If the source is a window or buffer, the frames are read back
+        asynchronously and encoded by a pool of threads, as controlled by
+        the movie-async-capture, movie-capture-threads and
+        movie-capture-max-frames variables; see :mod:`.MovieCapture`.
+
         Args:
             namePrefix (str): used to form output file names (can
                 include path information (e.g. '/i/beta/frames/myMovie')
@@ -3045,10 +3142,25 @@ class ShowBase(DirectObject.DirectObject):
             source: the Window, Buffer, DisplayRegion, or Texture from
                 which to save the resulting images.  The default is the
                 main window.
+            singleFile (bool): if true, all frames are written to a
+                single file named namePrefix + '.ppm', as a stream of raw
+                PPM images, instead of to one file per frame.  This requires
+                the source to be a window or buffer.
 
         Returns:
             A `~direct.task.Task` that can be awaited.
         """
+        capture = None
+        window = source if source is not None else self.win
+        if isinstance(window, GraphicsOutput):
+            from . import MovieCapture
+            if singleFile or MovieCapture.movie_async_capture.value:
+                containerFilename = namePrefix + '.ppm' if singleFile else None
+                capture = MovieCapture.MovieCapture(
+                    window, containerFilename = containerFilename)
+        elif singleFile:
+            raise ValueError("singleFile requires a window or buffer as source")
+
         clock = self.clock
         clock.mode = ClockObject.MNonRealTime
         clock.dt = 1.0 / fps
@@ -3056,19 +3168,43 @@ class ShowBase(DirectObject.DirectObject):
         t.frameIndex = 0  # Frame 0 is not captured.
         t.numFrames = int(duration * fps)
         t.source = source
+        t.capture = capture
         t.outputString = namePrefix + '_%0' + repr(sd) + 'd.' + format
-        t.setUponDeath(lambda state: clock.setMode(ClockObject.MNormal))
+        t.singleFile = singleFile
+
+        def uponDeath(state):
+            if capture is not None:
+                capture.finish()
+            clock.setMode(ClockObject.MNormal)
+        t.setUponDeath(uponDeath)
         return t
 
     def _movieTask(self, state):
+        capture = state.capture
+        if state.frameIndex > state.numFrames:
+            # Wait for the last frames to be written.
+            if capture.poll():
+                return Task.done
+            return Task.cont
+
         if state.frameIndex != 0:
-            frameName = state.outputString % state.frameIndex
-            self.notify.info("Capturing frame: " + frameName)
-            self.screenshot(namePrefix = frameName, defaultFilename = 0,
-                            source = state.source)
+            if state.singleFile:
+                self.notify.debug("Capturing frame %s" % (state.frameIndex))
+                capture.captureFrame()
+            else:
+                frameName = state.outputString % state.frameIndex
+                self.notify.info("Capturing frame: " + frameName)
+                if capture is not None:
+                    capture.captureFrame(Filename(frameName))
+                else:
+                    self.screenshot(namePrefix = frameName, defaultFilename = 0,
+                                    source = state.source)
+
+        if capture is not None:
+            capture.poll()
 
         state.frameIndex += 1
-        if state.frameIndex > state.numFrames:
+        if state.frameIndex > state.numFrames and capture is None:
             return Task.done
         else:
             return Task.cont
@@ -3082,7 +3218,7 @@ class ShowBase(DirectObject.DirectObject):
         if properties != self.__prevWindowProperties:
             self.__prevWindowProperties = properties
 
-            self.notify.debug("Got window event: %s" % (repr(properties)))
+            self.notify.debug("Got window event: %r", properties)
             if not properties.getOpen():
                 # If the user closes the main window, we should exit.
                 self.notify.info("User closed main window.")
@@ -0,0 +1,283 @@
+"""Contains the SamplingProfiler class, a statistical profiler that can be
+left running in a live program.
+
+Unlike `direct.showbase.ProfileSession`, which uses cProfile to hook every
+function call and can slow the program down several times over, the sampling
+profiler lets the program run at full speed.  A background thread wakes up at
+a fixed rate, takes a snapshot of the Python stack of the thread that runs
+the task manager, and counts how often each stack was seen, filed under the
+name of the task that was running at the time.
+
+The counts can be written out in the "collapsed stack" format, which can be
+turned into a flame graph by tools such as flamegraph.pl or speedscope, and
+the functions that take the most time can be shown in PStats.
+
+The sampler thread needs the GIL to look at the stack, so while the program
+is busy running Python code, it cannot sample more often than once every
+sys.getswitchinterval() seconds, whatever the rate is set to.
+
+These are the Config.prc variables that control the profiler:
+
+    sampling-profiler false
+    sampling-profiler-rate 100
+    sampling-profiler-pstats false
+    sampling-profiler-output
+
+When sampling-profiler is set, the TaskManager starts a profiler at startup;
+see `.TaskManager.startSamplingProfiler()`.
+"""
+
+__all__ = ['SamplingProfiler']
+
+from panda3d.core import (
+    ConfigVariableBool,
+    ConfigVariableInt,
+    PStatCollector,
+    Thread,
+)
+from direct.directnotify.DirectNotifyGlobal import directNotify
+import os
+import sys
+import threading
+import time
+
+
+class SamplingProfiler:
+    """Samples the Python stack of one thread at a fixed rate, and counts the
+    samples by stack and by task."""
+
+    notify = directNotify.newCategory('SamplingProfiler')
+
+    #: The name under which samples are filed when no task was running.
+    NoTaskName = '<no task>'
+
+    #: How often the hot functions are sent to PStats, in seconds.
+    PStatsInterval = 1.0
+
+    #: The number of hot functions that are sent to PStats.
+    NumPStatsFunctions = 10
+
+    def __init__(self, rate=None, pstats=None, taskMgr=None):
+        # rate is the number of samples per second.  If pstats is true, the
+        # hottest functions are shown in PStats, under "Sampled functions",
+        # by a task on taskMgr, which defaults to the global TaskManager.
+        # The thread that creates the profiler is the one that is sampled;
+        # this should be the one that runs the task manager.
+        if rate is None:
+            rate = ConfigVariableInt('sampling-profiler-rate', 100).value
+        if pstats is None:
+            pstats = ConfigVariableBool('sampling-profiler-pstats', False).value
+        if taskMgr is None:
+            from .TaskManagerGlobal import taskMgr
+        self.rate = max(rate, 1)
+        self.pstats = pstats
+        self.taskMgr = taskMgr
+
+        self._threadId = threading.get_ident()
+        # the Panda thread, which knows the task that it is running
+        self._pandaThread = Thread.getCurrentThread()
+
+        #: The total number of samples taken.
+        self.numSamples = 0
+
+        # (task name, stack of code objects from the outermost call) -> count
+        self._stacks = {}
+        # leaf code object -> count, since the last PStats update
+        self._recentLeaves = {}
+        self._codeNames = {}
+        self._sampleTime = 0.0
+        self._startTime = None
+        self._runTime = 0.0
+        self._stopEvent = threading.Event()
+        self._samplerThread = None
+        self._pstatsCollectors = {}
+        self._pstatsTaskName = 'samplingProfilerPStats-%s' % id(self)
+
+    def start(self):
+        """Starts taking samples in a background thread."""
+        if self._samplerThread is not None:
+            return
+        self._stopEvent.clear()
+        self._startTime = time.perf_counter()
+        self._samplerThread = threading.Thread(
+            target=self._run, name='SamplingProfiler', daemon=True)
+        self._samplerThread.start()
+        if self.pstats:
+            self.taskMgr.doMethodLater(self.PStatsInterval, self._pstatsTask,
+                                       self._pstatsTaskName)
+
+    def stop(self):
+        """Stops taking samples.  The samples taken so far are kept."""
+        if self._samplerThread is None:
+            return
+        self._stopEvent.set()
+        self._samplerThread.join()
+        self._samplerThread = None
+        self._runTime += time.perf_counter() - self._startTime
+        self._startTime = None
+        self.taskMgr.remove(self._pstatsTaskName)
+        for collector in self._pstatsCollectors.values():
+            collector.setLevel(0)
+
+    def isRunning(self):
+        return self._samplerThread is not None
+
+    def reset(self):
+        """Throws away the samples taken so far."""
+        self._stacks = {}
+        self._recentLeaves = {}
+        self.numSamples = 0
+        self._sampleTime = 0.0
+        self._runTime = 0.0
+        if self._startTime is not None:
+            self._startTime = time.perf_counter()
+
+    def getOverhead(self):
+        """Returns the fraction of the time that was spent taking samples,
+        during which the sampled thread could not run."""
+        runTime = self._runTime
+        if self._startTime is not None:
+            runTime += time.perf_counter() - self._startTime
+        if runTime <= 0.0:
+            return 0.0
+        return self._sampleTime / runTime
+
+    def getTaskSamples(self):
+        """Returns a dictionary of the number of samples by task name."""
+        taskSamples = {}
+        for (taskName, stack), count in self._stacks.copy().items():
+            taskSamples[taskName] = taskSamples.get(taskName, 0) + count
+        return taskSamples
+
+    def getHotFunctions(self, num=None, taskName=None):
+        """Returns a list of (function name, samples in the function itself,
+        samples in the function or anything that it called), sorted with the
+        most time spent in the function itself first.  If taskName is given,
+        only the samples taken while that task was running are counted."""
+        selfCounts = {}
+        totalCounts = {}
+        for (stackTask, stack), count in self._stacks.copy().items():
+            if taskName is not None and stackTask != taskName:
+                continue
+            if not stack:
+                continue
+            leaf = stack[-1]
+            selfCounts[leaf] = selfCounts.get(leaf, 0) + count
+            # a recursive function is only counted once per sample
+            for code in set(stack):
+                totalCounts[code] = totalCounts.get(code, 0) + count
+
+        functions = [(self._getCodeName(code), selfCounts.get(code, 0), total)
+                     for code, total in totalCounts.items()]
+        functions.sort(key=lambda function: (function[1], function[2]), reverse=True)
+        if num is not None:
+            functions = functions[:num]
+        return functions
+
+    def getCollapsedStacks(self):
+        """Returns the samples in the collapsed stack format: one line per
+        stack, with the task name and then the functions from the outermost
+        call inwards, separated by semicolons, followed by a space and the
+        number of samples."""
+        lines = []
+        for (taskName, stack), count in self._stacks.copy().items():
+            names = [self._sanitize(taskName)]
+            names.extend(self._getCodeName(code) for code in stack)
+            lines.append('%s %s' % (';'.join(names), count))
+        lines.sort()
+        return lines
+
+    def writeCollapsedStacks(self, filename):
+        """Writes the samples to the indicated file, in the collapsed stack
+        format that flame graph tools read."""
+        lines = self.getCollapsedStacks()
+        with open(filename, 'w') as file:
+            for line in lines:
+                file.write(line + '\n')
+        self.notify.info('wrote %s samples to %s' % (self.numSamples, filename))
+
+    def report(self, num=20):
+        """Writes the busiest tasks and the hottest functions to the log."""
+        numSamples = max(self.numSamples, 1)
+        lines = ['%s samples at %s Hz, %.2f%% overhead' % (
+            self.numSamples, self.rate, self.getOverhead() * 100.0)]
+        lines.append('tasks:')
+        taskSamples = sorted(self.getTaskSamples().items(),
+                             key=lambda item: item[1], reverse=True)
+        for taskName, count in taskSamples[:num]:
+            lines.append('  %6.2f%% %s' % (count * 100.0 / numSamples, taskName))
+        lines.append('functions (self, total):')
+        for name, selfCount, totalCount in self.getHotFunctions(num):
+            lines.append('  %6.2f%% %6.2f%% %s' % (
+                selfCount * 100.0 / numSamples, totalCount * 100.0 / numSamples, name))
+        self.notify.info('\n'.join(lines))
+
+    def _run(self):
+        interval = 1.0 / self.rate
+        while not self._stopEvent.wait(interval):
+            self._sample()
+
+    def _sample(self):
+        start = time.perf_counter()
+        frame = sys._current_frames().get(self._threadId)
+        if frame is None:
+            return
+
+        task = self._pandaThread.getCurrentTask()
+        if task is not None:
+            taskName = task.getName()
+        else:
+            taskName = self.NoTaskName
+
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        frame = None
+        stack.reverse()
+        stack = tuple(stack)
+
+        key = (taskName, stack)
+        self._stacks[key] = self._stacks.get(key, 0) + 1
+        if stack:
+            leaf = stack[-1]
+            self._recentLeaves[leaf] = self._recentLeaves.get(leaf, 0) + 1
+        self.numSamples += 1
+        self._sampleTime += time.perf_counter() - start
+
+    def _getCodeName(self, code):
+        name = self._codeNames.get(code)
+        if name is None:
+            name = '%s (%s:%s)' % (
+                getattr(code, 'co_qualname', code.co_name),
+                os.path.basename(code.co_filename), code.co_firstlineno)
+            name = self._sanitize(name)
+            self._codeNames[code] = name
+        return name
+
+    @staticmethod
+    def _sanitize(name):
+        # semicolons separate the frames of a collapsed stack
+        return name.replace(';', ',').replace('\n', ' ')
+
+    def _pstatsTask(self, task):
+        recentLeaves, self._recentLeaves = self._recentLeaves, {}
+        numRecent = sum(recentLeaves.values())
+        hot = sorted(recentLeaves.items(), key=lambda item: item[1], reverse=True)
+        hot = hot[:self.NumPStatsFunctions]
+
+        # the level is the percentage of the time spent in the function
+        levels = {}
+        for code, count in hot:
+            # colons separate the levels of PStats collector names
+            name = self._getCodeName(code).replace(':', ' ')
+            levels[name] = count * 100.0 / max(numRecent, 1)
+        for name in self._pstatsCollectors:
+            levels.setdefault(name, 0.0)
+        for name, level in levels.items():
+            collector = self._pstatsCollectors.get(name)
+            if collector is None:
+                collector = PStatCollector('Sampled functions:%s' % (name))
+                self._pstatsCollectors[name] = collector
+            collector.setLevel(level)
+        return task.again
@@ -39,6 +39,7 @@ from panda3d.core import (
     AsyncTaskSequence,
     ClockObject,
     ConfigVariableBool,
+    ConfigVariableString,
     GlobPattern,
     PythonTask,
     Thread,
@@ -179,6 +180,7 @@ class TaskManager:
             profiled = False,
             session = None,
         )
+        self._samplingProfiler: Any = None
 
     def finalInit(self) -> None:
         # This function should be called once during startup, after
@@ -188,6 +190,8 @@ class TaskManager:
         self.setProfileTasks(ConfigVariableBool('profile-task-spikes', 0).getValue())
         self._profileFrames = StateVar(False)
         self.setProfileFrames(ConfigVariableBool('profile-frames', 0).getValue())
+        if ConfigVariableBool('sampling-profiler', False).value:
+            self.startSamplingProfiler()
 
     def destroy(self) -> None:
         # This should be safe to call multiple times.
@@ -195,6 +199,7 @@ class TaskManager:
         self.notify.info("TaskManager.destroy()")
         self.destroyed = True
         self._frameProfileQueue.clear()
+        self.stopSamplingProfiler()
         self.mgr.cleanup()
 
     def __getClock(self) -> ClockObject:
@@ -729,6 +734,36 @@ class TaskManager:
         for i in range(numFrames):
             self.step()
 
+    def startSamplingProfiler(self, rate=None, pstats=None):
+        """Starts a statistical profiler, which samples the Python stack at
+        the indicated rate, and counts the samples by task.  It slows the
+        program down far less than profileFrames() does.  Returns the
+        :class:`~direct.task.SamplingProfiler.SamplingProfiler`."""
+        if self._samplingProfiler is None:
+            # import here due to import dependencies
+            SP = importlib.import_module('direct.task.SamplingProfiler')
+            self._samplingProfiler = SP.SamplingProfiler(rate, pstats, self)
+        self._samplingProfiler.start()
+        return self._samplingProfiler
+
+    def stopSamplingProfiler(self, filename=None):
+        """Stops the sampling profiler, and writes its samples to the
+        indicated file, or to the file named by sampling-profiler-output,
+        in the collapsed stack format that flame graph tools read."""
+        profiler = self._samplingProfiler
+        if profiler is None:
+            return None
+        self._samplingProfiler = None
+        profiler.stop()
+        if filename is None:
+            filename = ConfigVariableString('sampling-profiler-output', '').value
+        if filename:
+            profiler.writeCollapsedStacks(filename)
+        return profiler
+
+    def getSamplingProfiler(self):
+        return self._samplingProfiler
+
     def getProfileFrames(self):
         return self._profileFrames.get()
 
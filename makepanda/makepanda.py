@@ -5110,6 +5110,8 @@ if not PkgSkip("DIRECT"):
     TargetAdd('libp3interval.in', opts=OPTS, input=IGATEFILES)
     TargetAdd('libp3interval.in', opts=['IMOD:panda3d.direct', 'ILIB:libp3interval', 'SRCDIR:direct/src/interval'])
     PyTargetAdd('p3interval_cInterval_ext.obj', opts=OPTS, input='cInterval_ext.cxx')
+    PyTargetAdd('p3interval_cIntervalManager_ext.obj', opts=OPTS, input='cIntervalManager_ext.cxx')
+    PyTargetAdd('p3interval_cMetaInterval_ext.obj', opts=OPTS, input='cMetaInterval_ext.cxx')
 
 #
 # DIRECTORY: direct/src/showbase/
@@ -5176,6 +5178,8 @@ if not PkgSkip("DIRECT"):
     PyTargetAdd('direct.pyd', input='libp3deadrec_igate.obj')
     PyTargetAdd('direct.pyd', input='libp3interval_igate.obj')
     PyTargetAdd('direct.pyd', input='p3interval_cInterval_ext.obj')
+    PyTargetAdd('direct.pyd', input='p3interval_cIntervalManager_ext.obj')
+    PyTargetAdd('direct.pyd', input='p3interval_cMetaInterval_ext.obj')
     if GetTarget() != 'emscripten':
         PyTargetAdd('direct.pyd', input='libp3distributed_igate.obj')
     PyTargetAdd('direct.pyd', input='libp3motiontrail_igate.obj')
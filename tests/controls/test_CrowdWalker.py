@@ -0,0 +1,110 @@
+from panda3d.core import BitMask32, CollisionNode, CollisionPlane, NodePath
+from panda3d.core import Plane, Point3, Vec3
+from direct.controls.CrowdWalker import CrowdWalker
+import pytest
+
+FloorBitmask = BitMask32.bit(1)
+
+
+def make_scene():
+    root = NodePath('root')
+    floor = CollisionNode('floor')
+    floor.addSolid(CollisionPlane(Plane(Vec3(0, 0, 1), Point3(0, 0, 0))))
+    floor.setIntoCollideMask(FloorBitmask)
+    root.attachNewNode(floor)
+    return root
+
+
+def test_crowdwalker_land_and_walk():
+    root = make_scene()
+    crowd = CrowdWalker(root, FloorBitmask)
+    avatar = root.attachNewNode('avatar')
+    avatar.setZ(5)
+    index = crowd.addAvatar(avatar)
+    assert crowd.getIsAirborne(index)
+
+    for i in range(20):
+        crowd.step(0.1)
+    assert not crowd.getIsAirborne(index)
+    assert avatar.getZ() == 0
+    assert crowd.getVelocity(index) == 0
+
+    # Walk forward along the heading of the avatar.
+    crowd.setControls(index, speed=10.0)
+    crowd.step(0.5)
+    assert avatar.getPos().almostEqual(Point3(0, 5, 0))
+
+    avatar.setH(90)
+    crowd.step(0.5)
+    assert avatar.getPos().almostEqual(Point3(-5, 5, 0))
+
+    crowd.setControls(index, rotationSpeed=90.0)
+    crowd.step(1.0)
+    assert avatar.getH() == pytest.approx(180)
+    assert avatar.getPos().almostEqual(Point3(-5, 5, 0))
+    crowd.destroy()
+
+
+def test_crowdwalker_jump():
+    root = make_scene()
+    crowd = CrowdWalker(root, FloorBitmask)
+    avatar = root.attachNewNode('avatar')
+    index = crowd.addAvatar(avatar)
+    crowd.step(0.1)
+    assert not crowd.getIsAirborne(index)
+
+    crowd.jump(index, 20.0)
+    crowd.step(0.1)
+    assert crowd.getIsAirborne(index)
+    assert avatar.getZ() > 0
+
+    for i in range(20):
+        crowd.step(0.1)
+    assert not crowd.getIsAirborne(index)
+    assert avatar.getZ() == 0
+    crowd.destroy()
+
+
+def test_crowdwalker_remove():
+    root = make_scene()
+    crowd = CrowdWalker(root, FloorBitmask)
+    avatars = [root.attachNewNode('avatar%d' % (i)) for i in range(3)]
+    for avatar in avatars:
+        crowd.addAvatar(avatar)
+
+    avatars[2].setZ(5)
+    crowd.removeAvatar(avatars[0])
+    assert crowd.getNumAvatars() == 2
+    assert crowd.getIndex(avatars[0]) == -1
+    assert crowd.getIndex(avatars[2]) == 0
+    assert crowd.cTrav.getNumColliders() == 2
+    assert avatars[0].getNumChildren() == 0
+
+    # The moved avatar still gets its own floor.
+    for i in range(20):
+        crowd.step(0.1)
+    assert avatars[2].getZ() == 0
+    assert not crowd.getIsAirborne(0)
+    crowd.destroy()
+
+
+def test_crowdwalker_scale():
+    # All avatars of a large crowd share one traverser and one queue.
+    root = make_scene()
+    crowd = CrowdWalker(root, FloorBitmask)
+    avatars = []
+    for i in range(1000):
+        avatar = root.attachNewNode('avatar')
+        avatar.setPos(i % 40, i // 40, 1 + (i % 7))
+        index = crowd.addAvatar(avatar)
+        crowd.setControls(index, speed=4.0, rotationSpeed=i % 60)
+        avatars.append(avatar)
+
+    assert crowd.cTrav.getNumColliders() == 1000
+    for i in range(30):
+        crowd.step(1 / 30.0)
+
+    assert crowd.numSteps == 30
+    assert all(avatar.getZ() == 0 for avatar in avatars)
+    assert not any(crowd.getIsAirborne(i) for i in range(1000))
+    crowd.destroy()
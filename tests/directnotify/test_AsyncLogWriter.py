@@ -0,0 +1,131 @@
+import io
+import json
+import threading
+from direct.directnotify import Logger, Notifier
+from direct.directnotify.AsyncLogWriter import AsyncLogWriter
+
+
+def test_async_writer_lines():
+    out = io.StringIO()
+    writer = AsyncLogWriter(out.write)
+    writer.write('first')
+    writer.write('second')
+    writer.flush()
+    assert out.getvalue() == 'first\nsecond\n'
+    assert writer.getNumPending() == 0
+
+    writer.stop()
+    assert writer.isStopped()
+    writer.write('third')
+    assert out.getvalue() == 'first\nsecond\nthird\n'
+
+
+def test_async_writer_json():
+    out = io.StringIO()
+    writer = AsyncLogWriter(out.write, jsonLines=True)
+    writer.write(':cat: hello', 'cat', 'info', 'hello')
+    writer.write('plain')
+    writer.stop()
+
+    first, second = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert first['category'] == 'cat'
+    assert first['severity'] == 'info'
+    assert first['message'] == 'hello'
+    assert isinstance(first['time'], float)
+    assert isinstance(first['frame'], int)
+    assert second['message'] == 'plain'
+
+
+def test_async_writer_overflow():
+    out = io.StringIO()
+    written = threading.Event()
+    release = threading.Event()
+
+    def blocking_write(data):
+        out.write(data)
+        written.set()
+        release.wait()
+
+    writer = AsyncLogWriter(blocking_write, maxRecords=10)
+
+    # Keep the writer busy, so that the buffer overflows.
+    writer.write('blocked')
+    thread = threading.Thread(target=writer.flush)
+    thread.start()
+    written.wait()
+
+    for i in range(25):
+        writer.write(str(i))
+    assert writer.getNumPending() == 10
+    assert writer.numDropped == 15
+
+    release.set()
+    thread.join()
+    writer.stop()
+    assert out.getvalue().splitlines() == ['blocked'] + [str(i) for i in range(15, 25)]
+
+
+def test_async_writer_overflow_threads():
+    # Every line from every thread is either written or counted as dropped.
+    out = io.StringIO()
+    written = threading.Event()
+    release = threading.Event()
+
+    def blocking_write(data):
+        out.write(data)
+        written.set()
+        release.wait()
+
+    writer = AsyncLogWriter(blocking_write, maxRecords=100)
+    writer.write('blocked')
+    thread = threading.Thread(target=writer.flush)
+    thread.start()
+    written.wait()
+
+    def produce():
+        for i in range(5000):
+            writer.write('line')
+
+    producers = [threading.Thread(target=produce) for i in range(4)]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+
+    release.set()
+    thread.join()
+    writer.stop()
+    assert len(out.getvalue().splitlines()) + writer.numDropped == 20001
+
+
+def test_notifier_async(monkeypatch):
+    out = io.StringIO()
+    writer = AsyncLogWriter(out.write, jsonLines=True)
+    monkeypatch.setattr(Notifier.Notifier, 'asyncWriter', writer)
+
+    notifier = Notifier.Notifier('AsyncTest')
+    notifier.setDebug(True)
+    notifier.warning('warned')
+    notifier.debug('debugged')
+    writer.stop()
+
+    warning, debug = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert warning['category'] == 'AsyncTest'
+    assert warning['severity'] == 'warning'
+    assert warning['message'] == 'warned'
+    assert debug['severity'] == 'debug'
+    assert debug['message'] == 'debugged'
+
+
+def test_logger_async(tmp_path):
+    logger = Logger.Logger(str(tmp_path / 'log'))
+    logger.setTimeStamp(False)
+    logger.setAsync(True)
+    assert logger.getAsyncWriter() is not None
+    logger.log('one')
+    logger.log('two')
+    logger._Logger__closeLogFile()
+    logger.setAsync(False)
+
+    log_file, = tmp_path.iterdir()
+    assert log_file.read_text() == 'one\ntwo\n'
@@ -85,3 +85,31 @@ def test_debugCall(notifier, log_io):
     notifier.debugCall(DEBUG_LOG)
     pattern = rf':\d\d:\d\d:\d\d:{NOTIFIER_NAME} "{DEBUG_LOG}" test_debugCall\(.*\)\n'
     assert re.match(pattern, log_io.getvalue())
+
+
+class CountingRepr:
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return 'counted'
+
+
+def test_lazy_formatting(notifier, log_io):
+    obj = CountingRepr()
+    notifier.setDebug(False)
+    notifier.debug('%s and %d', obj, 5)
+    notifier.debug(lambda: '%s' % (obj))
+    assert obj.count == 0
+    assert log_io.getvalue() == ''
+
+    notifier.setDebug(True)
+    notifier.debug('%s and %d', obj, 5)
+    notifier.info(lambda: 'lazy %s' % (obj))
+    notifier.warning('%s%%', 100)
+    assert obj.count == 2
+    assert log_io.getvalue() == (
+        f':{NOTIFIER_NAME}(debug): counted and 5\n'
+        f':{NOTIFIER_NAME}: lazy counted\n'
+        f':{NOTIFIER_NAME}(warning): 100%\n')
@@ -1,4 +1,4 @@
-from direct.dist.FreezeTool import Freezer, PandaModuleFinder
+from direct.dist.FreezeTool import Freezer, ModuleScanCache, PandaModuleFinder
 import pytest
 import os
 import sys
@@ -62,6 +62,68 @@ def test_Freezer_getModulePath_getModuleStar(tmp_path):
         sys.path = backup
 
 
+def make_synthetic_tree(root, num_packages=20, num_modules=25):
+    # Each module imports the previous module of its package, as well as the
+    # package before it, so that the whole tree is reached from the top.
+    for p in range(num_packages):
+        package = root / "synpkg{0}".format(p)
+        package.mkdir()
+        init = ""
+        if p > 0:
+            init = "import synpkg{0}\n".format(p - 1)
+        init += "from . import mod{0}\n".format(num_modules - 1)
+        (package / "__init__.py").write_text(init)
+        for i in range(num_modules):
+            source = "def func():\n    from . import mod{0}\n".format(i - 1) if i > 0 else ""
+            source += "VALUE = {0}\n".format(i)
+            (package / "mod{0}.py".format(i)).write_text(source)
+
+
+def find_synthetic_tree(root, cache):
+    mf = PandaModuleFinder(path=[str(root)], cache=cache)
+    mf.import_hook("synpkg19")
+    return {name: sorted(m.globalnames) for name, m in mf.modules.items()}
+
+
+@pytest.mark.parametrize("workers", (0, 2))
+def test_ModuleScanCache(tmp_path, workers):
+    make_synthetic_tree(tmp_path)
+    num_files = 20 * 26
+    cache_file = str(tmp_path / "cache.pickle")
+
+    # Cold scan; with workers, imported modules are compiled ahead.
+    cache = ModuleScanCache(cache_file, workers=workers)
+    cold = find_synthetic_tree(tmp_path, cache)
+    assert len(cold) == num_files
+    assert len(cache) == num_files
+    assert cache.numHits + cache.numMisses == num_files
+    cache.save()
+    cache.close()
+
+    # An incremental scan finds the same modules, without compiling any.
+    cache = ModuleScanCache(cache_file, workers=workers)
+    assert find_synthetic_tree(tmp_path, cache) == cold
+    assert cache.numHits == num_files
+    assert cache.numMisses == 0
+
+    # Touching a file causes it to be scanned again.
+    changed = tmp_path / "synpkg3" / "mod7.py"
+    changed.write_text("def func():\n    from . import mod6\nVALUE = 8\n")
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    cache.numHits = 0
+    modules = find_synthetic_tree(tmp_path, cache)
+    assert cache.numHits + cache.numMisses == num_files
+    if workers == 0:
+        assert cache.numMisses == 1
+    else:
+        # It may already have been rescanned by a worker.
+        assert cache.numMisses <= 1
+    assert modules == cold
+    cache.close()
+
+
 @pytest.mark.parametrize("use_console", (False, True))
 def test_Freezer_generateRuntimeFromStub(tmp_path, use_console):
     try:
@@ -0,0 +1,56 @@
+import sys
+import pytest
+
+from setuptools import Distribution
+from direct.dist.commands import build_apps
+
+
+def make_build_apps(tmp_path):
+    cmd = build_apps(Distribution())
+    cmd.build_base = str(tmp_path)
+    return cmd
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason="requires ELF binaries")
+def test_build_apps_dependency_cache(tmp_path):
+    cmd = make_build_apps(tmp_path)
+    with open(sys.executable, 'rb') as fp:
+        data = fp.read()
+
+    search_path = []
+    deps, patched = cmd._get_dependencies(data, str(tmp_path), search_path)
+    assert patched is None
+    assert len(cmd._dependency_cache) == 1
+
+    # The second time, the result comes from the cache.
+    cmd._scan_dependencies = None
+    assert cmd._get_dependencies(data, str(tmp_path), []) == (deps, None)
+
+    cache_path = str(tmp_path / 'cache' / 'deps.pickle')
+    cmd.save_dependency_cache(cache_path)
+    cmd2 = make_build_apps(tmp_path)
+    cmd2.load_dependency_cache(cache_path)
+    assert cmd2._dependency_cache == cmd._dependency_cache
+
+
+@pytest.mark.parametrize("mode", ('copy', 'reflink', 'hardlink'))
+def test_build_apps_finish_copies(tmp_path, mode):
+    cmd = make_build_apps(tmp_path)
+    cmd.dependency_link_mode = mode
+
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    target_dir = tmp_path / 'target'
+    for i in range(50):
+        (source_dir / 'lib{0}.so'.format(i)).write_bytes(b'data%d' % (i))
+
+    # Nothing is copied until finish_copies() is called.
+    for i in range(50):
+        source_path = str(source_dir / 'lib{0}.so'.format(i))
+        target_path = str(target_dir / 'lib{0}.so'.format(i))
+        cmd.copy_with_dependencies(source_path, target_path, [])
+    assert not target_dir.exists()
+
+    cmd.finish_copies()
+    for i in range(50):
+        assert (target_dir / 'lib{0}.so'.format(i)).read_bytes() == b'data%d' % (i)
@@ -0,0 +1,228 @@
+from panda3d.core import Filename
+from direct.distributed.AsyncDatagramProtocol import AsyncDatagramProtocol, openDatagramConnection
+from direct.distributed.AsyncServerRepository import AsyncServerRepository
+from direct.distributed.ServerRepository import ServerRepository
+from direct.distributed.PyDatagram import PyDatagram
+from direct.distributed.PyDatagramIterator import PyDatagramIterator
+from direct.distributed.MsgTypesCMU import (
+    CLIENT_DISCONNECT_CMU,
+    CLIENT_OBJECT_GENERATE_CMU,
+    CLIENT_OBJECT_UPDATE_FIELD,
+    CLIENT_SET_INTEREST_CMU,
+    OBJECT_GENERATE_CMU,
+    OBJECT_UPDATE_FIELD_CMU,
+    SET_DOID_RANGE_CMU,
+)
+from direct.task.TaskManagerGlobal import taskMgr
+import asyncio
+import socket
+import struct
+import time
+import pytest
+
+
+DC_SOURCE = """
+dclass SwarmObject {
+  setValue(uint32) broadcast;
+};
+"""
+
+
+class SwarmClient:
+    # A minimal CMU client that records the messages it receives.
+
+    def __init__(self):
+        self.connection = None
+        self.doIdBase = None
+        self.received = {}
+        self.lost = False
+
+    def connectionMade(self, connection):
+        self.connection = connection
+
+    def datagramReceived(self, connection, datagram):
+        dgi = PyDatagramIterator(datagram)
+        msgType = dgi.getUint16()
+        if msgType == SET_DOID_RANGE_CMU:
+            self.doIdBase = dgi.getUint32()
+        self.received.setdefault(msgType, []).append(dgi.getRemainingBytes())
+
+    def connectionLost(self, connection):
+        self.lost = True
+
+    def send(self, msgType, *values):
+        dg = PyDatagram()
+        dg.addUint16(msgType)
+        for value in values:
+            dg.addUint32(value)
+        self.connection.sendDatagram(dg)
+
+
+@pytest.fixture
+def dcFileName(tmp_path):
+    path = tmp_path / 'swarm.dc'
+    path.write_text(DC_SOURCE)
+    return Filename.fromOsSpecific(str(path))
+
+
+def get_free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+async def wait_for(condition, step, timeout=30.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        step()
+        await asyncio.sleep(0.001)
+
+
+async def run_swarm(server, port, step, numClients):
+    dclass = server.dcFile.getClassByName('SwarmObject')
+    classId = dclass.getNumber()
+    fieldId = dclass.getFieldByName('setValue').getNumber()
+
+    # Connect all clients at once, stepping the server while they do, since
+    # a polling server only accepts connections when it is stepped, and its
+    # listen backlog is smaller than the swarm.
+    clients = [SwarmClient() for i in range(numClients)]
+    connects = asyncio.gather(*[openDatagramConnection(client, '127.0.0.1', port)
+                                for client in clients])
+    await wait_for(connects.done, step)
+    connects.result()
+    await wait_for(lambda: all(client.doIdBase for client in clients), step)
+    assert len(set(client.doIdBase for client in clients)) == numClients
+
+    for client in clients:
+        client.send(CLIENT_SET_INTEREST_CMU, 1)
+    await wait_for(lambda: len(server.zonesToClients.get(1, ())) == numClients, step)
+
+    # The first client creates an object, and the others are told.
+    owner = clients[0]
+    doId = owner.doIdBase
+    dg = PyDatagram()
+    dg.addUint16(CLIENT_OBJECT_GENERATE_CMU)
+    dg.addUint32(1)
+    dg.addUint16(classId)
+    dg.addUint32(doId)
+    owner.connection.sendDatagram(dg)
+    others = clients[1:]
+    await wait_for(lambda: all(OBJECT_GENERATE_CMU in client.received
+                               for client in others), step)
+
+    # Now it broadcasts a number of updates.
+    numUpdates = 10
+    for value in range(numUpdates):
+        dg = PyDatagram()
+        dg.addUint16(CLIENT_OBJECT_UPDATE_FIELD)
+        dg.addUint32(doId)
+        dg.addUint16(fieldId)
+        dg.addUint32(value)
+        owner.connection.sendDatagram(dg)
+    await wait_for(lambda: all(len(client.received.get(OBJECT_UPDATE_FIELD_CMU, ())) == numUpdates
+                               for client in others), step)
+
+    for client in others:
+        updates = client.received[OBJECT_UPDATE_FIELD_CMU]
+        values = [struct.unpack_from('<I', data, 10)[0] for data in updates]
+        assert values == list(range(numUpdates))
+    assert OBJECT_UPDATE_FIELD_CMU not in owner.received
+
+    # Half of the clients say goodbye, the other half just hang up.
+    for i, client in enumerate(clients):
+        if i % 2:
+            client.send(CLIENT_DISCONNECT_CMU)
+        else:
+            client.connection.close()
+    await wait_for(lambda: not server.clientsByConnection, step)
+    await wait_for(lambda: all(client.lost for client in clients), step)
+    assert not server.zonesToClients
+    assert not server.objectsByZoneId
+
+
+def test_async_server_swarm(dcFileName):
+    async def main():
+        server = AsyncServerRepository(0, '127.0.0.1', dcFileNames=[dcFileName])
+        await server.start()
+        await run_swarm(server, server.getPort(), lambda: None, 200)
+        server.close()
+        await server.waitClosed()
+
+    asyncio.run(main())
+
+
+def test_polling_server_swarm(dcFileName):
+    # The same swarm against the polling ServerRepository, stepping the
+    # task manager to let it poll its connections.
+    port = get_free_port()
+    server = ServerRepository(port, '127.0.0.1', dcFileNames=[dcFileName])
+    try:
+        asyncio.run(run_swarm(server, port, taskMgr.step, 50))
+    finally:
+        for taskName in ('serverListenerPollTask', 'serverReaderPollTask',
+                         'clientHardDisconnect', 'flushTask'):
+            taskMgr.remove(taskName)
+        server.qcm.closeConnection(server.tcpRendezvous)
+
+
+def test_async_server_event_loop_task(dcFileName):
+    server = AsyncServerRepository(0, '127.0.0.1', dcFileNames=[dcFileName])
+    server.startEventLoopTask()
+    try:
+        sock = socket.create_connection(('127.0.0.1', server.getPort()))
+        sock.settimeout(0.01)
+        data = b''
+        end = time.monotonic() + 30.0
+        while len(data) < 12:
+            assert time.monotonic() < end, "timed out"
+            taskMgr.step()
+            try:
+                data += sock.recv(12 - len(data))
+            except socket.timeout:
+                pass
+
+        length, msgType, doIdBase, doIdRange = struct.unpack('<HHII', data)
+        assert length == 10
+        assert msgType == SET_DOID_RANGE_CMU
+        assert doIdBase == 1
+        assert len(server.clientsByConnection) == 1
+        sock.close()
+    finally:
+        server.stopEventLoopTask()
+
+    assert server.eventLoopTask is None
+    assert not server.clientsByConnection
+
+
+class Recorder:
+    def __init__(self):
+        self.datagrams = []
+
+    def datagramReceived(self, connection, datagram):
+        assert datagram.getConnection() is connection
+        self.datagrams.append(datagram.getMessage())
+
+
+@pytest.mark.parametrize('headerSize', (2, 4))
+def test_datagram_framing(headerSize):
+    messages = [b'', b'a', b'hello', bytes(range(256)) * 8]
+    fmt = '<H' if headerSize == 2 else '<I'
+    stream = b''.join(struct.pack(fmt, len(message)) + message for message in messages)
+
+    # Delivered all at once.
+    recorder = Recorder()
+    protocol = AsyncDatagramProtocol(recorder, headerSize)
+    protocol.data_received(stream)
+    assert recorder.datagrams == messages
+
+    # Delivered one byte at a time.
+    recorder = Recorder()
+    protocol = AsyncDatagramProtocol(recorder, headerSize)
+    for i in range(len(stream)):
+        protocol.data_received(stream[i:i + 1])
+    assert recorder.datagrams == messages
+    assert protocol.numDatagramsReceived == len(messages)
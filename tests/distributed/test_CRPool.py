@@ -0,0 +1,131 @@
+from panda3d.core import Filename
+from direct.distributed.ClientRepository import ClientRepository
+from direct.distributed.DistributedObject import DistributedObject
+from direct.distributed.PyDatagram import PyDatagram
+from direct.distributed.PyDatagramIterator import PyDatagramIterator
+from direct.showbase.DirectObject import DirectObject
+from direct.task.TaskManagerGlobal import taskMgr
+import pytest
+
+
+DC_SOURCE = """
+dclass Projectile {
+  setHit(uint32) broadcast;
+};
+
+dclass Pickup {
+  setHit(uint32) broadcast;
+};
+"""
+
+
+class Projectile(DistributedObject):
+    poolSize = 4
+    numConstructed = 0
+
+    def __init__(self, cr):
+        DistributedObject.__init__(self, cr)
+        Projectile.numConstructed += 1
+        self.hits = []
+
+    def setHit(self, avId):
+        self.hits.append(avId)
+
+    def recycle(self):
+        DistributedObject.recycle(self)
+        self.hits = []
+
+
+class Pickup(Projectile):
+    poolSize = 0
+
+
+@pytest.fixture
+def cr(base, tmp_path):
+    path = tmp_path / 'pool.dc'
+    path.write_text(DC_SOURCE)
+    cr = ClientRepository(dcFileNames=[Filename.fromOsSpecific(str(path))])
+    cr.dclassesByName['Projectile'].setClassDef(Projectile)
+    cr.dclassesByName['Pickup'].setClassDef(Pickup)
+    Projectile.numConstructed = 0
+    yield cr
+    cr.pool.flush()
+    taskMgr.remove('allowGarbageCollect')
+    taskMgr.remove('adjustGarbageCollectThreshold')
+
+
+def generate(cr, className, doId):
+    dclass = cr.dclassesByName[className]
+    di = PyDatagramIterator(PyDatagram())
+    return cr.generateWithRequiredFields(dclass, doId, di, 0, 1)
+
+
+def test_pool_reuse(cr):
+    obj = generate(cr, 'Projectile', 100)
+    obj.setHit(5)
+    assert obj.isGenerated()
+
+    disabled = []
+    listener = DirectObject()
+    listener.accept(obj.getDisableEvent(), disabled.append, [True])
+    cr.deleteObject(100)
+    listener.ignoreAll()
+    assert disabled == [True]
+    assert 100 not in cr.doId2do
+    assert obj.isDisabled()
+    assert obj.cr is cr
+    assert cr.pool.getNumFree(Projectile) == 1
+
+    # The next projectile is the same instance, freshly reset.
+    obj2 = generate(cr, 'Projectile', 101)
+    assert obj2 is obj
+    assert obj2.doId == 101
+    assert obj2.hits == []
+    assert obj2.isGenerated()
+    assert cr.doId2do[101] is obj2
+    assert Projectile.numConstructed == 1
+    assert cr.pool.numReused == 1
+
+
+def test_pool_limits(cr):
+    # Only poolSize objects are kept, and classes without a poolSize are
+    # deleted as before.
+    objects = [generate(cr, 'Projectile', doId) for doId in range(100, 110)]
+    for obj in objects:
+        cr.disableDoId(obj.doId)
+    assert cr.pool.getNumFree(Projectile) == Projectile.poolSize
+    assert all(obj.cr is None for obj in objects[Projectile.poolSize:])
+
+    pickup = generate(cr, 'Pickup', 200)
+    cr.deleteObject(200)
+    assert cr.pool.getNumFree(Pickup) == 0
+    assert pickup.cr is None
+
+    # Delay-deleted objects are never pooled.
+    obj = generate(cr, 'Projectile', 300)
+    obj._token2delayDeleteName[1] = 'test'
+    assert not cr.pool.release(obj)
+    del obj._token2delayDeleteName[1]
+
+
+def test_pool_replay(cr):
+    # Replays waves of short-lived projectiles, as from a burst of gunfire.
+    numWaves = 200
+    doId = 1000
+    for wave in range(numWaves):
+        doIds = []
+        for i in range(Projectile.poolSize):
+            generate(cr, 'Projectile', doId).setHit(wave)
+            doIds.append(doId)
+            doId += 1
+        for i in doIds:
+            cr.deleteObject(i)
+
+    numGenerated = numWaves * Projectile.poolSize
+    assert Projectile.numConstructed == Projectile.poolSize
+    assert cr.pool.numReused == numGenerated - Projectile.poolSize
+    assert cr.pool.numReleased == numGenerated
+    assert not cr.doId2do
+
+    cr.pool.flush()
+    assert cr.pool.getNumFree(Projectile) == 0
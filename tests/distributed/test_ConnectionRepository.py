@@ -0,0 +1,181 @@
+from panda3d.core import Filename
+from direct.distributed.ConnectionRepository import ConnectionRepository
+from direct.showbase import DConfig
+import sys
+import time
+import pytest
+
+
+class ReplayRepository(ConnectionRepository):
+    # Replays a recorded list of (msgType, cost) messages instead of
+    # reading from the network; handling a message takes cost seconds.
+
+    def __init__(self, messages):
+        ConnectionRepository.__init__(self, self.CM_NATIVE, DConfig)
+        self.messages = list(messages)
+        self.handled = []
+        self.msgType = None
+
+    def checkDatagram(self):
+        if not self.messages:
+            return False
+        self.msgType, self.cost = self.messages.pop(0)
+        return True
+
+    def getDatagramIterator(self, di):
+        pass
+
+    def getMsgType(self):
+        return self.msgType
+
+    def isConnected(self):
+        return True
+
+    def handleDatagram(self, di):
+        end = time.perf_counter() + self.cost
+        while time.perf_counter() < end:
+            pass
+        self.handled.append(self.msgType)
+
+
+@pytest.fixture
+def taskMgr():
+    from direct.task.TaskManagerGlobal import taskMgr
+    yield taskMgr
+    taskMgr.remove('allowGarbageCollect')
+    taskMgr.remove('adjustGarbageCollectThreshold')
+
+
+def test_readerpoll_unlimited(taskMgr):
+    repo = ReplayRepository([(1, 0)] * 1000)
+    repo.readerPollUntilEmpty(None)
+    assert len(repo.handled) == 1000
+    assert repo.getReaderPollStats()['numOverBudget'] == 0
+
+
+def test_readerpoll_message_budget(taskMgr):
+    repo = ReplayRepository([(1, 0)] * 1000)
+    repo.setReaderPollBudget(maxMessages=100)
+
+    for frame in range(10):
+        repo.readerPollUntilEmpty(None)
+        assert len(repo.handled) == (frame + 1) * 100
+    assert repo.readerPollBacklogFrames == 10
+
+    repo.readerPollUntilEmpty(None)
+    stats = repo.getReaderPollStats()
+    assert stats['numMessages'] == 1000
+    assert stats['numOverBudget'] == 10
+    assert stats['backlogFrames'] == 0
+    assert stats['lastMessages'] == 0
+
+
+def test_readerpoll_priorities(taskMgr):
+    GENERATE = 1
+    UPDATE = 2
+    repo = ReplayRepository([(GENERATE, 0)] * 100 + [(UPDATE, 0)] * 100)
+    repo.setReaderPollBudget(maxMessages=40)
+    repo.setMsgTypePriority(GENERATE, 0.5)
+    repo.setMsgTypePriority(UPDATE, 2)
+
+    repo.readerPollUntilEmpty(None)
+    assert repo.handled == [GENERATE] * 20
+
+    for frame in range(4):
+        repo.readerPollUntilEmpty(None)
+    assert repo.handled == [GENERATE] * 100
+
+    # The updates may use twice the budget.
+    repo.readerPollUntilEmpty(None)
+    assert repo.readerPollLastMessages == 80
+
+    # Messages are never reordered.
+    repo.readerPollUntilEmpty(None)
+    assert repo.handled == [GENERATE] * 100 + [UPDATE] * 100
+
+
+def test_readerpoll_burst_frame_time(taskMgr):
+    # A burst of generates after a zone change, each taking 0.2 ms.
+    burst = [(1, 0.0002)] * 1000
+    repo = ReplayRepository(burst)
+    repo.readerPollUntilEmpty(None)
+    unlimited = repo.readerPollMaxFrameTime
+    assert unlimited >= 0.2
+
+    repo = ReplayRepository(burst)
+    repo.setReaderPollBudget(maxTime=0.005)
+    numFrames = 0
+    while repo.messages:
+        repo.readerPollUntilEmpty(None)
+        numFrames += 1
+
+    assert len(repo.handled) == 1000
+    assert numFrames > 10
+    assert repo.readerPollMaxFrameTime < unlimited / 4
+
+
+@pytest.fixture
+def syntheticDc(tmp_path, monkeypatch):
+    # A DC file with many classes, each defined in its own module.
+    numClasses = 500
+    package = tmp_path / 'lazydcpkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('')
+    lines = []
+    for i in range(numClasses):
+        (package / ('Dist%d.py' % (i))).write_text(
+            'class Dist%d:\n    pass\n' % (i))
+        lines.append('from lazydcpkg import Dist%d' % (i))
+    for i in range(numClasses):
+        lines.append('dclass Dist%d {\n  setValue(uint32) broadcast;\n};' % (i))
+    dcPath = tmp_path / 'synthetic.dc'
+    dcPath.write_text('\n'.join(lines) + '\n')
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield Filename.fromOsSpecific(str(dcPath)), numClasses
+    for name in list(sys.modules):
+        if name == 'lazydcpkg' or name.startswith('lazydcpkg.'):
+            del sys.modules[name]
+
+
+def imported_classes():
+    return [name for name in sys.modules if name.startswith('lazydcpkg.')]
+
+
+def test_read_dc_file_eager(taskMgr, syntheticDc):
+    dcFileName, numClasses = syntheticDc
+    repo = ReplayRepository([])
+    repo.readDCFile([dcFileName])
+
+    assert len(imported_classes()) == numClasses
+    dclass = repo.dclassesByName['Dist7']
+    assert dclass.getClassDef().__name__ == 'Dist7'
+    assert repo.getClassDef(dclass) is dclass.getClassDef()
+
+
+def test_read_dc_file_lazy(taskMgr, syntheticDc):
+    dcFileName, numClasses = syntheticDc
+    repo = ReplayRepository([])
+    repo.lazyDcImport = True
+    repo.readDCFile([dcFileName])
+
+    # Nothing is imported, but all classes are known.
+    assert imported_classes() == []
+    assert len(repo.dclassesByName) == numClasses
+    assert len(repo.lazyClassDefs) == numClasses
+
+    # The first generate imports and binds just the one class.
+    dclass = repo.dclassesByName['Dist7']
+    classDef = repo.getClassDef(dclass)
+    assert classDef.__name__ == 'Dist7'
+    assert dclass.getClassDef() is classDef
+    assert imported_classes() == ['lazydcpkg.Dist7']
+    assert repo.getClassDef(dclass) is classDef
+
+    repo.warmUpClassDefs(['Dist1', 'Dist2'])
+    assert sorted(imported_classes()) == ['lazydcpkg.Dist1', 'lazydcpkg.Dist2', 'lazydcpkg.Dist7']
+    assert repo.dclassesByName['Dist2'].getClassDef().__name__ == 'Dist2'
+
+    repo.warmUpClassDefs()
+    assert len(imported_classes()) == numClasses
+    assert not repo.lazyClassDefs
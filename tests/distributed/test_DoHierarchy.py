@@ -0,0 +1,41 @@
+from direct.distributed.DoHierarchy import DoHierarchy
+
+
+class CountingId(int):
+    # Counts how often this id is formatted into a message.
+    numFormats = 0
+
+    def __str__(self):
+        CountingId.numFormats += 1
+        return int.__repr__(self)
+
+
+class DistObj:
+    def __init__(self, doId):
+        self.doId = doId
+
+
+def test_dohierarchy_replay():
+    # Replays a stream of object location changes, as would arrive from the
+    # server; no debug messages should be formatted while debug is off.
+    hierarchy = DoHierarchy()
+    assert not hierarchy.notify.getDebug()
+
+    parentId = CountingId(1)
+    objects = [DistObj(doId) for doId in range(1000)]
+    for zoneId in range(10):
+        for obj in objects:
+            hierarchy.storeObjectLocation(obj, parentId, zoneId)
+        assert len(hierarchy) == len(objects)
+        for obj in objects:
+            hierarchy.deleteObjectLocation(obj, parentId, zoneId)
+        assert hierarchy.isEmpty()
+
+    assert CountingId.numFormats == 0
+
+    hierarchy.notify.setDebug(True)
+    try:
+        hierarchy.storeObjectLocation(objects[0], parentId, 0)
+    finally:
+        hierarchy.notify.setDebug(False)
+    assert CountingId.numFormats == 1
@@ -0,0 +1,88 @@
+from direct.fsm.FSM import FSM, RequestDenied
+import pytest
+
+
+class TrafficLight(FSM):
+    defaultTransitions = {
+        'Red': ['Green'],
+        'Yellow': ['Red'],
+        'Green': ['Yellow'],
+        FSM.EnumStates.ANY: ['Broken'],
+    }
+
+    def __init__(self, name):
+        FSM.__init__(self, name)
+        self.log = []
+
+    def enterRed(self, *args):
+        self.log.append(('enterRed',) + args)
+
+    def exitRed(self):
+        self.log.append('exitRed')
+
+    def enterGreen(self):
+        self.log.append('enterGreen')
+
+    def fromGreenToYellow(self):
+        self.log.append('fromGreenToYellow')
+
+
+def test_fsm_transitions():
+    light = TrafficLight('light')
+    light.request('Red', 1)
+    light.request('Green')
+    light.request('Yellow')
+    light.request('Red')
+    assert light.state == 'Red'
+    assert light.log == [('enterRed', 1), 'exitRed', 'enterGreen',
+                         'fromGreenToYellow', ('enterRed',)]
+
+    with pytest.raises(RequestDenied):
+        light.request('Yellow')
+    assert light.request('lowercase') is None
+
+    light.request('Broken')
+    assert light.state == 'Broken'
+    light.cleanup()
+    assert light.state == 'Off'
+
+
+def test_fsm_dynamic_attributes():
+    light = TrafficLight('light')
+    light.request('Red')
+    light.request('Green')
+    light.request('Yellow')
+    light.request('Red')
+    light.log = []
+
+    # Methods assigned to the instance, or added to the class later on,
+    # are picked up even for transitions that have been made before.
+    light.enterGreen = lambda: light.log.append('instanceGreen')
+    light.request('Green')
+    fromGreenToYellow = TrafficLight.fromGreenToYellow
+    TrafficLight.fromGreenToYellow = lambda self: self.log.append('patched')
+    try:
+        light.request('Yellow')
+    finally:
+        TrafficLight.fromGreenToYellow = fromGreenToYellow
+
+    light.exitRed = None
+    light.request('Red')
+    light.request('Green')
+    assert light.log == ['exitRed', 'instanceGreen', 'patched', ('enterRed',),
+                         'instanceGreen']
+
+
+def test_fsm_many_transitions():
+    lights = [TrafficLight('light%d' % (i)) for i in range(1000)]
+    for light in lights:
+        light.request('Red')
+
+    for i in range(10):
+        for light in lights:
+            light.request('Green')
+            light.request('Yellow')
+            light.request('Red')
+
+    assert all(light.state == 'Red' for light in lights)
+    assert all(len(light.log) == 41 for light in lights)
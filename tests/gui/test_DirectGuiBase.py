@@ -1,4 +1,6 @@
 from direct.gui.DirectGuiBase import DirectGuiBase, DirectGuiWidget, toggleGuiGridSnap, setGuiGridSpacing
+from direct.gui.DirectGuiBase import batchUpdate, flushPendingUpdates, setDeferredUpdates
+from direct.gui.DirectFrame import DirectFrame
 from direct.gui.OnscreenText import OnscreenText
 from direct.gui import DirectGuiGlobals as DGG
 from direct.showbase.ShowBase import ShowBase
@@ -221,3 +223,79 @@ def test_track_gui_items():
         assert id not in ShowBase.guiItems
     finally:
         core.unload_prc_file(page)
+
+
+class CountingFrame(DirectFrame):
+    def __init__(self, parent=None, **kw):
+        self.calls = []
+        DirectFrame.__init__(self, parent, **kw)
+        self.initialiseoptions(CountingFrame)
+
+    def setFrameSize(self, fClearFrame = 0):
+        self.calls.append('setFrameSize')
+        DirectFrame.setFrameSize(self, fClearFrame)
+
+    def setRelief(self, fSetStyle = 1):
+        self.calls.append('setRelief')
+        DirectFrame.setRelief(self, fSetStyle)
+
+
+def test_batch_update():
+    frames = [CountingFrame() for i in range(1000)]
+    for frame in frames:
+        del frame.calls[:]
+
+    with batchUpdate():
+        for i, frame in enumerate(frames):
+            frame['frameSize'] = (0, 1, 0, 1)
+            frame['frameSize'] = (0, 2, 0, 1)
+            frame['relief'] = DGG.RIDGE
+            frame['frameSize'] = (0, 3, 0, i)
+
+            # New values are visible immediately.
+            assert frame['frameSize'] == (0, 3, 0, i)
+            assert frame.calls == []
+
+    for i, frame in enumerate(frames):
+        assert frame.calls == ['setFrameSize', 'setRelief']
+        assert frame.guiItem.getFrame() == (0, 3, 0, i)
+
+    # Outside of a batch, callbacks are called immediately again.
+    frame = frames[0]
+    del frame.calls[:]
+    frame['frameSize'] = (0, 1, 0, 1)
+    assert frame.calls == ['setFrameSize']
+
+
+def test_batch_update_nested():
+    frame = CountingFrame()
+    del frame.calls[:]
+
+    with batchUpdate():
+        with batchUpdate():
+            frame['frameSize'] = (0, 1, 0, 1)
+        assert frame.calls == []
+        frame['frameSize'] = (0, 2, 0, 1)
+    assert frame.calls == ['setFrameSize']
+
+
+def test_batch_update_destroyed():
+    frame = CountingFrame()
+    with batchUpdate():
+        frame['frameSize'] = (0, 1, 0, 1)
+        frame.destroy()
+
+
+def test_deferred_updates():
+    frame = CountingFrame()
+    del frame.calls[:]
+
+    setDeferredUpdates(True)
+    try:
+        frame['frameSize'] = (0, 1, 0, 1)
+        frame['frameSize'] = (0, 2, 0, 1)
+        assert frame.calls == []
+        flushPendingUpdates()
+        assert frame.calls == ['setFrameSize']
+    finally:
+        setDeferredUpdates(False)
@@ -0,0 +1,84 @@
+from direct.gui.DirectScrolledList import DirectScrolledList
+from direct.gui.DirectFrame import DirectFrame
+
+
+class RowFactory:
+    def __init__(self):
+        self.numMade = 0
+        self.numBound = 0
+
+    def make(self, item, index, extraArgs):
+        self.numMade += 1
+        return DirectFrame(text=item, frameSize=(-1, 1, -0.5, 0.5))
+
+    def bind(self, row, item, index, extraArgs):
+        self.numBound += 1
+        row['text'] = item
+
+
+def make_list(numItems, factory, numItemsVisible=10):
+    return DirectScrolledList(
+        items=['item%d' % (i) for i in range(numItems)],
+        numItemsVisible=numItemsVisible,
+        virtualized=True,
+        itemMakeFunction=factory.make,
+        itemBindFunction=factory.bind)
+
+
+def test_scrolledlist_virtualized():
+    factory = RowFactory()
+    lst = make_list(100, factory)
+
+    # Only the visible rows are made, and the items stay plain strings.
+    assert factory.numMade == 10
+    assert factory.numBound == 0
+    assert all(isinstance(item, str) for item in lst['items'])
+    assert lst.getSelectedText() == 'item0'
+
+    lst.scrollTo(50)
+    assert lst.getSelectedText() == 'item50'
+    assert lst['items'][50] == 'item50'
+    assert factory.numMade == 10
+
+    lst.makeAllItems()
+    assert factory.numMade == 10
+    assert all(isinstance(item, str) for item in lst['items'])
+
+    lst.removeItem('item50')
+    assert lst.getSelectedText() == 'item51'
+
+    lst.addItem('extra')
+    lst.scrollTo(len(lst['items']))
+    assert lst['items'][-1] == 'extra'
+
+    lst.removeAllItems()
+    assert lst['items'] == []
+    lst.destroy()
+
+
+def test_scrolledlist_virtualized_scroll_cost():
+    # Scrolling by one should rebind a single row, no matter how many items
+    # there are in the list.
+    for numItems in (1000, 10000, 100000):
+        factory = RowFactory()
+        lst = make_list(numItems, factory)
+
+        for i in range(200):
+            lst.scrollBy(1)
+
+        assert lst.index == 200
+        assert factory.numMade == 10
+        assert factory.numBound == 200
+        lst.destroy()
+
+
+def test_scrolledlist_virtualized_default_rows():
+    lst = DirectScrolledList(
+        items=['a', 'b', 'c', 'd'],
+        numItemsVisible=2,
+        virtualized=True)
+
+    lst.scrollTo(2)
+    assert lst.getSelectedText() == 'c'
+    assert lst['items'] == ['a', 'b', 'c', 'd']
+    lst.destroy()
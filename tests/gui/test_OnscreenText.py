@@ -1,4 +1,4 @@
-from direct.gui.OnscreenText import OnscreenText
+from direct.gui.OnscreenText import OnscreenText, TextLayoutCache
 import pytest
 
 
@@ -176,3 +176,62 @@ def test_onscreentext_node_scale():
     assert text.text_scale == (0.07, 0.07)
     assert text.getTextScale() == (0.07, 0.07)
     assert text.get_scale() == (1, 2, 3)
+
+
+def test_onscreentext_layout_cache():
+    cache = TextLayoutCache()
+    text = OnscreenText('0:00', layoutCache=cache)
+    other = OnscreenText('0:00', layoutCache=cache, pos=(0.5, 0.5))
+    assert text.getLayoutCache() is cache
+    assert text.getText() == '0:00'
+    assert len(cache) == 1
+    assert cache.numHits == 1
+
+    # Cycling among a few values only generates each one once.
+    for i in range(100):
+        text.setText('0:%02d' % (i % 4))
+    assert text.getText() == '0:03'
+    assert len(cache) == 4
+
+    # A change in style requires new geometry, but not a change in position.
+    text.setTextPos(1, 2)
+    assert len(cache) == 4
+    text.setFg((1, 0, 0, 1))
+    assert len(cache) == 5
+
+    cache.maxSize = 2
+    text.setText('new')
+    assert len(cache) == 2
+
+    text.destroy()
+    other.destroy()
+
+
+def test_onscreentext_number_display():
+    cache = TextLayoutCache()
+    text = OnscreenText('100', layoutCache=cache, numberDisplay=True)
+    layout = text.find('layout')
+    assert layout.getNumChildren() == 3
+
+    # Only the glyph of the last digit is replaced, from the cache.
+    numMisses = cache.numMisses
+    numHits = cache.numHits
+    text.setText('101')
+    assert text.getText() == '101'
+    assert cache.numMisses == numMisses
+    assert cache.numHits == numHits + 1
+
+    text.setText('1000')
+    assert layout.getNumChildren() == 4
+    text.setText('9')
+    assert layout.getNumChildren() == 1
+    text.destroy()
+
+
+def test_onscreentext_set_same_text():
+    text = OnscreenText('abc')
+    text.setText('abc')
+    assert text.getText() == 'abc'
+    text.setText('')
+    assert text.getText() == ''
+    text.destroy()
@@ -0,0 +1,73 @@
+from direct.interval.FunctionInterval import Func, FunctionInterval
+from direct.interval.IntervalManager import IntervalManager
+from direct.interval.MetaInterval import Sequence
+import tracemalloc
+
+
+def test_func_attributes_in_slots():
+    ival = Func(print)
+    # Every attribute is stored in a slot.
+    assert not vars(ival)
+
+
+def test_func_lazy_name():
+    ival = Func(print)
+    assert not ival.hasName()
+
+    name = ival.getName()
+    assert name.startswith('Func-print-')
+    assert ival.hasName()
+    assert ival.name == name
+
+    # Once generated, the name stays the same.
+    assert ival.getName() == name
+
+    ival.name = 'renamed'
+    assert ival.getName() == 'renamed'
+
+    assert Func(print, name='named').hasName()
+
+
+def test_func_unique_names():
+    a = Func(print)
+    b = Func(print)
+    assert a.getName() != b.getName()
+
+
+def test_sequence_does_not_name_funcs():
+    calls = []
+    funcs = [Func(calls.append, i) for i in range(1000)]
+    seq = Sequence(*funcs)
+    seq.setManager(IntervalManager())
+    seq.start()
+    seq.finish()
+
+    assert calls == list(range(1000))
+    assert not any(func.hasName() for func in funcs)
+
+
+def test_func_subclass_can_add_attributes():
+    class MyFunc(FunctionInterval):
+        pass
+
+    ival = MyFunc(print)
+    ival.extra = 1
+    assert ival.extra == 1
+
+
+def test_sequence_memory():
+    # Builds a large Sequence of Funcs, and checks that the Funcs take up
+    # less than a kilobyte apiece (they took about 1.5 KiB each before they
+    # used slots and lazily generated names).
+    count = 100000
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        funcs = [Func(print) for i in range(count)]
+        seq = Sequence(*funcs)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert (after - before) / count < 1024
+    del seq
@@ -0,0 +1,68 @@
+from panda3d.core import ClockObject
+from direct.interval.FunctionInterval import Func, Wait
+from direct.interval.IntervalManager import IntervalManager, ivalMgr
+from direct.interval.MetaInterval import Sequence
+import time
+
+
+def test_python_callbacks_batched():
+    mgr = IntervalManager()
+    calls = []
+
+    seqs = []
+    for i in range(10000):
+        seq = Sequence(Func(calls.append, i), name='test-seq-%d' % i)
+        seq.setManager(mgr)
+        seq.start()
+        seqs.append(seq)
+
+    mgr.step()
+    mgr.step()
+
+    assert sorted(calls) == list(range(10000))
+    assert mgr.getNumIntervals() == 0
+    assert all(ival is None for ival in mgr.ivals)
+
+
+def test_callback_adds_interval():
+    # An interval added by a callback of a just-removed interval may end
+    # up in the removed interval's slot.
+    mgr = IntervalManager()
+    calls = []
+
+    def start(seq):
+        seq.setManager(mgr)
+        seq.start()
+
+    def startAnother():
+        calls.append('first')
+        start(Sequence(Func(calls.append, 'second'), name='test-seq-second'))
+
+    start(Sequence(Func(startAnother), name='test-seq-first'))
+    for i in range(4):
+        mgr.step()
+
+    assert calls == ['first', 'second']
+    assert mgr.getNumIntervals() == 0
+
+
+def test_sequence_with_wait():
+    # A meta interval containing Python intervals must not keep the
+    # manager returning the same event forever.
+    calls = []
+    seq = Sequence(Func(calls.append, 'start'), Wait(0.05),
+                   Func(calls.append, 'end'), name='test-seq-wait')
+    seq.start()
+    ivalMgr.step()
+    assert 'start' in calls
+    assert 'end' not in calls
+
+    clock = ClockObject.getGlobalClock()
+    end = time.monotonic() + 5.0
+    while seq.isPlaying():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.01)
+        clock.tick()
+        ivalMgr.step()
+
+    assert calls == ['start', 'end']
@@ -0,0 +1,68 @@
+from panda3d.core import NodePath, NodePathCollection, Point3
+from direct.interval.LerpInterval import LerpPosCollectionInterval, LerpScaleCollectionInterval
+import pytest
+
+
+def make_nodes(count):
+    root = NodePath('root')
+    nodes = NodePathCollection()
+    for i in range(count):
+        np = root.attachNewNode('node-%d' % i)
+        np.setPos(i, 0, 0)
+        nodes.addPath(np)
+    return root, nodes
+
+
+def test_lerp_pos_collection():
+    root, nodes = make_nodes(100)
+    ends = [Point3(i, 10, 0) for i in range(100)]
+    ival = LerpPosCollectionInterval(nodes, 1.0, ends)
+
+    ival.setT(0.5)
+    for i, np in enumerate(nodes):
+        assert np.getPos() == Point3(i, 5, 0)
+
+    ival.finish()
+    for i, np in enumerate(nodes):
+        assert np.getPos() == Point3(i, 10, 0)
+
+
+def test_lerp_pos_collection_shared_value():
+    root, nodes = make_nodes(10)
+    ival = LerpPosCollectionInterval(nodes, 2.0, (0, 0, 4), startPos=(0, 0, 0), other=root)
+
+    ival.setT(1.0)
+    for np in nodes:
+        assert np.getPos() == Point3(0, 0, 2)
+
+
+def test_lerp_scale_collection_scalar():
+    root, nodes = make_nodes(10)
+    ival = LerpScaleCollectionInterval(nodes, 1.0, 2.0, startScale=1.0)
+
+    ival.setT(0.5)
+    for np in nodes:
+        assert np.getScale() == (1.5, 1.5, 1.5)
+
+    ival.finish()
+    for np in nodes:
+        assert np.getScale() == (2, 2, 2)
+
+
+def test_lerp_scale_collection_arrays():
+    np = pytest.importorskip('numpy')
+    root, nodes = make_nodes(50)
+    starts = np.ones((50, 3))
+    ends = np.arange(150, dtype=np.float32).reshape((50, 3))
+    ival = LerpScaleCollectionInterval(nodes, 1.0, ends, startScale=starts,
+                                       blendType='easeInOut')
+
+    ival.setT(1.0)
+    for i, node in enumerate(nodes):
+        assert node.getScale() == tuple(ends[i])
+
+
+def test_lerp_collection_bad_count():
+    root, nodes = make_nodes(3)
+    with pytest.raises(ValueError):
+        LerpPosCollectionInterval(nodes, 1.0, [(0, 0, 0), (1, 1, 1)])
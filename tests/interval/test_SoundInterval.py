@@ -0,0 +1,77 @@
+from panda3d.core import AudioSound
+from direct.interval.MetaInterval import Sequence
+from direct.interval.SoundInterval import SoundInterval
+
+
+class RecordingSound:
+    # Stands in for an AudioSound with a length, recording what the
+    # interval does with it.
+    def __init__(self, length):
+        self._length = length
+        self.playing = False
+        self.loop = False
+
+    def length(self):
+        return self._length
+
+    def status(self):
+        return AudioSound.PLAYING if self.playing else AudioSound.READY
+
+    def setTime(self, time):
+        pass
+
+    def setLoop(self, loop):
+        self.loop = loop
+
+    def setVolume(self, volume):
+        pass
+
+    def play(self):
+        self.playing = True
+
+    def stop(self):
+        self.playing = False
+
+
+def test_sound_interval_attributes_in_slots():
+    ival = SoundInterval(None, duration=1.0)
+    # Every attribute is stored in a slot.
+    assert not vars(ival)
+
+
+def test_sound_interval_start_finish(base):
+    sound = base.sfxManagerList[0].getSound('nonexistent.wav')
+    ival = SoundInterval(sound, duration=1.0)
+    ival.start()
+    assert ival.isPlaying()
+    ival.finish()
+    assert not ival.isPlaying()
+    assert ival.getT() == 1.0
+
+
+def test_sound_interval_seamless_loop_finish(base):
+    sound = RecordingSound(2.0)
+    ival = SoundInterval(sound, loop=1, duration=1.0)
+    ival.loop()
+    assert sound.playing
+    assert sound.loop
+
+    # finish() stops the sound, even though it is looped by the audio system.
+    ival.finish()
+    assert not sound.playing
+    assert not ival.isPlaying()
+
+    # It can be played again after finishing.
+    ival.start()
+    assert sound.playing
+    ival.finish()
+    assert not sound.playing
+
+
+def test_sound_interval_in_sequence(base):
+    sound = RecordingSound(2.0)
+    seq = Sequence(SoundInterval(sound, loop=1, duration=1.0))
+    seq.start()
+    assert sound.playing
+    seq.finish()
+    assert not sound.playing
@@ -0,0 +1,122 @@
+from panda3d.core import Filename, Vec3
+from panda3d.physics import BaseParticleRenderer, LinearVectorForce
+from direct.particles import ParticleConfig
+from direct.particles.ParticleEffect import ParticleEffect
+from direct.particles.Particles import Particles
+from direct.particles.ForceGroup import ForceGroup
+import json
+import pytest
+
+
+PTF_SOURCE = """
+self.reset()
+self.setPos(0.000, 1.000, 0.000)
+self.setHpr(0.000, 0.000, 0.000)
+self.setScale(1.000, 1.000, 1.000)
+p0 = Particles.Particles('particles-1')
+p0.setFactory("PointParticleFactory")
+p0.setRenderer("PointParticleRenderer")
+p0.setEmitter("SphereVolumeEmitter")
+p0.setPoolSize(64)
+p0.setBirthRate(0.0200)
+p0.factory.setLifespanBase(0.5000)
+p0.renderer.setAlphaMode(BaseParticleRenderer.PRALPHAOUT)
+p0.renderer.setStartColor(LVector4(1.00, 0.50, 0.00, 1.00))
+p0.emitter.setRadius(0.5000)
+self.addParticles(p0)
+f0 = ForceGroup.ForceGroup('gravity')
+force0 = LinearVectorForce(LVector3(0.0000, 0.0000, -1.0000), 25.0000, 1)
+force0.setActive(1)
+f0.addForce(force0)
+self.addForceGroup(f0)
+"""
+
+
+def test_ptf_to_config():
+    config = ParticleConfig.ptfToConfig(PTF_SOURCE)
+
+    # Must be serializable as plain JSON.
+    assert json.loads(json.dumps(config)) == config
+
+    assert config['pos'] == [0.0, 1.0, 0.0]
+    assert len(config['particles']) == 1
+    particles = config['particles'][0]
+    assert particles['name'] == 'particles-1'
+    assert ['setPoolSize', 64] in particles['params']
+    assert ['renderer.setAlphaMode', {'const': 'BaseParticleRenderer.PRALPHAOUT'}] in particles['params']
+
+    assert len(config['forceGroups']) == 1
+    forces = config['forceGroups'][0]['forces']
+    assert forces[0]['type'] == 'LinearVectorForce'
+    assert forces[0]['params'] == [['setActive', 1]]
+
+
+def test_ptf_to_config_rejects_code():
+    with pytest.raises(ValueError):
+        ParticleConfig.ptfToConfig("import os\nos.remove('file')\n")
+
+    with pytest.raises(ValueError):
+        ParticleConfig.ptfToConfig("p0 = Particles.Particles('p')\np0.__class__.mro()\n")
+
+    with pytest.raises(ValueError):
+        ParticleConfig.ptfToConfig("p0 = Particles.Particles('p')\np0._private = 1\n")
+
+
+def test_template_apply():
+    template = ParticleConfig.ParticleEffectTemplate(ParticleConfig.ptfToConfig(PTF_SOURCE))
+
+    effect = ParticleEffect()
+    template.apply(effect)
+    assert effect.getPos() == (0, 1, 0)
+
+    p = effect.getParticlesNamed('particles-1')
+    assert p is not None
+    assert p.getPoolSize() == 64
+    assert p.renderer.getAlphaMode() == BaseParticleRenderer.PRALPHAOUT
+    assert p.emitter.getRadius() == 0.5
+
+    fg = effect.getForceGroupNamed('gravity')
+    assert fg is not None
+    assert len(fg) == 1
+    assert fg[0].getAmplitude() == 25
+    effect.cleanup()
+
+
+def test_save_load_json(tmp_path):
+    effect = ParticleEffect()
+    p = Particles('particles-1')
+    p.setFactory("PointParticleFactory")
+    p.setRenderer("PointParticleRenderer")
+    p.setEmitter("SphereVolumeEmitter")
+    p.setPoolSize(32)
+    effect.addParticles(p)
+    fg = ForceGroup('gravity')
+    fg.addForce(LinearVectorForce(Vec3(0, 0, -10)))
+    effect.addForceGroup(fg)
+
+    fn = Filename.fromOsSpecific(str(tmp_path / 'effect.json'))
+    effect.saveConfig(fn)
+    effect.cleanup()
+
+    ParticleConfig.clearTemplateCache()
+    effect1 = ParticleEffect()
+    effect1.loadConfig(fn)
+    assert effect1.getParticlesNamed('particles-1').getPoolSize() == 32
+    assert len(effect1.getForceGroupNamed('gravity')) == 1
+
+    # The second load should come from the cache.
+    template = ParticleConfig.loadTemplate(fn)
+    assert ParticleConfig.loadTemplate(fn) is template
+    effect2 = ParticleEffect()
+    effect2.loadConfig(fn)
+    assert effect2.getParticlesNamed('particles-1').getPoolSize() == 32
+
+    effect1.cleanup()
+    effect2.cleanup()
+
+    # A cache hit does not look for the file at all.
+    (tmp_path / 'effect.json').unlink()
+    assert ParticleConfig.loadTemplate(fn) is template
+    ParticleConfig.clearTemplateCache()
+    with pytest.raises(FileNotFoundError):
+        ParticleConfig.loadTemplate(fn)
@@ -0,0 +1,153 @@
+from panda3d.core import Filename
+from direct.particles import ParticleConfig
+from direct.particles.ParticleEffectPool import ParticleEffectPool
+import json
+import pytest
+
+
+PTF_SOURCE = """
+self.reset()
+p0 = Particles.Particles('sparks')
+p0.setFactory("PointParticleFactory")
+p0.setRenderer("PointParticleRenderer")
+p0.setEmitter("SphereVolumeEmitter")
+p0.setPoolSize(16)
+p0.setBirthRate(0.0200)
+self.addParticles(p0)
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / 'sparks.json'
+    with open(path, 'w') as f:
+        json.dump(ParticleConfig.ptfToConfig(PTF_SOURCE), f)
+    yield Filename.fromOsSpecific(str(path))
+    ParticleConfig.clearTemplateCache()
+
+
+@pytest.fixture
+def make_pool():
+    # Makes sure that the pools are cleaned up, so that their drain tasks
+    # don't stay behind on the global task manager if a test fails.
+    pools = []
+
+    def make(*args, **kwargs):
+        pool = ParticleEffectPool(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.cleanup()
+
+
+def test_pool_warm_up(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool(maxSize=4)
+    pool.warmUp(config, 10)
+    assert pool.getNumFree(config) == 4
+    assert pool.numCreated == 4
+
+    effect = pool.spawn(config, base.render)
+    assert pool.getNumFree(config) == 3
+    assert pool.getAllocationsAvoided() == 1
+    assert effect.isEnabled()
+    assert effect.getParticlesNamed('sparks').getPoolSize() == 16
+
+    pool.release(effect)
+    assert not effect.isEnabled()
+    assert pool.getNumFree(config) == 4
+
+
+def test_pool_reuse(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool(maxSize=8)
+
+    for i in range(1000):
+        effects = [pool.spawn(config, base.render) for j in range(4)]
+        for effect in effects:
+            pool.release(effect)
+
+    assert pool.numCreated == 4
+    assert pool.getAllocationsAvoided() == 4000 - 4
+
+
+def test_pool_max_size(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool(maxSize=8)
+    pool.setMaxSize(config, 2)
+
+    effects = [pool.spawn(config, base.render) for j in range(3)]
+    for effect in effects:
+        pool.release(effect)
+
+    assert pool.getNumFree(config) == 2
+    assert pool.numDiscarded == 1
+
+
+def test_pool_soft_stop(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool()
+
+    effect = pool.spawn(config, base.render)
+    pool.softStop(effect)
+    assert pool.getNumFree(config) == 0
+
+    # Once all particles are dead, the next task step recycles it.
+    effect.clearToInitial()
+    base.taskMgr.step()
+    assert pool.getNumFree(config) == 1
+
+
+def test_pool_double_release(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool()
+
+    effect = pool.spawn(config, base.render)
+    pool.softStop(effect)
+    pool.softStop(effect)
+    pool.release(effect)
+    pool.release(effect)
+    assert pool.getNumFree(config) == 1
+
+    # Two spawns must not share an effect.
+    effect1 = pool.spawn(config, base.render)
+    effect2 = pool.spawn(config, base.render)
+    assert effect1 is not effect2
+
+
+def test_pool_separate_tasks(base, config, make_pool):
+    base.enableParticles()
+    pool1 = make_pool()
+    pool2 = make_pool()
+    assert pool1.taskName != pool2.taskName
+
+    effect1 = pool1.spawn(config, base.render)
+    effect2 = pool2.spawn(config, base.render)
+    pool1.softStop(effect1)
+    pool2.softStop(effect2)
+
+    # Releasing the only draining effect of one pool stops its own task,
+    # but the other pool still recycles its effect.
+    pool1.release(effect1)
+    effect2.clearToInitial()
+    base.taskMgr.step()
+    assert pool2.getNumFree(config) == 1
+
+
+def test_pool_resets_transform(base, config, make_pool):
+    base.enableParticles()
+    pool = make_pool()
+
+    effect = pool.spawn(config, base.render)
+    effect.setPos(1, 2, 3)
+    effect.setHpr(90, 0, 0)
+    effect.setScale(2)
+    pool.release(effect)
+    assert effect.getParent() != base.render
+
+    # The recycled effect is handed out as if it were new.
+    assert pool.spawn(config) is effect
+    assert effect.getParent() != base.render
+    assert effect.getTransform().isIdentity()
@@ -53,3 +53,91 @@ def test_audio3dmanager_weak(manager3d):
     manager3d.update()
 
     assert object not in manager3d.sound_dict
+
+
+class AlwaysActiveManager:
+    # The NullAudioManager reports itself as inactive, which would make the
+    # Audio3DManager skip updating altogether.
+    def audio3dSetListenerAttributes(self, *args):
+        pass
+
+
+class CountingSound:
+    def __init__(self):
+        self.active = True
+        self.numUpdates = 0
+        self.attributes = None
+
+    def set3dAttributes(self, px, py, pz, vx, vy, vz):
+        self.numUpdates += 1
+        self.attributes = (px, py, pz, vx, vy, vz)
+
+    def getActive(self):
+        return self.active
+
+    def setActive(self, active):
+        self.active = active
+
+
+@pytest.mark.parametrize("num_sounds", [100, 1000, 5000])
+def test_audio3dmanager_skip_unchanged(num_sounds):
+    root = core.NodePath("root")
+    manager = Audio3DManager(AlwaysActiveManager(), root=root)
+
+    objects = []
+    sounds = []
+    for i in range(num_sounds):
+        object = root.attach_new_node("object")
+        object.set_pos(i, 0, 0)
+        sound = CountingSound()
+        manager.attach_sound_to_object(sound, object)
+        objects.append(object)
+        sounds.append(sound)
+
+    manager.update()
+    assert all(sound.numUpdates == 1 for sound in sounds)
+
+    # Only the objects that moved should cost anything.
+    for frame in range(10):
+        for object in objects[:10]:
+            object.set_x(object.get_x() + 1)
+        manager.update()
+
+    assert sum(sound.numUpdates for sound in sounds) == num_sounds + 100
+    assert sounds[0].attributes == (10, 0, 0, 0, 0, 0)
+
+    manager.disable()
+
+
+def test_audio3dmanager_cull_distance():
+    root = core.NodePath("root")
+    manager = Audio3DManager(AlwaysActiveManager(), root=root)
+
+    near = root.attach_new_node("near")
+    far = root.attach_new_node("far")
+    far.set_pos(100, 0, 0)
+    near_sound = CountingSound()
+    far_sound = CountingSound()
+    manager.attach_sound_to_object(near_sound, near)
+    manager.attach_sound_to_object(far_sound, far)
+
+    manager.set_cull_distance(50)
+    manager.update()
+    assert near_sound.active
+    assert not far_sound.active
+    assert far_sound.numUpdates == 0
+    assert manager.get_num_culled_sounds() == 1
+
+    far.set_x(10)
+    manager.update()
+    assert far_sound.active
+    assert far_sound.attributes[0] == 10
+    assert manager.get_num_culled_sounds() == 0
+
+    far.set_x(100)
+    manager.update()
+    assert not far_sound.active
+    manager.set_cull_distance(None)
+    assert far_sound.active
+
+    manager.disable()
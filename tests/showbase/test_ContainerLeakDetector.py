@@ -0,0 +1,95 @@
+from direct.showbase.ContainerLeakDetector import ContainerLeakSampler
+import random
+import time
+import tracemalloc
+import types
+import pytest
+
+
+class Node:
+    def __init__(self, i):
+        self.id = i
+        self.neighbors = [i, i + 1, i + 2]
+        self.props = {'a': i, 'b': i * 2}
+
+
+def make_heap(numNodes):
+    # A synthetic heap: a module that holds a great many small, steady
+    # containers, and one list that keeps on growing.
+    module = types.ModuleType('synthetic_heap')
+    module.nodes = [Node(i) for i in range(numNodes)]
+    module.registry = {i: node for i, node in enumerate(module.nodes)}
+    module.leaky = []
+    return module
+
+
+@pytest.fixture
+def heap():
+    random.seed(1)
+    return make_heap(1000)
+
+
+@pytest.fixture
+def sampler(heap):
+    sampler = ContainerLeakSampler('test', period=1 << 30, sampleSize=64,
+                                   roots=[heap])
+    yield sampler
+    sampler.destroy()
+
+
+def run_checks(sampler, heap, numChecks, growth=500):
+    leaks = []
+    for i in range(numChecks):
+        heap.leaky.extend(range(growth))
+        sampler.walk(200)
+        leaks += sampler.checkContainers(now=i * 60.0)
+    return leaks
+
+
+def test_sampler_finds_leak(sampler, heap):
+    leaks = run_checks(sampler, heap, 12)
+    assert sampler.getNumSamples() == 64
+    assert leaks
+    for container, name in leaks:
+        assert container is heap.leaky
+        assert name == 'synthetic_heap.leaky'
+
+    name, length, rate, margin = sampler.getGrowthRates()[0]
+    assert name == 'synthetic_heap.leaky'
+    assert length == len(heap.leaky)
+    assert rate == pytest.approx(500 / 60.0)
+    assert margin < 1e-6
+
+
+def test_sampler_forgets_dead_containers(sampler, heap):
+    run_checks(sampler, heap, 2)
+    assert sampler.getNumSamples() > 0
+
+    del heap.nodes
+    del heap.registry
+    del heap.leaky
+    sampler.checkContainers(now=1000.0)
+    assert sampler.getNumSamples() == 0
+
+
+def test_sampler_overhead():
+    # The memory that the sampler uses must not grow with the heap, and a
+    # check must not take longer on a bigger heap.
+    results = []
+    for numNodes in (10000, 100000):
+        heap = make_heap(numNodes)
+        tracemalloc.start()
+        sampler = ContainerLeakSampler('test', period=1 << 30, sampleSize=64,
+                                       roots=[heap])
+        start = time.perf_counter()
+        run_checks(sampler, heap, 8, growth=0)
+        elapsed = time.perf_counter() - start
+        size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sampler.destroy()
+
+        results.append((numNodes, elapsed / 8, size))
+
+    (smallNodes, smallTime, smallSize), (bigNodes, bigTime, bigSize) = results
+    assert bigSize < smallSize * 2
+    assert bigTime < smallTime * 5
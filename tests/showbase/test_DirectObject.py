@@ -0,0 +1,23 @@
+from direct.showbase.DirectObject import DirectObject
+from direct.showbase.MessengerGlobal import messenger
+from direct.showbase.ShowBase import ShowBase
+
+
+def test_directobject_accept():
+    obj = DirectObject()
+    received = []
+    obj.accept('test-directobject-event', received.append)
+    assert obj.isAccepting('test-directobject-event')
+    messenger.send('test-directobject-event', [1])
+    obj.ignoreAll()
+    messenger.send('test-directobject-event', [2])
+    assert received == [1]
+
+
+def test_showbase_uses_directobject():
+    # ShowBase listens for window events with a plain DirectObject.
+    sb = ShowBase(windowType='none')
+    try:
+        assert messenger.isAccepting('window-event', sb._ShowBase__directObject)
+    finally:
+        sb.destroy()
@@ -0,0 +1,103 @@
+from direct.showbase.GarbageCollectScheduler import GarbageCollectScheduler
+from direct.task.TaskManagerGlobal import taskMgr
+import gc
+import time
+import pytest
+
+
+class AlwaysDue(GarbageCollectScheduler):
+    def isFullCollectDue(self):
+        return True
+
+
+@pytest.fixture
+def scheduler():
+    threshold = gc.get_threshold()
+    scheduler = GarbageCollectScheduler(freezeDelay=-1)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+    gc.unfreeze()
+    assert gc.get_threshold() == threshold
+
+
+def test_gc_pause_histogram(scheduler):
+    assert gc.get_threshold()[2] == 1 << 30
+
+    gc.collect(0)
+    gc.collect(2)
+    assert scheduler.getNumCollections(0) >= 1
+    assert scheduler.getNumCollections(2) >= 1
+    for gen in range(3):
+        histogram = scheduler.getPauseHistogram(gen)
+        assert len(histogram) == len(GarbageCollectScheduler.PauseBuckets) + 1
+        assert sum(histogram) == scheduler.getNumCollections(gen)
+    assert scheduler.getMaxPause(2) <= scheduler.getTotalPause(2)
+    assert scheduler.fullPauseEstimate is not None
+
+    scheduler.recordPause(1, 1.0)
+    assert scheduler.getPauseHistogram(1)[-1] == 1
+    assert scheduler.getMaxPause(1) == 1.0
+    scheduler.reportPauses()
+
+    scheduler.resetPauseStats()
+    assert scheduler.getNumCollections(2) == 0
+
+
+def test_gc_full_collect_due(scheduler):
+    # Allocate long-lived objects until Python would have run a full
+    # collection by itself.
+    keep = []
+    while not scheduler.isFullCollectDue():
+        assert len(keep) < 10000000
+        keep.extend([] for i in range(10000))
+
+    assert scheduler.collectIfIdle(1.0)
+    assert scheduler.numIdleCollections == 1
+    assert not scheduler.isFullCollectDue()
+    assert not scheduler.collectIfIdle(1.0)
+
+
+def test_gc_collect_if_idle():
+    scheduler = AlwaysDue(maxDelay=0.1, freezeDelay=-1)
+    scheduler.start()
+    try:
+        # Too little idle time for the expected pause.
+        scheduler.fullPauseEstimate = 0.05
+        assert not scheduler.collectIfIdle(0.01)
+        assert scheduler.collectIfIdle(0.1)
+        assert scheduler.numIdleCollections == 1
+
+        # Put off until it has been due for longer than maxDelay.
+        scheduler.fullPauseEstimate = 10.0
+        assert not scheduler.collectIfIdle(0.0)
+        time.sleep(0.15)
+        assert scheduler.collectIfIdle(0.0)
+        assert scheduler.numForcedCollections == 1
+        assert scheduler.fullPauseEstimate < 10.0
+
+        # The task collects at the end of a frame with time to spare.
+        scheduler.frameBudget = 1000.0
+        taskMgr.step()
+        assert scheduler.numIdleCollections == 2
+    finally:
+        scheduler.stop()
+    assert not scheduler.isRunning()
+
+
+def test_gc_freeze(scheduler):
+    # A full collection is much quicker once the long-lived objects have
+    # been frozen.
+    keep = [[i] for i in range(500000)]
+
+    start = time.perf_counter()
+    gc.collect(2)
+    unfrozenPause = time.perf_counter() - start
+
+    scheduler.freeze()
+    assert gc.get_freeze_count() >= len(keep)
+    start = time.perf_counter()
+    gc.collect(2)
+    frozenPause = time.perf_counter() - start
+
+    assert frozenPause < unfrozenPause
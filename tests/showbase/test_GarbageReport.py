@@ -0,0 +1,81 @@
+from direct.showbase.GarbageReport import GarbageReport
+import gc
+import time
+import pytest
+
+
+@pytest.fixture
+def garbage():
+    # Start from a clean slate, and don't let Python collect the garbage
+    # before the report does.
+    gc.collect()
+    del gc.garbage[:]
+    gc.disable()
+    yield
+    gc.enable()
+    del gc.garbage[:]
+
+
+def make_rings(numRings, ringSize):
+    for i in range(numRings):
+        ring = [[] for j in range(ringSize)]
+        for j in range(ringSize):
+            ring[j].append(ring[(j + 1) % ringSize])
+
+
+def run_report(**kwArgs):
+    gr = GarbageReport('test', log=False, threaded=False, **kwArgs)
+    return gr
+
+
+def test_garbage_report_cycles(garbage):
+    make_rings(1, 3)
+    lst = []
+    lst.append(lst)
+    del lst
+
+    gr = run_report()
+    assert gr.getNumCycles() == 2
+    lengths = sorted(len(cycle) for cycle in gr.cycles)
+    assert lengths == [2, 4]
+    for cycle in gr.cycles:
+        # every cycle starts and ends with the same item
+        assert cycle[0] == cycle[-1]
+        objs = [gr.garbage[i] for i in cycle]
+        for obj, nextObj in zip(objs, objs[1:]):
+            assert any(item is nextObj for item in obj)
+    assert gr.getDesc2numDict() == {'[0]': 1, '[0][0][0]': 1}
+    gr.destroy()
+
+
+def test_garbage_report_full(garbage):
+    make_rings(1, 2)
+    gr = run_report(fullReport=True)
+    assert gr.numGarbage == 2
+    assert gr.referrersByNumber == {0: [1], 1: [0]}
+    assert gr.referentsByNumber == {0: [1], 1: [0]}
+    assert gr.referrersByReference[0][0] is gr.garbage[1]
+    gr.destroy()
+
+
+def test_garbage_report_scaling(garbage):
+    # The time to analyze the garbage must grow linearly with its size.
+    times = []
+    for numRings in (2000, 8000):
+        make_rings(numRings, 5)
+        # and one longer cycle
+        make_rings(1, 50)
+
+        start = time.perf_counter()
+        gr = run_report(findCycles=True)
+        elapsed = time.perf_counter() - start
+        assert gr.getNumCycles() == numRings + 1
+        assert gr.numGarbage == numRings * 5 + 50
+        gr.destroy()
+        del gr
+        # the report itself is garbage now
+        gc.collect()
+
+        times.append(elapsed)
+
+    assert times[1] < times[0] * 4 * 3
@@ -0,0 +1,105 @@
+from panda3d.core import (
+    FrameBufferProperties,
+    GraphicsPipe,
+    WindowProperties,
+    load_prc_file_data,
+    unload_prc_file,
+)
+import time
+import pytest
+
+
+def make_buffer(base, graphics_pipe, size):
+    fbprops = FrameBufferProperties()
+    fbprops.set_rgba_bits(8, 8, 8, 0)
+
+    buffer = base.graphicsEngine.make_output(
+        graphics_pipe,
+        'movie',
+        0,
+        fbprops,
+        WindowProperties.size(size, size),
+        GraphicsPipe.BF_refuse_window
+    )
+    if buffer is None:
+        pytest.skip("GraphicsPipe cannot make offscreen buffers")
+
+    buffer.set_clear_color_active(True)
+    buffer.set_clear_color((1, 0, 0, 1))
+    return buffer
+
+
+def run_movie(base, task):
+    start = time.perf_counter()
+    for i in range(10000):
+        if not base.taskMgr.hasTaskNamed(task.name):
+            break
+        base.taskMgr.step()
+    else:
+        assert False, "movie did not finish"
+    return time.perf_counter() - start
+
+
+def test_movie_files(base, graphics_pipe, tmp_path):
+    buffer = make_buffer(base, graphics_pipe, 64)
+    prefix = str(tmp_path / 'movie')
+    try:
+        task = base.movie(prefix, duration=1.0, fps=30, source=buffer)
+        assert task.capture is not None
+        run_movie(base, task)
+    finally:
+        base.graphicsEngine.remove_window(buffer)
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == ['movie_%04d.png' % (i) for i in range(1, 31)]
+    assert task.capture.numFramesWritten == 30
+
+
+def test_movie_single_file(base, graphics_pipe, tmp_path):
+    size = 32
+    buffer = make_buffer(base, graphics_pipe, size)
+    prefix = str(tmp_path / 'movie')
+    try:
+        task = base.movie(prefix, duration=0.5, fps=20, source=buffer,
+                          singleFile=True)
+        run_movie(base, task)
+    finally:
+        base.graphicsEngine.remove_window(buffer)
+
+    assert [path.name for path in tmp_path.iterdir()] == ['movie.ppm']
+    data = (tmp_path / 'movie.ppm').read_bytes()
+    header = b'P6\n%d %d\n255\n' % (size, size)
+    frameSize = len(header) + size * size * 3
+    assert len(data) == frameSize * 10
+    for i in range(10):
+        frame = data[i * frameSize:(i + 1) * frameSize]
+        assert frame.startswith(header)
+        assert frame[len(header):len(header) + 3] == b'\xff\x00\x00'
+
+
+def test_movie_throughput(base, graphics_pipe, tmp_path):
+    # Captures the same frames from an offscreen buffer with and without the
+    # asynchronous pipeline; both must write every frame.
+    buffer = make_buffer(base, graphics_pipe, 512)
+    numFrames = 60
+    try:
+        task = base.movie(str(tmp_path / 'async'), duration=numFrames, fps=1,
+                          source=buffer)
+        run_movie(base, task)
+        assert task.capture.numFramesWritten == numFrames
+
+        page = load_prc_file_data('', 'movie-async-capture false')
+        try:
+            task = base.movie(str(tmp_path / 'sync'), duration=numFrames, fps=1,
+                              source=buffer)
+            assert task.capture is None
+            run_movie(base, task)
+        finally:
+            unload_prc_file(page)
+    finally:
+        base.graphicsEngine.remove_window(buffer)
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    expected = ['%s_%04d.png' % (prefix, i)
+                for prefix in ('async', 'sync') for i in range(1, numFrames + 1)]
+    assert names == expected
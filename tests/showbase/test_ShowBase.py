@@ -1,5 +1,8 @@
 from direct.showbase.ShowBase import ShowBase
 import builtins
+import subprocess
+import sys
+import pytest
 
 
 def test_showbase_create_destroy():
@@ -14,3 +17,85 @@ def test_showbase_create_destroy():
     assert not hasattr(builtins, 'run')
     assert not hasattr(builtins, 'loader')
     assert not hasattr(builtins, 'taskMgr')
+
+
+def test_showbase_headless():
+    sb = ShowBase(headless=True)
+    try:
+        assert sb.headless
+        assert sb.windowType == 'none'
+        assert 'render2d' not in sb.__dict__
+        assert 'bufferViewer' not in sb.__dict__
+        assert sb.sfxManagerList == []
+        assert not sb.taskMgr.hasTaskNamed('dataLoop')
+        assert not sb.taskMgr.hasTaskNamed('audioLoop')
+        assert sb.taskMgr.hasTaskNamed('ivalLoop')
+        sb.taskMgr.step()
+
+        # The deferred subsystems are set up the first time they are used.
+        assert sb.a2dTopLeft.getParent() == sb.aspect2d
+        assert sb.aspect2d.getParent() == sb.render2d
+        assert not sb.bufferViewer.isEnabled()
+        assert sb.dataRootNode == sb.dataRoot.node()
+        assert sb.sfxPlayer is not None
+        assert sb.taskMgr.hasTaskNamed('audioLoop')
+
+        with pytest.raises(AttributeError):
+            sb.noSuchAttribute
+    finally:
+        sb.destroy()
+        sb = None
+
+
+STARTUP_SCRIPT = """
+import resource
+from direct.showbase.ShowBase import ShowBase
+base = ShowBase(windowType='none', headless=%s)
+base.taskMgr.step()
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_startup(headless):
+    # Starts a ShowBase in a fresh interpreter, and returns the modules it
+    # imported, the total import time in microseconds and its peak RSS.
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT % (headless)],
+        capture_output=True, text=True, check=True)
+
+    imports = set()
+    importTime = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[12:].split('|')
+        if not cumulative_us.strip().isdigit():
+            continue
+        imports.add(name.strip())
+        if len(name) - len(name.lstrip()) == 1:
+            # Only count the top-level imports, which include the others.
+            importTime += int(cumulative_us)
+    maxrss = int(result.stdout.split()[-1])
+    return imports, importTime, maxrss
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="needs the resource module")
+def test_showbase_headless_startup():
+    imports, importTime, maxrss = measure_startup(False)
+    headlessImports, headlessImportTime, headlessMaxrss = measure_startup(True)
+
+    deferred = [
+        'direct.showbase.BufferViewer',
+        'direct.showbase.SfxPlayer',
+        'direct.showbase.Transitions',
+        'direct.interval.IntervalManager',
+        'direct.gui.DirectGui',
+    ]
+    for name in deferred:
+        assert name in imports
+        assert name not in headlessImports
+
+    # Importing fewer modules must also take less time and memory.
+    assert headlessImports < imports
+    assert headlessImportTime < importTime
+    assert headlessMaxrss <= maxrss
@@ -0,0 +1,124 @@
+import pytest
+import re
+import time
+from panda3d import core
+from direct.task import Task
+from direct.task.SamplingProfiler import SamplingProfiler
+
+
+@pytest.fixture
+def task_manager():
+    manager = Task.TaskManager()
+    manager.mgr = core.AsyncTaskManager('Test manager')
+    manager.clock = core.ClockObject()
+    manager.setupTaskChain('default', tickClock=True)
+    manager.finalInit()
+    yield manager
+    manager.destroy()
+
+
+def busy_work(duration):
+    end = time.perf_counter() + duration
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+def fixed_work(iterations):
+    total = 0
+    for i in range(iterations):
+        total += sum(range(100))
+    return total
+
+
+def idle_work(duration):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+
+
+def run_frames(task_manager, duration):
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        task_manager.step()
+
+
+def test_sampling_profiler_tasks(task_manager, tmp_path):
+    def busyTask(task):
+        busy_work(0.003)
+        return task.cont
+
+    def idleTask(task):
+        idle_work(0.001)
+        return task.cont
+
+    task_manager.add(busyTask, 'busyTask')
+    task_manager.add(idleTask, 'idleTask')
+
+    profiler = task_manager.startSamplingProfiler(rate=1000)
+    assert profiler.isRunning()
+    assert task_manager.getSamplingProfiler() is profiler
+    run_frames(task_manager, 1.0)
+    filename = tmp_path / 'profile.folded'
+    assert task_manager.stopSamplingProfiler(str(filename)) is profiler
+    assert not profiler.isRunning()
+    assert task_manager.getSamplingProfiler() is None
+
+    # The samples are filed under the task that was running.
+    assert profiler.numSamples > 50
+    taskSamples = profiler.getTaskSamples()
+    assert taskSamples['busyTask'] > taskSamples['idleTask'] > 0
+
+    hot = profiler.getHotFunctions(2, taskName='busyTask')
+    assert hot[0][0].startswith('busy_work ')
+    assert hot[0][1] > 0
+
+    lines = profiler.getCollapsedStacks()
+    assert lines == filename.read_text().splitlines()
+    for line in lines:
+        assert re.match(r'^[^;]+(;[^;]+)* [0-9]+$', line)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == profiler.numSamples
+    assert any(line.startswith('busyTask;') and 'busy_work' in line for line in lines)
+
+
+def test_sampling_profiler_pstats_task(task_manager):
+    # The PStats task runs on the task manager that started the profiler.
+    profiler = task_manager.startSamplingProfiler(pstats=True)
+    assert task_manager.hasTaskNamed(profiler._pstatsTaskName)
+    task_manager.stopSamplingProfiler()
+    assert not task_manager.hasTaskNamed(profiler._pstatsTaskName)
+
+
+def test_sampling_profiler_overhead(task_manager):
+    # The profiler must not slow the program down noticeably.  Every frame
+    # does the same amount of work, so a slower frame is due to the sampler.
+    def busyTask(task):
+        fixed_work(1000)
+        return task.cont
+
+    task_manager.add(busyTask, 'busyTask')
+
+    def time_frames(numFrames):
+        start = time.perf_counter()
+        for i in range(numFrames):
+            task_manager.step()
+        return time.perf_counter() - start
+
+    # Alternate between running with and without the profiler, and compare
+    # the fastest runs, which are the least disturbed by the rest of the
+    # system.
+    profiler = SamplingProfiler(rate=100, taskMgr=task_manager)
+    baseline = []
+    profiled = []
+    for i in range(10):
+        baseline.append(time_frames(100))
+        profiler.start()
+        profiled.append(time_frames(100))
+        profiler.stop()
+
+    # Compare the frame rates.
+    baselineRate = 100 / min(baseline)
+    profiledRate = 100 / min(profiled)
+    assert profiler.numSamples > 20
+    assert profiledRate >= baselineRate * 0.98
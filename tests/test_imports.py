@@ -195,6 +195,7 @@ def test_imports_direct():
     import direct.stdpy.threading2
     import direct.task.FrameProfiler
     import direct.task.MiniTask
+    import direct.task.SamplingProfiler
     import direct.task.Task
     import direct.task.TaskManagerGlobal
     import direct.task.TaskProfiler